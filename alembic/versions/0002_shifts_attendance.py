@@ -0,0 +1,63 @@
+"""shifts and attendance tables
+
+Revision ID: 0002_shifts_attendance
+Revises: 0001_initial
+Create Date: 2026-10-18 00:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002_shifts_attendance"
+down_revision: Union[str, None] = "0001_initial"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "shifts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("start_time", sa.DateTime(), nullable=False),
+        sa.Column("end_time", sa.DateTime(), nullable=False),
+        sa.Column("required_volunteers", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_shifts_event_id"), "shifts", ["event_id"], unique=False)
+    op.create_index(op.f("ix_shifts_id"), "shifts", ["id"], unique=False)
+
+    status_enum = sa.Enum("present", "absent", "late", name="attendancestatus")
+    op.create_table(
+        "attendances",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("shift_id", sa.Integer(), nullable=False),
+        sa.Column("volunteer_id", sa.Integer(), nullable=False),
+        sa.Column("checked_in_at", sa.DateTime(), nullable=True),
+        sa.Column("checked_out_at", sa.DateTime(), nullable=True),
+        sa.Column("minutes_worked", sa.Integer(), nullable=False),
+        sa.Column("status", status_enum, nullable=False),
+        sa.ForeignKeyConstraint(["shift_id"], ["shifts.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["volunteer_id"], ["volunteers.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("shift_id", "volunteer_id", name="uq_shift_volunteer"),
+    )
+    op.create_index(op.f("ix_attendances_id"), "attendances", ["id"], unique=False)
+    op.create_index(op.f("ix_attendances_shift_id"), "attendances", ["shift_id"], unique=False)
+    op.create_index(op.f("ix_attendances_volunteer_id"), "attendances", ["volunteer_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_attendances_volunteer_id"), table_name="attendances")
+    op.drop_index(op.f("ix_attendances_shift_id"), table_name="attendances")
+    op.drop_index(op.f("ix_attendances_id"), table_name="attendances")
+    op.drop_table("attendances")
+    sa.Enum(name="attendancestatus").drop(op.get_bind(), checkfirst=True)
+    op.drop_index(op.f("ix_shifts_id"), table_name="shifts")
+    op.drop_index(op.f("ix_shifts_event_id"), table_name="shifts")
+    op.drop_table("shifts")
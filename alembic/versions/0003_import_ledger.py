@@ -0,0 +1,44 @@
+"""import ledger tables
+
+Revision ID: 0003_import_ledger
+Revises: 0002_shifts_attendance
+Create Date: 2026-10-18 00:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003_import_ledger"
+down_revision: Union[str, None] = "0002_shifts_attendance"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "import_ledger",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("entity", sa.String(length=50), nullable=False),
+        sa.Column("row_hash", sa.String(length=32), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("entity", "row_hash", name="uq_import_ledger_entity_row_hash"),
+    )
+    op.create_table(
+        "imported_files",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("entity", sa.String(length=50), nullable=False),
+        sa.Column("file_hash", sa.String(length=32), nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=False),
+        sa.Column("imported_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("entity", "file_hash", name="uq_imported_files_entity_file_hash"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("imported_files")
+    op.drop_table("import_ledger")
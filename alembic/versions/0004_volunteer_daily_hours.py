@@ -0,0 +1,38 @@
+"""volunteer daily hours rollup
+
+Revision ID: 0004_volunteer_daily_hours
+Revises: 0003_import_ledger
+Create Date: 2026-10-18 00:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0004_volunteer_daily_hours"
+down_revision: Union[str, None] = "0003_import_ledger"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "volunteer_daily_hours",
+        sa.Column("volunteer_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("minutes", sa.Integer(), nullable=False),
+        sa.Column("present_count", sa.Integer(), nullable=False),
+        sa.Column("absent_count", sa.Integer(), nullable=False),
+        sa.Column("late_count", sa.Integer(), nullable=False),
+        sa.Column("record_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["volunteer_id"], ["volunteers.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("volunteer_id", "day"),
+    )
+    op.create_index(op.f("ix_volunteer_daily_hours_day"), "volunteer_daily_hours", ["day"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_volunteer_daily_hours_day"), table_name="volunteer_daily_hours")
+    op.drop_table("volunteer_daily_hours")
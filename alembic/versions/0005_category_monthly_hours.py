@@ -0,0 +1,38 @@
+"""category monthly hours cube
+
+Revision ID: 0005_category_monthly_hours
+Revises: 0004_volunteer_daily_hours
+Create Date: 2026-10-18 00:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0005_category_monthly_hours"
+down_revision: Union[str, None] = "0004_volunteer_daily_hours"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "category_monthly_hours",
+        sa.Column("event_category", sa.String(length=100), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("volunteer_id", sa.Integer(), nullable=False),
+        sa.Column("minutes", sa.Integer(), nullable=False),
+        sa.Column("record_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["volunteer_id"], ["volunteers.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("event_category", "month", "volunteer_id"),
+    )
+    op.create_index(op.f("ix_category_monthly_hours_month"), "category_monthly_hours", ["month"], unique=False)
+    op.create_index(op.f("ix_category_monthly_hours_volunteer_id"), "category_monthly_hours", ["volunteer_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_category_monthly_hours_volunteer_id"), table_name="category_monthly_hours")
+    op.drop_index(op.f("ix_category_monthly_hours_month"), table_name="category_monthly_hours")
+    op.drop_table("category_monthly_hours")
@@ -0,0 +1,26 @@
+"""listing sort indexes
+
+Revision ID: 0006_listing_sort_indexes
+Revises: 0005_category_monthly_hours
+Create Date: 2026-10-18 00:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0006_listing_sort_indexes"
+down_revision: Union[str, None] = "0005_category_monthly_hours"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_volunteers_full_name_id", "volunteers", ["full_name", "id"], unique=False)
+    op.create_index("ix_events_event_date_id", "events", ["event_date", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_event_date_id", table_name="events")
+    op.drop_index("ix_volunteers_full_name_id", table_name="volunteers")
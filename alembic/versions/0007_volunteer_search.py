@@ -0,0 +1,76 @@
+"""volunteer name search index
+
+Revision ID: 0007_volunteer_search
+Revises: 0006_listing_sort_indexes
+Create Date: 2026-10-18 00:00:00
+"""
+
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0007_volunteer_search"
+down_revision: Union[str, None] = "0006_listing_sort_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS volunteer_search USING fts5(search_name, content='volunteers', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS volunteers_search_insert AFTER INSERT ON volunteers BEGIN "
+    "INSERT INTO volunteer_search(rowid, search_name) VALUES (new.id, new.search_name); END",
+    "CREATE TRIGGER IF NOT EXISTS volunteers_search_delete AFTER DELETE ON volunteers BEGIN "
+    "INSERT INTO volunteer_search(volunteer_search, rowid, search_name) VALUES ('delete', old.id, old.search_name); END",
+    "CREATE TRIGGER IF NOT EXISTS volunteers_search_update AFTER UPDATE OF search_name ON volunteers BEGIN "
+    "INSERT INTO volunteer_search(volunteer_search, rowid, search_name) VALUES ('delete', old.id, old.search_name); "
+    "INSERT INTO volunteer_search(rowid, search_name) VALUES (new.id, new.search_name); END",
+)
+
+_INVISIBLE = re.compile("[\ufeff\u200b\u200c\u200d\u200e\u200f]")
+_WHITESPACE = re.compile(r"\s+")
+_ARABIC_FOLDS = str.maketrans({"\u0640": None, "\u0671": "ا", "\u0649": "ي", "\u0629": "ه"})
+_HONORIFIC = re.compile(
+    r"^(?:(?:[أا]\s*[.،]\s*د|د|[أا]|م|بروف|بروفيسور)\s*[.،]"
+    r"|(?:الدكتورة|الدكتور|دكتورة|دكتور|الأستاذة|الأستاذ|أستاذة|أستاذ|البروفيسور|بروفيسور)(?=\s))\s*"
+)
+
+
+def _search_key(value: str | None) -> str:
+    name = _WHITESPACE.sub(" ", _INVISIBLE.sub("", unicodedata.normalize("NFKC", value or ""))).strip().casefold()
+    while match := _HONORIFIC.match(name):
+        name = name[match.end() :]
+    name = "".join(char for char in unicodedata.normalize("NFKD", name) if not unicodedata.combining(char)).translate(_ARABIC_FOLDS)
+    return unicodedata.normalize("NFC", name)
+
+
+def upgrade() -> None:
+    op.add_column("volunteers", sa.Column("search_name", sa.String(length=255), server_default="", nullable=False))
+
+    bind = op.get_bind()
+    volunteers = sa.table("volunteers", sa.column("id", sa.Integer()), sa.column("full_name", sa.String()), sa.column("search_name", sa.String()))
+    rows = [{"volunteer_id": volunteer_id, "search_name": _search_key(full_name)} for volunteer_id, full_name in bind.execute(sa.select(volunteers.c.id, volunteers.c.full_name))]
+    if rows:
+        bind.execute(volunteers.update().where(volunteers.c.id == sa.bindparam("volunteer_id")).values(search_name=sa.bindparam("search_name")), rows)
+
+    if bind.dialect.name == "sqlite":
+        for statement in SEARCH_DDL:
+            op.execute(statement)
+        op.execute("INSERT INTO volunteer_search(volunteer_search) VALUES ('rebuild')")
+    elif bind.dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX ix_volunteers_search_name_trgm ON volunteers USING gin (search_name gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        for trigger in ("volunteers_search_insert", "volunteers_search_delete", "volunteers_search_update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS volunteer_search")
+    elif bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_volunteers_search_name_trgm")
+    with op.batch_alter_table("volunteers") as batch_op:
+        batch_op.drop_column("search_name")
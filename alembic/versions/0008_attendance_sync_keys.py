@@ -0,0 +1,40 @@
+"""attendance sync idempotency keys
+
+Revision ID: 0008_attendance_sync_keys
+Revises: 0007_volunteer_search
+Create Date: 2026-10-18 00:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0008_attendance_sync_keys"
+down_revision: Union[str, None] = "0007_volunteer_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "attendance_sync_keys",
+        sa.Column("kiosk_id", sa.String(length=100), nullable=False),
+        sa.Column("idempotency_key", sa.String(length=128), nullable=False),
+        sa.Column("action", sa.String(length=20), nullable=False),
+        sa.Column("shift_id", sa.Integer(), nullable=False),
+        sa.Column("volunteer_id", sa.Integer(), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(), nullable=False),
+        sa.Column("outcome", sa.String(length=20), nullable=False),
+        sa.Column("detail", sa.String(length=255), nullable=True),
+        sa.Column("attendance_id", sa.Integer(), nullable=True),
+        sa.Column("received_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("kiosk_id", "idempotency_key"),
+    )
+    op.create_index("ix_attendance_sync_keys_kiosk_occurred", "attendance_sync_keys", ["kiosk_id", "occurred_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_attendance_sync_keys_kiosk_occurred", table_name="attendance_sync_keys")
+    op.drop_table("attendance_sync_keys")
@@ -0,0 +1,37 @@
+"""attendance auto-close flag and open-row index
+
+Revision ID: 0009_attendance_auto_close
+Revises: 0008_attendance_sync_keys
+Create Date: 2026-10-18 00:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0009_attendance_auto_close"
+down_revision: Union[str, None] = "0008_attendance_sync_keys"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_ATTENDANCE = "checked_in_at IS NOT NULL AND checked_out_at IS NULL"
+
+
+def upgrade() -> None:
+    op.add_column("attendances", sa.Column("auto_closed", sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.create_index(
+        "ix_attendances_open_shift",
+        "attendances",
+        ["shift_id"],
+        unique=False,
+        sqlite_where=sa.text(OPEN_ATTENDANCE),
+        postgresql_where=sa.text(OPEN_ATTENDANCE),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_attendances_open_shift", table_name="attendances")
+    with op.batch_alter_table("attendances") as batch_op:
+        batch_op.drop_column("auto_closed")
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -12,6 +13,18 @@ class Settings(BaseSettings):
     jwt_secret_key: str = Field(default="change-me", alias="JWT_SECRET_KEY")
     jwt_algorithm: str = Field(default="HS256", alias="JWT_ALGORITHM")
     access_token_expire_minutes: int = Field(default=60, alias="ACCESS_TOKEN_EXPIRE_MINUTES")
+    import_max_concurrent_jobs: int = Field(default=2, alias="IMPORT_MAX_CONCURRENT_JOBS")
+    import_validation_workers: int | None = Field(default=None, alias="IMPORT_VALIDATION_WORKERS")
+    analytics_cache_size: int = Field(default=512, alias="ANALYTICS_CACHE_SIZE")
+    analytics_cache_ttl_seconds: float = Field(default=300, alias="ANALYTICS_CACHE_TTL_SECONDS")
+    analytics_engine: Literal["sql", "columnar"] = Field(default="sql", alias="ANALYTICS_ENGINE")
+    attendance_write_mode: Literal["direct", "journal"] = Field(default="direct", alias="ATTENDANCE_WRITE_MODE")
+    attendance_journal_dir: str = Field(default="./attendance_journal", alias="ATTENDANCE_JOURNAL_DIR")
+    attendance_journal_batch_size: int = Field(default=500, alias="ATTENDANCE_JOURNAL_BATCH_SIZE")
+    attendance_journal_flush_interval_seconds: float = Field(default=0.25, alias="ATTENDANCE_JOURNAL_FLUSH_INTERVAL_SECONDS")
+    attendance_sweep_interval_seconds: float = Field(default=300, alias="ATTENDANCE_SWEEP_INTERVAL_SECONDS")
+    attendance_sweep_grace_minutes: int = Field(default=60, alias="ATTENDANCE_SWEEP_GRACE_MINUTES")
+    attendance_sweep_batch_size: int = Field(default=500, alias="ATTENDANCE_SWEEP_BATCH_SIZE")
 
 
 @lru_cache
@@ -1,10 +1,13 @@
-from fastapi import Depends, HTTPException, status
+from collections.abc import Callable
+
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.core.security import decode_token
 from app.models.user import User, UserRole
+from app.services.data_version import data_versions
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
@@ -24,3 +27,19 @@ def require_admin(current_user: User = Depends(get_current_user)) -> User:
     if current_user.role != UserRole.admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
     return current_user
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def conditional_get(*tables: str) -> Callable[[Request, Response, Session], None]:
+    def check_etag(request: Request, response: Response, db: Session = Depends(get_db)) -> None:
+        etag = data_versions.etag(db, f"{request.url.path}?{request.url.query}", *tables)
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
+    return check_etag
@@ -0,0 +1,52 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import date
+from typing import Any
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    payload = json.dumps([sort, *(value.isoformat() if isinstance(value, date) else value for value in values)], ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, columns: Sequence[Any]) -> list[Any]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(payload, list) or len(payload) != len(columns) + 1 or payload[0] != sort:
+            raise ValueError(cursor)
+        return [
+            date.fromisoformat(value) if column.type.python_type is date else column.type.python_type(value)
+            for column, value in zip(columns, payload[1:])
+        ]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from None
+
+
+def keyset_page(
+    query: Query,
+    response: Response,
+    columns: Sequence[Any],
+    sort: str,
+    limit: int,
+    cursor: str | None = None,
+    include_total: bool = False,
+) -> list[Any]:
+    if include_total:
+        response.headers["X-Total-Count"] = str(query.order_by(None).count())
+    if cursor:
+        query = query.filter(tuple_(*columns) > tuple_(*decode_cursor(cursor, sort, columns)))
+
+    rows = query.order_by(*columns).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(sort, [getattr(rows[-1], column.key) for column in columns])
+    return rows
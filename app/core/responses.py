@@ -0,0 +1,63 @@
+import functools
+import inspect
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import orjson
+from fastapi import HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+FIELDS_DESCRIPTION = (
+    "Comma-separated subset of response fields to return, e.g. `id,full_name`. "
+    "When set, each item holds only the listed fields, so fields the response schema marks as required may be absent"
+)
+SPARSE_RESPONSE_DESCRIPTION = "Successful Response. With `fields`, each item holds only the requested fields"
+
+
+def parse_fields(fields: str | None, schema: type[BaseModel]) -> list[str]:
+    if not fields:
+        return list(schema.model_fields)
+    selected = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in selected if name not in schema.model_fields]
+    if unknown or not selected:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown fields: {', '.join(unknown) or fields}")
+    return [name for name in schema.model_fields if name in selected]
+
+
+def fast_response(items: Iterable[Any], fields: list[str], response: Response) -> FastJSONResponse:
+    include = set(fields)
+    content = [
+        item.model_dump(include=include) if isinstance(item, BaseModel) else {name: getattr(item, name) for name in fields}
+        for item in items
+    ]
+    return FastJSONResponse(content, headers=dict(response.headers))
+
+
+def fast_json(schema: type[BaseModel]) -> Callable[[Callable[..., Iterable[Any]]], Callable[..., FastJSONResponse]]:
+    def decorator(func: Callable[..., Iterable[Any]]) -> Callable[..., FastJSONResponse]:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, response: Response, fields: str | None = None, **kwargs: Any) -> FastJSONResponse:
+            return fast_response(func(*args, **kwargs), parse_fields(fields, schema), response)
+
+        extra = [
+            inspect.Parameter("response", inspect.Parameter.KEYWORD_ONLY, annotation=Response),
+            inspect.Parameter(
+                "fields",
+                inspect.Parameter.KEYWORD_ONLY,
+                default=Query(default=None, description=FIELDS_DESCRIPTION),
+                annotation=str | None,
+            ),
+        ]
+        wrapper.__signature__ = signature.replace(parameters=[*signature.parameters.values(), *extra])
+        return wrapper
+
+    return decorator
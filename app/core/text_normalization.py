@@ -0,0 +1,29 @@
+import re
+import unicodedata
+
+_INVISIBLE = re.compile("[\ufeff\u200b\u200c\u200d\u200e\u200f]")
+_WHITESPACE = re.compile(r"\s+")
+_ARABIC_FOLDS = str.maketrans({"\u0640": None, "\u0671": "ا", "\u0649": "ي", "\u0629": "ه"})
+_HONORIFIC = re.compile(
+    r"^(?:(?:[أا]\s*[.،]\s*د|د|[أا]|م|بروف|بروفيسور)\s*[.،]"
+    r"|(?:الدكتورة|الدكتور|دكتورة|دكتور|الأستاذة|الأستاذ|أستاذة|أستاذ|البروفيسور|بروفيسور)(?=\s))\s*"
+)
+
+
+def normalize_key(value: str | None) -> str:
+    text = unicodedata.normalize("NFKC", value or "")
+    text = _INVISIBLE.sub("", text)
+    return _WHITESPACE.sub(" ", text).strip().casefold()
+
+
+def normalize_name(value: str | None) -> str:
+    name = normalize_key(value)
+    while match := _HONORIFIC.match(name):
+        name = name[match.end() :]
+    return name
+
+
+def search_key(value: str | None) -> str:
+    name = unicodedata.normalize("NFKD", normalize_name(value))
+    name = "".join(char for char in name if not unicodedata.combining(char)).translate(_ARABIC_FOLDS)
+    return unicodedata.normalize("NFC", name)
@@ -1,14 +1,40 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from app.core.config import get_settings
-from app.routers import auth, events, volunteers
+from app.db.session import SessionLocal
+from app.routers import admin, analytics, attendance, auth, events, exports, volunteers
+from app.services.attendance_journal import attendance_journal
+from app.services.attendance_sweeper import attendance_sweeper
+from app.services.import_jobs import import_jobs
+from app.services.import_validation import validation_pool
 
 settings = get_settings()
-app = FastAPI(title=settings.app_name, version="0.1.0")
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    if settings.attendance_write_mode == "journal":
+        attendance_journal.start(SessionLocal)
+    attendance_sweeper.start(SessionLocal)
+    yield
+    attendance_sweeper.shutdown()
+    import_jobs.shutdown()
+    validation_pool.shutdown()
+    attendance_journal.shutdown()
+
+
+app = FastAPI(title=settings.app_name, version="0.1.0", lifespan=lifespan)
 
 app.include_router(auth.router)
 app.include_router(volunteers.router)
 app.include_router(events.router)
+app.include_router(attendance.router)
+app.include_router(analytics.router)
+app.include_router(exports.router)
+app.include_router(admin.router)
 
 
 @app.get("/health")
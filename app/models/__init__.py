@@ -1,5 +1,25 @@
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.attendance_sync import AttendanceSyncKey
+from app.models.data_version import DataVersion
 from app.models.event import Event
+from app.models.import_ledger import ImportedFile, ImportLedgerEntry
+from app.models.rollup import CategoryMonthlyHours, VolunteerDailyHours
+from app.models.shift import Shift
 from app.models.user import User, UserRole
 from app.models.volunteer import Volunteer
 
-__all__ = ["Event", "User", "UserRole", "Volunteer"]
+__all__ = [
+    "Attendance",
+    "AttendanceStatus",
+    "AttendanceSyncKey",
+    "CategoryMonthlyHours",
+    "DataVersion",
+    "Event",
+    "ImportLedgerEntry",
+    "ImportedFile",
+    "Shift",
+    "User",
+    "UserRole",
+    "Volunteer",
+    "VolunteerDailyHours",
+]
@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, Integer, UniqueConstraint, false, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -13,9 +13,15 @@ class AttendanceStatus(str, enum.Enum):
     late = "late"
 
 
+OPEN_ATTENDANCE = "checked_in_at IS NOT NULL AND checked_out_at IS NULL"
+
+
 class Attendance(Base):
     __tablename__ = "attendances"
-    __table_args__ = (UniqueConstraint("shift_id", "volunteer_id", name="uq_shift_volunteer"),)
+    __table_args__ = (
+        UniqueConstraint("shift_id", "volunteer_id", name="uq_shift_volunteer"),
+        Index("ix_attendances_open_shift", "shift_id", sqlite_where=text(OPEN_ATTENDANCE), postgresql_where=text(OPEN_ATTENDANCE)),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     shift_id: Mapped[int] = mapped_column(ForeignKey("shifts.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -24,6 +30,7 @@ class Attendance(Base):
     checked_out_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     minutes_worked: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     status: Mapped[AttendanceStatus] = mapped_column(Enum(AttendanceStatus), default=AttendanceStatus.present, nullable=False)
+    auto_closed: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false(), nullable=False)
 
     shift = relationship("Shift", back_populates="attendances")
     volunteer = relationship("Volunteer", back_populates="attendances")
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class AttendanceSyncKey(Base):
+    __tablename__ = "attendance_sync_keys"
+    __table_args__ = (Index("ix_attendance_sync_keys_kiosk_occurred", "kiosk_id", "occurred_at"),)
+
+    kiosk_id: Mapped[str] = mapped_column(String(100), primary_key=True)
+    idempotency_key: Mapped[str] = mapped_column(String(128), primary_key=True)
+    action: Mapped[str] = mapped_column(String(20), nullable=False)
+    shift_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    volunteer_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    outcome: Mapped[str] = mapped_column(String(20), nullable=False)
+    detail: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    attendance_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    received_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,13 +1,14 @@
 from datetime import date
 
-from sqlalchemy import Date, String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Date, Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (Index("ix_events_event_date_id", "event_date", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -15,3 +16,5 @@ class Event(Base):
     event_date: Mapped[date] = mapped_column(Date, nullable=False)
     location: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    shifts = relationship("Shift", back_populates="event", cascade="all, delete-orphan")
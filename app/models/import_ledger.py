@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ImportLedgerEntry(Base):
+    __tablename__ = "import_ledger"
+    __table_args__ = (UniqueConstraint("entity", "row_hash", name="uq_import_ledger_entity_row_hash"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    entity: Mapped[str] = mapped_column(String(50), nullable=False)
+    row_hash: Mapped[str] = mapped_column(String(32), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ImportedFile(Base):
+    __tablename__ = "imported_files"
+    __table_args__ = (UniqueConstraint("entity", "file_hash", name="uq_imported_files_entity_file_hash"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    entity: Mapped[str] = mapped_column(String(50), nullable=False)
+    file_hash: Mapped[str] = mapped_column(String(32), nullable=False)
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    imported_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,28 @@
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class VolunteerDailyHours(Base):
+    __tablename__ = "volunteer_daily_hours"
+
+    volunteer_id: Mapped[int] = mapped_column(ForeignKey("volunteers.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True, index=True)
+    minutes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    present_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    absent_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    late_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    record_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class CategoryMonthlyHours(Base):
+    __tablename__ = "category_monthly_hours"
+
+    event_category: Mapped[str] = mapped_column(String(100), primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True, index=True)
+    volunteer_id: Mapped[int] = mapped_column(ForeignKey("volunteers.id", ondelete="CASCADE"), primary_key=True, index=True)
+    minutes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    record_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -1,18 +1,44 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DDL, DateTime, Index, String, Text, event
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from app.db.base import Base
+from app.core.text_normalization import search_key
 
 
 class Volunteer(Base):
     __tablename__ = "volunteers"
+    __table_args__ = (Index("ix_volunteers_full_name_id", "full_name", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     volunteer_no: Mapped[str | None] = mapped_column(String(100), nullable=True)
     full_name: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
+    search_name: Mapped[str] = mapped_column(String(255), default="", server_default="", nullable=False)
     email: Mapped[str | None] = mapped_column(String(255), index=True, nullable=True)
     phone: Mapped[str | None] = mapped_column(String(50), nullable=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    attendances = relationship("Attendance", back_populates="volunteer", cascade="all, delete-orphan")
+
+    @validates("full_name")
+    def _sync_search_name(self, _: str, full_name: str) -> str:
+        self.search_name = search_key(full_name)
+        return full_name
+
+
+VOLUNTEER_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS volunteer_search USING fts5(search_name, content='volunteers', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS volunteers_search_insert AFTER INSERT ON volunteers BEGIN "
+    "INSERT INTO volunteer_search(rowid, search_name) VALUES (new.id, new.search_name); END",
+    "CREATE TRIGGER IF NOT EXISTS volunteers_search_delete AFTER DELETE ON volunteers BEGIN "
+    "INSERT INTO volunteer_search(volunteer_search, rowid, search_name) VALUES ('delete', old.id, old.search_name); END",
+    "CREATE TRIGGER IF NOT EXISTS volunteers_search_update AFTER UPDATE OF search_name ON volunteers BEGIN "
+    "INSERT INTO volunteer_search(volunteer_search, rowid, search_name) VALUES ('delete', old.id, old.search_name); "
+    "INSERT INTO volunteer_search(rowid, search_name) VALUES (new.id, new.search_name); END",
+)
+
+for statement in VOLUNTEER_SEARCH_DDL:
+    event.listen(Volunteer.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Volunteer.__table__, "before_drop", DDL("DROP TABLE IF EXISTS volunteer_search").execute_if(dialect="sqlite"))
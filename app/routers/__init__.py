@@ -1,3 +1,3 @@
-from app.routers import auth, events, volunteers
+from app.routers import admin, analytics, attendance, auth, events, exports, volunteers
 
-__all__ = ["auth", "events", "volunteers"]
+__all__ = ["admin", "analytics", "attendance", "auth", "events", "exports", "volunteers"]
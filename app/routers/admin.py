@@ -1,60 +1,152 @@
-import csv
+from collections.abc import Iterator
+from dataclasses import asdict
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, UploadFile
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
 
+from app.core.config import get_settings
 from app.core.deps import require_admin
 from app.db.session import get_db
-from app.schemas.imports import AdminImportResponse, ImportSummary
-from app.services.import_service import (
-    Summary,
-    import_attendance_rows,
-    import_events_rows,
-    import_volunteers_rows,
-    load_csv,
-)
+from app.schemas.analytics import AnalyticsCacheStats
+from app.schemas.attendance import AttendanceJournalStatus, AttendanceSweepRun, AttendanceSweeperStatus
+from app.schemas.imports import ImportJobRead, ImportSummary
+from app.services.analytics_cache import analytics_cache
+from app.services.attendance_journal import attendance_journal
+from app.services.attendance_sweeper import attendance_sweeper
+from app.services.import_jobs import ImportJob, ImportSource, import_jobs, spool_upload
+from app.services.import_service import AttendanceKeyIndex, Summary, iter_csv
+from app.services.import_validation import to_report_line, validate_import
+
+settings = get_settings()
 
 router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
 DATA_DIR = Path("data")
 
 
 def _to_summary(summary: Summary) -> ImportSummary:
-    return ImportSummary(imported=summary.imported, skipped=summary.skipped, failed=summary.failed)
+    return ImportSummary(imported=summary.imported, skipped=summary.skipped, failed=summary.failed, cached=summary.cached)
 
 
-async def _parse_upload(file: UploadFile | None) -> list[dict[str, str]]:
+def _to_job_read(job: ImportJob) -> ImportJobRead:
+    return ImportJobRead(
+        job_id=job.id,
+        status=job.status,
+        rows_processed=job.rows_processed,
+        volunteers=_to_summary(job.summaries["volunteers"]),
+        events=_to_summary(job.summaries["events"]),
+        attendance=_to_summary(job.summaries["attendance"]),
+        error=job.error,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+async def _import_source(file: UploadFile | None, template_name: str) -> ImportSource:
+    template = DATA_DIR / template_name
     if not file:
-        return []
-    content = (await file.read()).decode("utf-8-sig")
-    return list(csv.DictReader(content.splitlines()))
+        return ImportSource(path=None, fallback=template)
+    path = await run_in_threadpool(spool_upload, file.file)
+    return ImportSource(path=path, fallback=template, temporary=True)
+
+
+def _get_job_or_404(job_id: str) -> ImportJob:
+    job = import_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    return job
 
 
-@router.post("/import", response_model=AdminImportResponse)
+def _dry_run_report(sources: dict[str, ImportSource], index: AttendanceKeyIndex) -> Iterator[str]:
+    try:
+        paths = {entity: source.resolve() for entity, source in sources.items()}
+        rows = {entity: iter_csv(path) for entity, path in paths.items() if path is not None}
+        for record in validate_import(rows, index):
+            yield to_report_line(record)
+    finally:
+        for source in sources.values():
+            source.discard()
+
+
+@router.post(
+    "/import",
+    response_model=ImportJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={200: {"description": "Dry-run validation report, one JSON object per line", "content": {"application/x-ndjson": {}}}},
+)
 async def admin_import(
     db: Session = Depends(get_db),
     volunteers_file: UploadFile | None = File(default=None),
     events_file: UploadFile | None = File(default=None),
     attendance_file: UploadFile | None = File(default=None),
-) -> AdminImportResponse:
-    volunteers_rows = await _parse_upload(volunteers_file)
-    if not volunteers_rows and (DATA_DIR / "volunteers_import_template.csv").exists():
-        volunteers_rows = load_csv(DATA_DIR / "volunteers_import_template.csv")
-
-    events_rows = await _parse_upload(events_file)
-    if not events_rows and (DATA_DIR / "events_import_template.csv").exists():
-        events_rows = load_csv(DATA_DIR / "events_import_template.csv")
-
-    attendance_rows = await _parse_upload(attendance_file)
-    if not attendance_rows and (DATA_DIR / "attendance_import_template.csv").exists():
-        attendance_rows = load_csv(DATA_DIR / "attendance_import_template.csv")
-
-    volunteers = import_volunteers_rows(db, volunteers_rows)
-    events = import_events_rows(db, events_rows)
-    attendance = import_attendance_rows(db, attendance_rows)
-
-    return AdminImportResponse(
-        volunteers=_to_summary(volunteers),
-        events=_to_summary(events),
-        attendance=_to_summary(attendance),
+    dry_run: bool = Query(default=False),
+    incremental: bool = Query(default=True),
+) -> ImportJobRead | StreamingResponse:
+    sources = {
+        "volunteers": await _import_source(volunteers_file, "volunteers_import_template.csv"),
+        "events": await _import_source(events_file, "events_import_template.csv"),
+        "attendance": await _import_source(attendance_file, "attendance_import_template.csv"),
+    }
+    if dry_run:
+        return StreamingResponse(_dry_run_report(sources, AttendanceKeyIndex(db)), media_type="application/x-ndjson")
+
+    job = import_jobs.submit(sources, sessionmaker(bind=db.get_bind(), autoflush=False, autocommit=False), incremental)
+    return _to_job_read(job)
+
+
+@router.get("/import/{job_id}", response_model=ImportJobRead)
+def get_import_job(job_id: str) -> ImportJobRead:
+    return _to_job_read(_get_job_or_404(job_id))
+
+
+@router.delete("/import/{job_id}", response_model=ImportJobRead, status_code=status.HTTP_202_ACCEPTED)
+def cancel_import_job(job_id: str) -> ImportJobRead:
+    job = _get_job_or_404(job_id)
+    import_jobs.cancel(job.id)
+    return _to_job_read(job)
+
+
+@router.get("/cache", response_model=AnalyticsCacheStats)
+def get_analytics_cache_stats() -> AnalyticsCacheStats:
+    return AnalyticsCacheStats(
+        size=analytics_cache.size,
+        max_size=analytics_cache.max_size,
+        ttl_seconds=analytics_cache.ttl_seconds,
+        **asdict(analytics_cache.stats),
+    )
+
+
+@router.get("/attendance-sweeper", response_model=AttendanceSweeperStatus)
+def get_attendance_sweeper_status() -> AttendanceSweeperStatus:
+    return AttendanceSweeperStatus(
+        interval_seconds=attendance_sweeper.interval_seconds,
+        grace_minutes=attendance_sweeper.grace_minutes,
+        batch_size=attendance_sweeper.batch_size,
+        runs=attendance_sweeper.runs,
+        closed_total=attendance_sweeper.closed_total,
+        last_run=AttendanceSweepRun.model_validate(attendance_sweeper.last_run) if attendance_sweeper.last_run else None,
+    )
+
+
+@router.post("/attendance-sweeper/run", response_model=AttendanceSweepRun)
+def run_attendance_sweeper(db: Session = Depends(get_db)) -> AttendanceSweepRun:
+    return AttendanceSweepRun.model_validate(attendance_sweeper.run_once(db))
+
+
+@router.get("/attendance-journal", response_model=AttendanceJournalStatus)
+def get_attendance_journal_status() -> AttendanceJournalStatus:
+    return AttendanceJournalStatus(
+        write_mode=settings.attendance_write_mode,
+        started=attendance_journal.started,
+        batch_size=attendance_journal.batch_size,
+        flush_interval_seconds=attendance_journal.flush_interval_seconds,
+        queued=attendance_journal.queued(),
+        flushes=attendance_journal.flushes,
+        applied_total=attendance_journal.applied_total,
+        last_flush_at=attendance_journal.last_flush_at,
+        retries=attendance_journal.retries,
+        last_error=attendance_journal.last_error,
+        quarantined=attendance_journal.quarantined,
     )
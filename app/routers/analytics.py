@@ -1,49 +1,89 @@
-from datetime import date, datetime, time
+from datetime import date, timedelta
+from typing import Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func
+from sqlalchemy import and_, case, func
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_user
+from app.core.deps import conditional_get, get_current_user
+from app.core.responses import SPARSE_RESPONSE_DESCRIPTION, fast_json
 from app.db.session import get_db
 from app.models.attendance import Attendance, AttendanceStatus
 from app.models.event import Event
+from app.models.rollup import CategoryMonthlyHours, VolunteerDailyHours
 from app.models.shift import Shift
 from app.models.volunteer import Volunteer
 from app.schemas.analytics import (
     AwardItem,
+    CategoryHoursItem,
     EventCoverageResponse,
     LeaderboardItem,
+    ReliabilityItem,
     ReliabilityResponse,
     ShiftCoverageItem,
 )
+from app.services.analytics_cache import analytics_cache
+from app.services.columnar_analytics import columnar_snapshot
 
 router = APIRouter(prefix="/analytics", tags=["analytics"], dependencies=[Depends(get_current_user)])
 
 
-def _date_filtered_attendance(db: Session, from_date: date | None, to_date: date | None):
-    query = db.query(Attendance, Volunteer, Shift).join(Volunteer, Attendance.volunteer_id == Volunteer.id).join(Shift, Attendance.shift_id == Shift.id)
+HOURS_TABLES = ("volunteers", "shifts", "attendances")
+COVERAGE_TABLES = ("events", "shifts", "attendances")
+CUBE_TABLES = ("volunteers", "events", "shifts", "attendances")
+CUBE_DIMENSIONS = {
+    "category": CategoryMonthlyHours.event_category,
+    "month": CategoryMonthlyHours.month,
+    "volunteer_id": CategoryMonthlyHours.volunteer_id,
+}
+CubeDimension = Literal["category", "month", "volunteer_id"]
+RELIABILITY_SORT = Literal["volunteer_id", "-volunteer_id", "attendance_rate", "-attendance_rate", "total_records", "-total_records"]
+AWARD_TIERS = (("Tier A", 20 * 60), ("Tier B", 15 * 60), ("Tier C", 60))
+
+
+def _rollup_range(query, from_date: date | None, to_date: date | None):
     if from_date:
-        query = query.filter(Shift.start_time >= datetime.combine(from_date, time.min))
+        query = query.filter(VolunteerDailyHours.day >= from_date)
     if to_date:
-        query = query.filter(Shift.start_time <= datetime.combine(to_date, time.max))
+        query = query.filter(VolunteerDailyHours.day <= to_date)
     return query
 
 
-@router.get("/leaderboard", response_model=list[LeaderboardItem])
+def _volunteer_minutes(db: Session, from_date: date | None, to_date: date | None, total_minutes, *columns):
+    query = db.query(Volunteer.id, Volunteer.full_name, total_minutes, *columns).join(VolunteerDailyHours, VolunteerDailyHours.volunteer_id == Volunteer.id)
+    query = _rollup_range(query, from_date, to_date).filter(VolunteerDailyHours.record_count > 0)
+    return query.group_by(Volunteer.id, Volunteer.full_name)
+
+
+def _with_names(db: Session, ranked: list[tuple[int, int]]) -> list[tuple[int, str, int]]:
+    names = dict(db.query(Volunteer.id, Volunteer.full_name).filter(Volunteer.id.in_([volunteer_id for volunteer_id, _ in ranked])).all())
+    return [(volunteer_id, names[volunteer_id], minutes) for volunteer_id, minutes in ranked if volunteer_id in names]
+
+
+def _award_tier(minutes: int) -> str:
+    return next(name for name, minimum in AWARD_TIERS if minutes >= minimum)
+
+
+@router.get(
+    "/leaderboard",
+    response_model=list[LeaderboardItem],
+    response_description=SPARSE_RESPONSE_DESCRIPTION,
+    dependencies=[Depends(conditional_get(*HOURS_TABLES))],
+)
+@fast_json(LeaderboardItem)
+@analytics_cache.cached("leaderboard", HOURS_TABLES)
 def leaderboard(
     from_date: date | None = Query(default=None, alias="from"),
     to_date: date | None = Query(default=None, alias="to"),
     limit: int = 20,
     db: Session = Depends(get_db),
 ) -> list[LeaderboardItem]:
-    rows = _date_filtered_attendance(db, from_date, to_date).all()
-    totals: dict[int, tuple[str, int]] = {}
-    for attendance, volunteer, _ in rows:
-        current_name, current_minutes = totals.get(volunteer.id, (volunteer.full_name, 0))
-        totals[volunteer.id] = (current_name, current_minutes + attendance.minutes_worked)
-
-    ordered = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+    snapshot = columnar_snapshot(db)
+    if snapshot is not None:
+        rows = _with_names(db, snapshot.ranked_minutes(from_date, to_date, limit=limit))
+    else:
+        total_minutes = func.sum(VolunteerDailyHours.minutes)
+        rows = _volunteer_minutes(db, from_date, to_date, total_minutes).order_by(total_minutes.desc(), Volunteer.id).limit(limit).all()
     return [
         LeaderboardItem(
             volunteer_id=volunteer_id,
@@ -51,91 +91,230 @@ def leaderboard(
             total_minutes=minutes,
             total_hours=round(minutes / 60, 2),
         )
-        for volunteer_id, (name, minutes) in ordered
+        for volunteer_id, name, minutes in rows
     ]
 
 
-@router.get("/awards", response_model=list[AwardItem])
+@router.get(
+    "/awards",
+    response_model=list[AwardItem],
+    response_description=SPARSE_RESPONSE_DESCRIPTION,
+    dependencies=[Depends(conditional_get(*HOURS_TABLES))],
+)
+@fast_json(AwardItem)
+@analytics_cache.cached("awards", HOURS_TABLES)
 def awards(
     from_date: date | None = Query(default=None, alias="from"),
     to_date: date | None = Query(default=None, alias="to"),
     db: Session = Depends(get_db),
 ) -> list[AwardItem]:
-    board = leaderboard(from_date, to_date, 10_000, db)
-    output: list[AwardItem] = []
-    for item in board:
-        if item.total_hours >= 20:
-            tier = "Tier A"
-        elif item.total_hours >= 15:
-            tier = "Tier B"
-        elif item.total_hours >= 1:
-            tier = "Tier C"
-        else:
-            continue
-        output.append(AwardItem(volunteer_id=item.volunteer_id, full_name=item.full_name, tier=tier, total_hours=item.total_hours))
-    return output
+    snapshot = columnar_snapshot(db)
+    if snapshot is not None:
+        ranked = snapshot.ranked_minutes(from_date, to_date, minimum=AWARD_TIERS[-1][1])
+        rows = [(volunteer_id, name, minutes, _award_tier(minutes)) for volunteer_id, name, minutes in _with_names(db, ranked)]
+    else:
+        total_minutes = func.sum(VolunteerDailyHours.minutes)
+        tier = case(*((total_minutes >= minimum, name) for name, minimum in AWARD_TIERS))
+        query = _volunteer_minutes(db, from_date, to_date, total_minutes, tier).having(total_minutes >= AWARD_TIERS[-1][1])
+        rows = query.order_by(total_minutes.desc(), Volunteer.id).all()
+    return [
+        AwardItem(volunteer_id=volunteer_id, full_name=name, tier=tier_name, total_hours=round(minutes / 60, 2))
+        for volunteer_id, name, minutes, tier_name in rows
+    ]
 
 
-@router.get("/events/{event_id}/coverage", response_model=EventCoverageResponse)
-def event_coverage(event_id: int, db: Session = Depends(get_db)) -> EventCoverageResponse:
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+@router.get(
+    "/category-hours",
+    response_model=list[CategoryHoursItem],
+    response_description=SPARSE_RESPONSE_DESCRIPTION,
+    dependencies=[Depends(conditional_get(*CUBE_TABLES))],
+)
+@fast_json(CategoryHoursItem)
+@analytics_cache.cached("category_hours", CUBE_TABLES)
+def category_hours(
+    from_date: date | None = Query(default=None, alias="from", description="First day of the first month to include; the cube is monthly"),
+    to_date: date | None = Query(default=None, alias="to", description="Last day of the last month to include; the cube is monthly"),
+    categories: list[str] | None = Query(default=None, alias="category"),
+    volunteer_id: int | None = None,
+    group_by: list[CubeDimension] = Query(default=["category", "month"]),
+    db: Session = Depends(get_db),
+) -> list[CategoryHoursItem]:
+    if from_date and from_date.day != 1:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="'from' must be the first day of a month")
+    if to_date and (to_date + timedelta(days=1)).day != 1:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="'to' must be the last day of a month")
+    dimensions = list(dict.fromkeys(group_by))
+    columns = [CUBE_DIMENSIONS[name] for name in dimensions]
+    total_minutes = func.sum(CategoryMonthlyHours.minutes)
+    record_count = func.sum(CategoryMonthlyHours.record_count)
+    query = db.query(*columns, total_minutes, record_count)
+    if from_date:
+        query = query.filter(CategoryMonthlyHours.month >= from_date)
+    if to_date:
+        query = query.filter(CategoryMonthlyHours.month <= to_date)
+    if categories:
+        query = query.filter(CategoryMonthlyHours.event_category.in_(categories))
+    if volunteer_id is not None:
+        query = query.filter(CategoryMonthlyHours.volunteer_id == volunteer_id)
 
-    shifts = db.query(Shift).filter(Shift.event_id == event_id).all()
-    shift_items: list[ShiftCoverageItem] = []
-    total_required = 0
-    total_attended = 0
-
-    for shift in shifts:
-        attended = (
-            db.query(func.count(Attendance.id))
-            .filter(Attendance.shift_id == shift.id, Attendance.checked_in_at.is_not(None))
-            .scalar()
-            or 0
+    rows = query.group_by(*columns).having(record_count > 0).order_by(*columns).all()
+    return [
+        CategoryHoursItem(
+            **dict(zip(dimensions, row)),
+            total_minutes=row[-2],
+            total_hours=round(row[-2] / 60, 2),
+            record_count=row[-1],
         )
-        total_required += shift.required_volunteers
-        total_attended += attended
-        shift_items.append(
+        for row in rows
+    ]
+
+
+def _coverage(db: Session, *conditions) -> list[EventCoverageResponse]:
+    attended = func.count(Attendance.id)
+    rows = (
+        db.query(Event.id, Shift.id, Shift.title, Shift.required_volunteers, attended)
+        .outerjoin(Shift, Shift.event_id == Event.id)
+        .outerjoin(Attendance, and_(Attendance.shift_id == Shift.id, Attendance.checked_in_at.is_not(None)))
+        .filter(*conditions)
+        .group_by(Event.id, Shift.id, Shift.title, Shift.required_volunteers)
+        .order_by(Event.event_date, Event.id, Shift.id)
+        .all()
+    )
+
+    coverage: dict[int, EventCoverageResponse] = {}
+    for event_id, shift_id, shift_title, required, attended_count in rows:
+        item = coverage.setdefault(event_id, EventCoverageResponse(event_id=event_id, total_required=0, total_attended=0, shifts=[]))
+        if shift_id is None:
+            continue
+        item.total_required += required
+        item.total_attended += attended_count
+        item.shifts.append(
             ShiftCoverageItem(
-                shift_id=shift.id,
-                shift_title=shift.title,
-                required_volunteers=shift.required_volunteers,
-                attended_volunteers=attended,
+                shift_id=shift_id,
+                shift_title=shift_title,
+                required_volunteers=required,
+                attended_volunteers=attended_count,
             )
         )
-
-    return EventCoverageResponse(
-        event_id=event_id,
-        total_required=total_required,
-        total_attended=total_attended,
-        shifts=shift_items,
-    )
+    return list(coverage.values())
 
 
-@router.get("/volunteers/{volunteer_id}/reliability", response_model=ReliabilityResponse)
-def reliability(
-    volunteer_id: int,
+@router.get(
+    "/coverage",
+    response_model=list[EventCoverageResponse],
+    response_description=SPARSE_RESPONSE_DESCRIPTION,
+    dependencies=[Depends(conditional_get(*COVERAGE_TABLES))],
+)
+@fast_json(EventCoverageResponse)
+@analytics_cache.cached("coverage", COVERAGE_TABLES)
+def coverage(
     from_date: date | None = Query(default=None, alias="from"),
     to_date: date | None = Query(default=None, alias="to"),
+    category: str | None = None,
     db: Session = Depends(get_db),
-) -> ReliabilityResponse:
-    volunteer = db.query(Volunteer).filter(Volunteer.id == volunteer_id).first()
-    if not volunteer:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Volunteer not found")
+) -> list[EventCoverageResponse]:
+    conditions = []
+    if from_date:
+        conditions.append(Event.event_date >= from_date)
+    if to_date:
+        conditions.append(Event.event_date <= to_date)
+    if category:
+        conditions.append(Event.event_category == category)
+    return _coverage(db, *conditions)
+
+
+@router.get("/events/{event_id}/coverage", response_model=EventCoverageResponse, dependencies=[Depends(conditional_get(*COVERAGE_TABLES))])
+@analytics_cache.cached("event_coverage", COVERAGE_TABLES)
+def event_coverage(event_id: int, db: Session = Depends(get_db)) -> EventCoverageResponse:
+    items = _coverage(db, Event.id == event_id)
+    if not items:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+    return items[0]
 
-    rows = _date_filtered_attendance(db, from_date, to_date).filter(Attendance.volunteer_id == volunteer_id).all()
-    attended = sum(1 for attendance, _, _ in rows if attendance.status == AttendanceStatus.present)
-    absent = sum(1 for attendance, _, _ in rows if attendance.status == AttendanceStatus.absent)
-    late = sum(1 for attendance, _, _ in rows if attendance.status == AttendanceStatus.late)
-    total = len(rows)
-    attendance_rate = round((attended + late) / total, 2) if total else 0.0
 
-    return ReliabilityResponse(
+def _reliability_query(db: Session, from_date: date | None, to_date: date | None):
+    in_range = VolunteerDailyHours.volunteer_id == Volunteer.id
+    if from_date:
+        in_range = and_(in_range, VolunteerDailyHours.day >= from_date)
+    if to_date:
+        in_range = and_(in_range, VolunteerDailyHours.day <= to_date)
+
+    attended = func.coalesce(func.sum(VolunteerDailyHours.present_count), 0)
+    late = func.coalesce(func.sum(VolunteerDailyHours.late_count), 0)
+    total = func.coalesce(func.sum(VolunteerDailyHours.record_count), 0)
+    rate = case((total > 0, (attended + late) * 1.0 / total), else_=0.0)
+    query = (
+        db.query(
+            Volunteer.id,
+            Volunteer.full_name,
+            attended,
+            func.coalesce(func.sum(VolunteerDailyHours.absent_count), 0),
+            late,
+            total,
+        )
+        .select_from(Volunteer)
+        .outerjoin(VolunteerDailyHours, in_range)
+        .group_by(Volunteer.id, Volunteer.full_name)
+    )
+    return query, rate, total
+
+
+def _to_reliability(volunteer_id: int, full_name: str, attended: int, absent: int, late: int, total: int) -> ReliabilityItem:
+    return ReliabilityItem(
         volunteer_id=volunteer_id,
-        attendance_rate=attendance_rate,
+        full_name=full_name,
+        attendance_rate=round((attended + late) / total, 2) if total else 0.0,
         attended_count=attended,
         absent_count=absent,
         late_count=late,
         total_records=total,
     )
+
+
+@router.get(
+    "/reliability",
+    response_model=list[ReliabilityItem],
+    response_description=SPARSE_RESPONSE_DESCRIPTION,
+    dependencies=[Depends(conditional_get(*HOURS_TABLES))],
+)
+@fast_json(ReliabilityItem)
+@analytics_cache.cached("bulk_reliability", HOURS_TABLES)
+def bulk_reliability(
+    from_date: date | None = Query(default=None, alias="from"),
+    to_date: date | None = Query(default=None, alias="to"),
+    volunteer_ids: list[int] | None = Query(default=None, alias="volunteer_id"),
+    sort: RELIABILITY_SORT = "volunteer_id",
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+) -> list[ReliabilityItem]:
+    query, rate, total = _reliability_query(db, from_date, to_date)
+    if volunteer_ids:
+        query = query.filter(Volunteer.id.in_(volunteer_ids))
+    sort_columns = {"attendance_rate": rate, "total_records": total, "volunteer_id": Volunteer.id}
+    column = sort_columns[sort.removeprefix("-")]
+    query = query.order_by(column.desc() if sort.startswith("-") else column.asc(), Volunteer.id)
+    return [_to_reliability(*row) for row in query.offset(offset).limit(limit).all()]
+
+
+@router.get("/volunteers/{volunteer_id}/reliability", response_model=ReliabilityResponse, dependencies=[Depends(conditional_get(*HOURS_TABLES))])
+@analytics_cache.cached("reliability", HOURS_TABLES)
+def reliability(
+    volunteer_id: int,
+    from_date: date | None = Query(default=None, alias="from"),
+    to_date: date | None = Query(default=None, alias="to"),
+    db: Session = Depends(get_db),
+) -> ReliabilityResponse:
+    snapshot = columnar_snapshot(db)
+    if snapshot is None:
+        query, _, _ = _reliability_query(db, from_date, to_date)
+        row = query.filter(Volunteer.id == volunteer_id).first()
+    else:
+        full_name = db.query(Volunteer.full_name).filter(Volunteer.id == volunteer_id).scalar()
+        counts = snapshot.status_counts(volunteer_id, from_date, to_date)
+        status_counts = (counts[AttendanceStatus.present], counts[AttendanceStatus.absent], counts[AttendanceStatus.late], sum(counts.values()))
+        row = (volunteer_id, full_name, *status_counts) if full_name is not None else None
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Volunteer not found")
+
+    return ReliabilityResponse(**_to_reliability(*row).model_dump(exclude={"full_name"}))
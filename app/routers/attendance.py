@@ -1,99 +1,157 @@
 from datetime import date, datetime, time
+from typing import Any, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import Row, func, select
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_user
+from app.core.config import get_settings
+from app.core.deps import conditional_get, get_current_user
 from app.db.session import get_db
-from app.models.attendance import Attendance
+from app.models.attendance import Attendance, AttendanceStatus
 from app.models.event import Event
 from app.models.shift import Shift
 from app.models.volunteer import Volunteer
 from app.schemas.attendance import (
+    AttendanceBatchResponse,
+    AttendanceBatchResult,
     AttendanceRead,
+    AttendanceReceipt,
+    AttendanceSyncRequest,
+    AttendanceSyncResponse,
+    CheckInBatchRequest,
     CheckInRequest,
+    CheckOutBatchRequest,
     CheckOutRequest,
+    VolunteerEventHours,
+    VolunteerHoursBatchRequest,
+    VolunteerHoursBatchResponse,
     VolunteerHoursBreakdown,
     VolunteerHoursResponse,
+    VolunteerHoursTotal,
 )
-from app.services.attendance_service import compute_minutes_worked
+from app.services.analytics_cache import analytics_cache
+from app.services.attendance_journal import AttendanceRejected, PendingAttendance, attendance_journal
+from app.services.attendance_service import (
+    AttendanceAction,
+    AttendanceActionKind,
+    apply_attendance_actions,
+    attendance_rejection,
+    bump_attendances,
+    check_in_attendance,
+    check_in_rejection,
+    check_out_attendance,
+    check_out_rejection,
+)
+from app.services.attendance_sync import sync_attendance
+from app.services.columnar_analytics import columnar_snapshot
+from app.services.rollup_service import record_attendance_change
+
+settings = get_settings()
 
 router = APIRouter(tags=["attendance"], dependencies=[Depends(get_current_user)])
 
+HOURS_TABLES = ("volunteers", "events", "shifts", "attendances")
 
-@router.post("/shifts/{shift_id}/check-in", response_model=AttendanceRead, status_code=status.HTTP_201_CREATED)
-def check_in(shift_id: int, payload: CheckInRequest, db: Session = Depends(get_db)) -> Attendance:
-    shift = db.query(Shift).filter(Shift.id == shift_id).first()
+
+def _shift_rollup_key(db: Session, shift_id: int) -> Row[Any]:
+    shift = db.execute(
+        select(Shift.start_time, Event.event_category).join(Event, Shift.event_id == Event.id).where(Shift.id == shift_id)
+    ).first()
     if not shift:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Shift not found")
+    return shift
 
-    volunteer = db.query(Volunteer).filter(Volunteer.id == payload.volunteer_id).first()
-    if not volunteer:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Volunteer not found")
 
-    existing = (
-        db.query(Attendance)
-        .filter(Attendance.shift_id == shift_id, Attendance.volunteer_id == payload.volunteer_id)
-        .first()
-    )
-    if existing and existing.checked_in_at is not None:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Volunteer already checked in for this shift")
-
-    checked_in_at = payload.checked_in_at or datetime.utcnow()
-    if existing:
-        existing.checked_in_at = checked_in_at
-        existing.status = payload.status
-        attendance = existing
-    else:
-        attendance = Attendance(
-            shift_id=shift_id,
-            volunteer_id=payload.volunteer_id,
-            checked_in_at=checked_in_at,
-            status=payload.status,
-        )
-        db.add(attendance)
+def _journal(
+    db: Session, action: AttendanceActionKind, shift_id: int, volunteer_id: int, at: datetime, attendance_status: AttendanceStatus | None = None
+) -> JSONResponse:
+    if not attendance_journal.started:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Attendance journal is not running")
+    try:
+        pending = attendance_journal.record(db, action, shift_id, volunteer_id, at, attendance_status)
+    except AttendanceRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail) from None
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=AttendanceReceipt.model_validate(pending).model_dump(mode="json"))
 
+
+@router.post(
+    "/shifts/{shift_id}/check-in",
+    response_model=AttendanceRead,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": AttendanceReceipt}},
+)
+def check_in(shift_id: int, payload: CheckInRequest, db: Session = Depends(get_db)) -> AttendanceRead | JSONResponse:
+    if settings.attendance_write_mode == "journal":
+        return _journal(db, "check_in", shift_id, payload.volunteer_id, payload.checked_in_at or datetime.utcnow(), payload.status)
+
+    shift = _shift_rollup_key(db, shift_id)
+    attendance, previous = check_in_attendance(db, shift_id, payload.volunteer_id, payload.checked_in_at or datetime.utcnow(), payload.status)
+    if attendance is None:
+        db.rollback()
+        status_code, detail = check_in_rejection(db, payload.volunteer_id)
+        raise HTTPException(status_code=status_code, detail=detail)
+
+    record_attendance_change(db, attendance, shift.start_time.date(), shift.event_category, previous)
+    bump_attendances(db, append_only=previous is None)
     db.commit()
-    db.refresh(attendance)
-    return attendance
+    return AttendanceRead.model_validate(attendance)
 
 
-@router.post("/shifts/{shift_id}/check-out", response_model=AttendanceRead)
-def check_out(shift_id: int, payload: CheckOutRequest, db: Session = Depends(get_db)) -> Attendance:
-    attendance = (
-        db.query(Attendance)
-        .filter(Attendance.shift_id == shift_id, Attendance.volunteer_id == payload.volunteer_id)
-        .first()
-    )
-    if not attendance or not attendance.checked_in_at:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot check out without check in")
+@router.post("/shifts/{shift_id}/check-out", response_model=AttendanceRead, responses={status.HTTP_202_ACCEPTED: {"model": AttendanceReceipt}})
+def check_out(shift_id: int, payload: CheckOutRequest, db: Session = Depends(get_db)) -> AttendanceRead | JSONResponse:
+    if settings.attendance_write_mode == "journal":
+        return _journal(db, "check_out", shift_id, payload.volunteer_id, payload.checked_out_at or datetime.utcnow())
 
-    if attendance.checked_out_at is not None:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Volunteer already checked out")
+    checked_out = check_out_attendance(db, shift_id, payload.volunteer_id, payload.checked_out_at or datetime.utcnow())
+    if checked_out is None:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=check_out_rejection(db, shift_id, payload.volunteer_id))
 
-    checked_out_at = payload.checked_out_at or datetime.utcnow()
-    if checked_out_at < attendance.checked_in_at:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Check-out cannot occur before check-in")
+    attendance, previous_minutes = checked_out
+    shift = _shift_rollup_key(db, shift_id)
+    record_attendance_change(db, attendance, shift.start_time.date(), shift.event_category, (previous_minutes, attendance.status))
+    bump_attendances(db, append_only=True)
+    db.commit()
+    return AttendanceRead.model_validate(attendance)
 
-    attendance.checked_out_at = checked_out_at
-    attendance.minutes_worked = compute_minutes_worked(attendance.checked_in_at, checked_out_at)
 
+def _batch_results(db: Session, actions: list[AttendanceAction], applied: Literal["checked_in", "checked_out"]) -> AttendanceBatchResponse:
+    results = []
+    for index, (action, row) in enumerate(zip(actions, apply_attendance_actions(db, actions))):
+        if row is None:
+            result = AttendanceBatchResult(index=index, volunteer_id=action.volunteer_id, status="rejected", detail=attendance_rejection(db, action)[1])
+        else:
+            attendance = AttendanceRead.model_validate(row)
+            result = AttendanceBatchResult(index=index, volunteer_id=action.volunteer_id, status=applied, attendance=attendance)
+        results.append(result)
     db.commit()
-    db.refresh(attendance)
-    return attendance
+    return AttendanceBatchResponse(results=results)
 
 
-@router.get("/volunteers/{volunteer_id}/hours", response_model=VolunteerHoursResponse)
-def volunteer_hours(
-    volunteer_id: int,
-    from_date: date | None = Query(default=None, alias="from"),
-    to_date: date | None = Query(default=None, alias="to"),
-    db: Session = Depends(get_db),
-) -> VolunteerHoursResponse:
-    volunteer = db.query(Volunteer).filter(Volunteer.id == volunteer_id).first()
-    if not volunteer:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Volunteer not found")
+@router.post("/shifts/{shift_id}/check-in:batch", response_model=AttendanceBatchResponse)
+def check_in_batch(shift_id: int, payload: CheckInBatchRequest, db: Session = Depends(get_db)) -> AttendanceBatchResponse:
+    _shift_rollup_key(db, shift_id)
+    now = datetime.utcnow()
+    actions = [AttendanceAction("check_in", shift_id, item.volunteer_id, item.checked_in_at or now, item.status) for item in payload.items]
+    return _batch_results(db, actions, "checked_in")
+
+
+@router.post("/shifts/{shift_id}/check-out:batch", response_model=AttendanceBatchResponse)
+def check_out_batch(shift_id: int, payload: CheckOutBatchRequest, db: Session = Depends(get_db)) -> AttendanceBatchResponse:
+    _shift_rollup_key(db, shift_id)
+    now = datetime.utcnow()
+    actions = [AttendanceAction("check_out", shift_id, item.volunteer_id, item.checked_out_at or now) for item in payload.items]
+    return _batch_results(db, actions, "checked_out")
+
 
+@router.post("/attendance/sync", response_model=AttendanceSyncResponse)
+def sync_kiosk_attendance(payload: AttendanceSyncRequest, db: Session = Depends(get_db)) -> AttendanceSyncResponse:
+    return sync_attendance(db, payload.kiosk_id, payload.events)
+
+
+def _hours_breakdown(db: Session, volunteer_id: int, from_date: date | None, to_date: date | None) -> list[VolunteerHoursBreakdown]:
     query = db.query(Attendance, Shift, Event).join(Shift, Attendance.shift_id == Shift.id).join(Event, Shift.event_id == Event.id)
     query = query.filter(Attendance.volunteer_id == volunteer_id)
 
@@ -103,10 +161,29 @@ def volunteer_hours(
         query = query.filter(Shift.start_time <= datetime.combine(to_date, time.max))
 
     rows = query.all()
-    breakdown = [
+    return [
         VolunteerHoursBreakdown(shift_id=shift.id, event_title=event.title, minutes_worked=attendance.minutes_worked)
         for attendance, shift, event in rows
     ]
+
+
+@analytics_cache.cached("volunteer_hours", HOURS_TABLES)
+def _volunteer_hours(volunteer_id: int, from_date: date | None, to_date: date | None, db: Session) -> VolunteerHoursResponse:
+    volunteer = db.query(Volunteer).filter(Volunteer.id == volunteer_id).first()
+    if not volunteer:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Volunteer not found")
+
+    snapshot = columnar_snapshot(db)
+    if snapshot is not None:
+        rows = snapshot.volunteer_rows(volunteer_id, from_date, to_date)
+        titles = dict(db.query(Event.id, Event.title).filter(Event.id.in_({event_id for _, event_id, _ in rows})).all())
+        breakdown = [
+            VolunteerHoursBreakdown(shift_id=shift_id, event_title=titles[event_id], minutes_worked=minutes)
+            for shift_id, event_id, minutes in rows
+        ]
+    else:
+        breakdown = _hours_breakdown(db, volunteer_id, from_date, to_date)
+
     total_minutes = sum(item.minutes_worked for item in breakdown)
     return VolunteerHoursResponse(
         volunteer_id=volunteer_id,
@@ -116,3 +193,76 @@ def volunteer_hours(
         total_hours=round(total_minutes / 60, 2),
         breakdown=breakdown,
     )
+
+
+def _with_pending(hours: VolunteerHoursResponse, pending: list[PendingAttendance]) -> VolunteerHoursResponse:
+    breakdown = {item.shift_id: item for item in hours.breakdown}
+    for item in pending:
+        if hours.from_date and item.shift_start < datetime.combine(hours.from_date, time.min):
+            continue
+        if hours.to_date and item.shift_start > datetime.combine(hours.to_date, time.max):
+            continue
+        breakdown[item.shift_id] = VolunteerHoursBreakdown(shift_id=item.shift_id, event_title=item.event_title, minutes_worked=item.minutes_worked)
+
+    total_minutes = sum(item.minutes_worked for item in breakdown.values())
+    return hours.model_copy(
+        update={"total_minutes": total_minutes, "total_hours": round(total_minutes / 60, 2), "breakdown": list(breakdown.values())}
+    )
+
+
+@router.get("/volunteers/{volunteer_id}/hours", response_model=VolunteerHoursResponse, dependencies=[Depends(conditional_get(*HOURS_TABLES))])
+def volunteer_hours(
+    volunteer_id: int,
+    from_date: date | None = Query(default=None, alias="from"),
+    to_date: date | None = Query(default=None, alias="to"),
+    db: Session = Depends(get_db),
+) -> VolunteerHoursResponse:
+    hours = _volunteer_hours(volunteer_id, from_date, to_date, db)
+    pending = attendance_journal.pending_for(volunteer_id)
+    return _with_pending(hours, pending) if pending else hours
+
+
+@router.post("/volunteers/hours:batch", response_model=VolunteerHoursBatchResponse)
+def volunteer_hours_batch(payload: VolunteerHoursBatchRequest, db: Session = Depends(get_db)) -> VolunteerHoursBatchResponse:
+    requested = list(dict.fromkeys(payload.volunteer_ids))
+    hours = (
+        select(Attendance.volunteer_id, Event.id.label("event_id"), Event.title, func.sum(Attendance.minutes_worked).label("minutes"))
+        .join(Shift, Attendance.shift_id == Shift.id)
+        .join(Event, Shift.event_id == Event.id)
+        .where(Attendance.volunteer_id.in_(requested))
+        .group_by(Attendance.volunteer_id, Event.id, Event.title)
+    )
+    if payload.from_date:
+        hours = hours.where(Shift.start_time >= datetime.combine(payload.from_date, time.min))
+    if payload.to_date:
+        hours = hours.where(Shift.start_time <= datetime.combine(payload.to_date, time.max))
+    hours = hours.subquery()
+
+    rows = (
+        db.query(Volunteer.id, hours.c.event_id, hours.c.title, hours.c.minutes)
+        .outerjoin(hours, hours.c.volunteer_id == Volunteer.id)
+        .filter(Volunteer.id.in_(requested))
+        .order_by(Volunteer.id, hours.c.event_id)
+        .all()
+    )
+
+    totals: dict[int, VolunteerHoursTotal] = {}
+    for volunteer_id, event_id, event_title, minutes in rows:
+        item = totals.setdefault(
+            volunteer_id,
+            VolunteerHoursTotal(volunteer_id=volunteer_id, total_minutes=0, total_hours=0.0, events=[] if payload.include_breakdown else None),
+        )
+        if event_id is None:
+            continue
+        item.total_minutes += minutes
+        if item.events is not None:
+            item.events.append(VolunteerEventHours(event_id=event_id, event_title=event_title, minutes_worked=minutes))
+    for item in totals.values():
+        item.total_hours = round(item.total_minutes / 60, 2)
+
+    return VolunteerHoursBatchResponse(
+        from_date=payload.from_date,
+        to_date=payload.to_date,
+        volunteers=[totals[volunteer_id] for volunteer_id in requested if volunteer_id in totals],
+        missing_volunteer_ids=[volunteer_id for volunteer_id in requested if volunteer_id not in totals],
+    )
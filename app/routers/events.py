@@ -1,26 +1,99 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_user
+from app.core.deps import conditional_get, get_current_user
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page
+from app.core.responses import FIELDS_DESCRIPTION, SPARSE_RESPONSE_DESCRIPTION, FastJSONResponse, fast_response, parse_fields
 from app.db.session import get_db
+from app.models.attendance import Attendance
 from app.models.event import Event
-from app.schemas.event import EventCreate, EventRead, EventUpdate
+from app.models.shift import Shift
+from app.schemas.batch import BatchDeleteRequest, BatchResponse
+from app.schemas.event import EventBatchCreate, EventBatchUpdate, EventCreate, EventRead, EventUpdate
+from app.services.bulk_service import batch_results, bulk_create, bulk_update, existing_ids
+from app.services.data_version import data_versions
+from app.services.import_ledger import forget_imports
+from app.services.rollup_service import add_to_category_cube, remove_from_category_cube, remove_from_rollups
 
 router = APIRouter(prefix="/events", tags=["events"], dependencies=[Depends(get_current_user)])
 
+EventSort = Literal["id", "event_date"]
+EVENT_SORTS = {"id": (Event.id,), "event_date": (Event.event_date, Event.id)}
+
 
 @router.post("", response_model=EventRead, status_code=status.HTTP_201_CREATED)
 def create_event(payload: EventCreate, db: Session = Depends(get_db)) -> Event:
     event = Event(**payload.model_dump())
     db.add(event)
+    data_versions.bump(db, "events")
     db.commit()
     db.refresh(event)
     return event
 
 
-@router.get("", response_model=list[EventRead])
-def list_events(db: Session = Depends(get_db)) -> list[Event]:
-    return db.query(Event).order_by(Event.id).all()
+@router.post(":batch", response_model=BatchResponse, status_code=status.HTTP_201_CREATED)
+def create_events_batch(payload: EventBatchCreate, db: Session = Depends(get_db)) -> BatchResponse:
+    result = bulk_create(db, Event, [item.model_dump() for item in payload.items])
+    data_versions.bump(db, "events")
+    db.commit()
+    return result
+
+
+@router.patch(":batch", response_model=BatchResponse)
+def update_events_batch(payload: EventBatchUpdate, db: Session = Depends(get_db)) -> BatchResponse:
+    rows = [item.model_dump(exclude_unset=True) for item in payload.items]
+    categories = dict(db.execute(select(Event.id, Event.event_category).where(Event.id.in_({row["id"] for row in rows}))).tuples().all())
+    recategorised = {
+        row["id"] for row in rows if row["id"] in categories and "event_category" in row and row["event_category"] != categories[row["id"]]
+    }
+    if recategorised:
+        remove_from_category_cube(db, Shift.event_id.in_(recategorised))
+    result = bulk_update(db, Event, rows, set(categories))
+    if recategorised:
+        add_to_category_cube(db, Shift.event_id.in_(recategorised))
+    data_versions.bump(db, "events")
+    db.commit()
+    return result
+
+
+@router.delete(":batch", response_model=BatchResponse)
+def delete_events_batch(payload: BatchDeleteRequest, db: Session = Depends(get_db)) -> BatchResponse:
+    found = existing_ids(db, Event, payload.ids)
+    if found:
+        shift_ids = select(Shift.id).where(Shift.event_id.in_(found))
+        remove_from_rollups(db, Shift.event_id.in_(found))
+        db.execute(delete(Attendance).where(Attendance.shift_id.in_(shift_ids)))
+        db.execute(delete(Shift).where(Shift.event_id.in_(found)))
+        db.execute(delete(Event).where(Event.id.in_(found)))
+        forget_imports(db, "events", "attendance")
+        data_versions.bump(db, "events", "shifts", "attendances")
+        db.commit()
+    return batch_results(payload.ids, found, "deleted")
+
+
+@router.get(
+    "",
+    response_model=list[EventRead],
+    response_description=SPARSE_RESPONSE_DESCRIPTION,
+    dependencies=[Depends(conditional_get("events"))],
+)
+def list_events(
+    response: Response,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    sort: EventSort = "id",
+    include_total: bool = False,
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_db),
+) -> FastJSONResponse:
+    selected = parse_fields(fields, EventRead)
+    sort_columns = EVENT_SORTS[sort]
+    columns = [getattr(Event, name) for name in selected] + [column for column in sort_columns if column.key not in selected]
+    rows = keyset_page(db.query(*columns), response, sort_columns, sort, limit, cursor, include_total)
+    return fast_response(rows, selected, response)
 
 
 @router.get("/{event_id}", response_model=EventRead)
@@ -37,8 +110,16 @@ def update_event(event_id: int, payload: EventUpdate, db: Session = Depends(get_
     if not event:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
 
-    for key, value in payload.model_dump(exclude_unset=True).items():
+    changes = payload.model_dump(exclude_unset=True)
+    recategorised = "event_category" in changes and changes["event_category"] != event.event_category
+    if recategorised:
+        remove_from_category_cube(db, Shift.event_id == event_id)
+    for key, value in changes.items():
         setattr(event, key, value)
+    if recategorised:
+        db.flush()
+        add_to_category_cube(db, Shift.event_id == event_id)
+    data_versions.bump(db, "events")
     db.commit()
     db.refresh(event)
     return event
@@ -49,6 +130,9 @@ def delete_event(event_id: int, db: Session = Depends(get_db)) -> None:
     event = db.query(Event).filter(Event.id == event_id).first()
     if not event:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+    remove_from_rollups(db, Shift.event_id == event_id)
     db.delete(event)
+    forget_imports(db, "events", "attendance")
+    data_versions.bump(db, "events", "shifts", "attendances")
     db.commit()
     return None
@@ -0,0 +1,45 @@
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.deps import get_current_user
+from app.db.session import get_db
+from app.services.export_service import EXPORT_MEDIA_TYPES, attendance_export_query, hours_export_query, stream_export
+
+router = APIRouter(prefix="/exports", tags=["exports"], dependencies=[Depends(get_current_user)])
+
+ExportFormat = Literal["csv", "ndjson"]
+
+
+def _export_response(db: Session, stmt: Select, name: str, export_format: str) -> StreamingResponse:
+    session_factory = sessionmaker(bind=db.get_bind(), autoflush=False, autocommit=False)
+    return StreamingResponse(
+        stream_export(session_factory, stmt, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format}"'},
+    )
+
+
+@router.get("/hours", response_class=StreamingResponse)
+def export_hours(
+    from_date: date | None = Query(default=None, alias="from"),
+    to_date: date | None = Query(default=None, alias="to"),
+    export_format: ExportFormat = Query(default="csv", alias="format"),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    return _export_response(db, hours_export_query(from_date, to_date), "hours", export_format)
+
+
+@router.get("/attendance", response_class=StreamingResponse)
+def export_attendance(
+    from_date: date | None = Query(default=None, alias="from"),
+    to_date: date | None = Query(default=None, alias="to"),
+    volunteer_id: int | None = None,
+    export_format: ExportFormat = Query(default="csv", alias="format"),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    return _export_response(db, attendance_export_query(from_date, to_date, volunteer_id), "attendance", export_format)
@@ -1,26 +1,106 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_user
+from app.core.deps import conditional_get, get_current_user
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page
+from app.core.responses import FIELDS_DESCRIPTION, SPARSE_RESPONSE_DESCRIPTION, FastJSONResponse, fast_response, parse_fields
 from app.db.session import get_db
+from app.models.attendance import Attendance
+from app.models.rollup import CategoryMonthlyHours, VolunteerDailyHours
 from app.models.volunteer import Volunteer
-from app.schemas.volunteer import VolunteerCreate, VolunteerRead, VolunteerUpdate
+from app.schemas.batch import BatchDeleteRequest, BatchResponse
+from app.schemas.volunteer import VolunteerBatchCreate, VolunteerBatchUpdate, VolunteerCreate, VolunteerRead, VolunteerUpdate
+from app.services.bulk_service import batch_results, bulk_create, bulk_update, existing_ids
+from app.services.data_version import data_versions
+from app.services.import_ledger import forget_imports
+from app.core.text_normalization import search_key
+from app.services.volunteer_search import search_volunteers
 
 router = APIRouter(prefix="/volunteers", tags=["volunteers"], dependencies=[Depends(get_current_user)])
 
+VolunteerSort = Literal["id", "full_name"]
+VOLUNTEER_SORTS = {"id": (Volunteer.id,), "full_name": (Volunteer.full_name, Volunteer.id)}
+
 
 @router.post("", response_model=VolunteerRead, status_code=status.HTTP_201_CREATED)
 def create_volunteer(payload: VolunteerCreate, db: Session = Depends(get_db)) -> Volunteer:
     volunteer = Volunteer(**payload.model_dump())
     db.add(volunteer)
+    data_versions.bump(db, "volunteers")
     db.commit()
     db.refresh(volunteer)
     return volunteer
 
 
-@router.get("", response_model=list[VolunteerRead])
-def list_volunteers(db: Session = Depends(get_db)) -> list[Volunteer]:
-    return db.query(Volunteer).order_by(Volunteer.id).all()
+@router.post(":batch", response_model=BatchResponse, status_code=status.HTTP_201_CREATED)
+def create_volunteers_batch(payload: VolunteerBatchCreate, db: Session = Depends(get_db)) -> BatchResponse:
+    rows = [{**item.model_dump(), "search_name": search_key(item.full_name)} for item in payload.items]
+    result = bulk_create(db, Volunteer, rows)
+    data_versions.bump(db, "volunteers")
+    db.commit()
+    return result
+
+
+@router.patch(":batch", response_model=BatchResponse)
+def update_volunteers_batch(payload: VolunteerBatchUpdate, db: Session = Depends(get_db)) -> BatchResponse:
+    rows = [item.model_dump(exclude_unset=True) for item in payload.items]
+    for row in rows:
+        if row.get("full_name") is not None:
+            row["search_name"] = search_key(row["full_name"])
+    result = bulk_update(db, Volunteer, rows, existing_ids(db, Volunteer, (row["id"] for row in rows)))
+    data_versions.bump(db, "volunteers")
+    db.commit()
+    return result
+
+
+@router.delete(":batch", response_model=BatchResponse)
+def delete_volunteers_batch(payload: BatchDeleteRequest, db: Session = Depends(get_db)) -> BatchResponse:
+    found = existing_ids(db, Volunteer, payload.ids)
+    if found:
+        db.execute(delete(VolunteerDailyHours).where(VolunteerDailyHours.volunteer_id.in_(found)))
+        db.execute(delete(CategoryMonthlyHours).where(CategoryMonthlyHours.volunteer_id.in_(found)))
+        db.execute(delete(Attendance).where(Attendance.volunteer_id.in_(found)))
+        db.execute(delete(Volunteer).where(Volunteer.id.in_(found)))
+        forget_imports(db, "volunteers", "attendance")
+        data_versions.bump(db, "volunteers", "attendances")
+        db.commit()
+    return batch_results(payload.ids, found, "deleted")
+
+
+@router.get(
+    "",
+    response_model=list[VolunteerRead],
+    response_description=SPARSE_RESPONSE_DESCRIPTION,
+    dependencies=[Depends(conditional_get("volunteers"))],
+)
+def list_volunteers(
+    response: Response,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    sort: VolunteerSort = "id",
+    include_total: bool = False,
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_db),
+) -> FastJSONResponse:
+    selected = parse_fields(fields, VolunteerRead)
+    sort_columns = VOLUNTEER_SORTS[sort]
+    columns = [getattr(Volunteer, name) for name in selected] + [column for column in sort_columns if column.key not in selected]
+    rows = keyset_page(db.query(*columns), response, sort_columns, sort, limit, cursor, include_total)
+    return fast_response(rows, selected, response)
+
+
+@router.get("/search", response_model=list[VolunteerRead], response_description=SPARSE_RESPONSE_DESCRIPTION)
+def search_volunteer_names(
+    response: Response,
+    q: str = Query(min_length=1, max_length=255),
+    limit: int = Query(default=20, ge=1, le=100),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_db),
+) -> FastJSONResponse:
+    return fast_response(search_volunteers(db, q, limit), parse_fields(fields, VolunteerRead), response)
 
 
 @router.get("/{volunteer_id}", response_model=VolunteerRead)
@@ -39,6 +119,7 @@ def update_volunteer(volunteer_id: int, payload: VolunteerUpdate, db: Session =
 
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(volunteer, key, value)
+    data_versions.bump(db, "volunteers")
     db.commit()
     db.refresh(volunteer)
     return volunteer
@@ -49,6 +130,10 @@ def delete_volunteer(volunteer_id: int, db: Session = Depends(get_db)) -> None:
     volunteer = db.query(Volunteer).filter(Volunteer.id == volunteer_id).first()
     if not volunteer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Volunteer not found")
+    db.execute(delete(VolunteerDailyHours).where(VolunteerDailyHours.volunteer_id == volunteer_id))
+    db.execute(delete(CategoryMonthlyHours).where(CategoryMonthlyHours.volunteer_id == volunteer_id))
     db.delete(volunteer)
+    forget_imports(db, "volunteers", "attendance")
+    data_versions.bump(db, "volunteers", "attendances")
     db.commit()
     return None
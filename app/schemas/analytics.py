@@ -1,3 +1,5 @@
+from datetime import date
+
 from pydantic import BaseModel
 
 
@@ -15,6 +17,15 @@ class AwardItem(BaseModel):
     total_hours: float
 
 
+class CategoryHoursItem(BaseModel):
+    category: str | None = None
+    month: date | None = None
+    volunteer_id: int | None = None
+    total_minutes: int
+    total_hours: float
+    record_count: int
+
+
 class ShiftCoverageItem(BaseModel):
     shift_id: int
     shift_title: str
@@ -36,3 +47,18 @@ class ReliabilityResponse(BaseModel):
     absent_count: int
     late_count: int
     total_records: int
+
+
+class ReliabilityItem(ReliabilityResponse):
+    full_name: str
+
+
+class AnalyticsCacheStats(BaseModel):
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    invalidations: int
+    expirations: int
+    evictions: int
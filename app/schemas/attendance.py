@@ -1,8 +1,10 @@
 from datetime import date, datetime
+from typing import Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.models.attendance import AttendanceStatus
+from app.schemas.batch import MAX_BATCH_SIZE
 
 
 class CheckInRequest(BaseModel):
@@ -24,10 +26,69 @@ class AttendanceRead(BaseModel):
     checked_out_at: datetime | None
     minutes_worked: int
     status: AttendanceStatus
+    auto_closed: bool
 
     model_config = {"from_attributes": True}
 
 
+class AttendanceReceipt(BaseModel):
+    seq: int
+    shift_id: int
+    volunteer_id: int
+    checked_in_at: datetime | None
+    checked_out_at: datetime | None
+    minutes_worked: int
+    status: AttendanceStatus
+
+    model_config = {"from_attributes": True}
+
+
+class CheckInBatchRequest(BaseModel):
+    items: list[CheckInRequest] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class CheckOutBatchRequest(BaseModel):
+    items: list[CheckOutRequest] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class AttendanceBatchResult(BaseModel):
+    index: int
+    volunteer_id: int
+    status: Literal["checked_in", "checked_out", "rejected"]
+    detail: str | None = None
+    attendance: AttendanceRead | None = None
+
+
+class AttendanceBatchResponse(BaseModel):
+    results: list[AttendanceBatchResult]
+
+
+class AttendanceSyncEvent(BaseModel):
+    idempotency_key: str = Field(min_length=1, max_length=128)
+    action: Literal["check_in", "check_out"]
+    shift_id: int
+    volunteer_id: int
+    occurred_at: datetime
+    status: AttendanceStatus = AttendanceStatus.present
+
+
+class AttendanceSyncRequest(BaseModel):
+    kiosk_id: str = Field(min_length=1, max_length=100)
+    events: list[AttendanceSyncEvent] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class AttendanceSyncResult(BaseModel):
+    idempotency_key: str
+    status: Literal["applied", "rejected", "duplicate"]
+    detail: str | None = None
+    attendance_id: int | None = None
+
+
+class AttendanceSyncResponse(BaseModel):
+    results: list[AttendanceSyncResult]
+    cursor: str | None
+
+
 class VolunteerHoursBreakdown(BaseModel):
     shift_id: int
     event_title: str
@@ -41,3 +102,64 @@ class VolunteerHoursResponse(BaseModel):
     total_minutes: int
     total_hours: float
     breakdown: list[VolunteerHoursBreakdown]
+
+
+class VolunteerHoursBatchRequest(BaseModel):
+    volunteer_ids: list[int] = Field(min_length=1, max_length=1000)
+    from_date: date | None = None
+    to_date: date | None = None
+    include_breakdown: bool = False
+
+
+class VolunteerEventHours(BaseModel):
+    event_id: int
+    event_title: str
+    minutes_worked: int
+
+
+class VolunteerHoursTotal(BaseModel):
+    volunteer_id: int
+    total_minutes: int
+    total_hours: float
+    events: list[VolunteerEventHours] | None = None
+
+
+class VolunteerHoursBatchResponse(BaseModel):
+    from_date: date | None
+    to_date: date | None
+    volunteers: list[VolunteerHoursTotal]
+    missing_volunteer_ids: list[int]
+
+
+class AttendanceSweepRun(BaseModel):
+    cutoff: datetime
+    started_at: datetime
+    finished_at: datetime | None
+    closed: int
+    batches: int
+    error: str | None
+
+    model_config = {"from_attributes": True}
+
+
+class AttendanceSweeperStatus(BaseModel):
+    interval_seconds: float
+    grace_minutes: int
+    batch_size: int
+    runs: int
+    closed_total: int
+    last_run: AttendanceSweepRun | None
+
+
+class AttendanceJournalStatus(BaseModel):
+    write_mode: str
+    started: bool
+    batch_size: int
+    flush_interval_seconds: float
+    queued: int
+    flushes: int
+    applied_total: int
+    last_flush_at: datetime | None
+    retries: int
+    last_error: str | None
+    quarantined: list[str]
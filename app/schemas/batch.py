@@ -0,0 +1,21 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+MAX_BATCH_SIZE = 1000
+
+BatchStatus = Literal["created", "updated", "deleted", "not_found"]
+
+
+class BatchDeleteRequest(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    id: int
+    status: BatchStatus
+
+
+class BatchResponse(BaseModel):
+    results: list[BatchItemResult]
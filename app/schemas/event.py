@@ -1,6 +1,8 @@
 from datetime import date
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.schemas.batch import MAX_BATCH_SIZE
 
 
 class EventBase(BaseModel):
@@ -27,3 +29,15 @@ class EventRead(EventBase):
     id: int
 
     model_config = {"from_attributes": True}
+
+
+class EventBatchCreate(BaseModel):
+    items: list[EventCreate] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class EventBatchUpdateItem(EventUpdate):
+    id: int
+
+
+class EventBatchUpdate(BaseModel):
+    items: list[EventBatchUpdateItem] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
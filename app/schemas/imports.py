@@ -1,13 +1,24 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
+from app.services.import_jobs import ImportJobStatus
+
 
 class ImportSummary(BaseModel):
     imported: int
     skipped: int
     failed: int
+    cached: int = 0
 
 
-class AdminImportResponse(BaseModel):
+class ImportJobRead(BaseModel):
+    job_id: str
+    status: ImportJobStatus
+    rows_processed: int
     volunteers: ImportSummary
     events: ImportSummary
     attendance: ImportSummary
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
@@ -1,6 +1,8 @@
 from datetime import datetime
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+
+from app.schemas.batch import MAX_BATCH_SIZE
 
 
 class VolunteerBase(BaseModel):
@@ -28,3 +30,15 @@ class VolunteerRead(VolunteerBase):
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class VolunteerBatchCreate(BaseModel):
+    items: list[VolunteerCreate] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class VolunteerBatchUpdateItem(VolunteerUpdate):
+    id: int
+
+
+class VolunteerBatchUpdate(BaseModel):
+    items: list[VolunteerBatchUpdateItem] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
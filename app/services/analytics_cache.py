@@ -0,0 +1,98 @@
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.services.data_version import data_versions
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+@dataclass
+class _CacheEntry:
+    versions: tuple[int, ...]
+    expires_at: float
+    value: Any
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    expirations: int = 0
+    evictions: int = 0
+
+
+class AnalyticsCache:
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._entries: OrderedDict[tuple, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, db: Session, key: tuple, tables: tuple[str, ...], compute: Callable[[], T]) -> T:
+        versions = data_versions.current(db, *tables)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.versions != versions:
+                    self.stats.invalidations += 1
+                elif entry.expires_at <= now:
+                    self.stats.expirations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return entry.value
+            self.stats.misses += 1
+
+        value = compute()
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return value
+
+        with self._lock:
+            self._entries[key] = _CacheEntry(versions=versions, expires_at=now + self.ttl_seconds, value=value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return value
+
+    def cached(self, name: str, tables: tuple[str, ...]) -> Callable[[Callable[..., T]], Callable[..., T]]:
+        def decorator(func: Callable[..., T]) -> Callable[..., T]:
+            signature = inspect.signature(func)
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> T:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                db = next(value for value in bound.arguments.values() if isinstance(value, Session))
+                params = tuple((key, tuple(value) if isinstance(value, list) else value) for key, value in bound.arguments.items() if value is not db)
+                return self.get_or_compute(db, (name, params), tables, lambda: func(*args, **kwargs))
+
+            return wrapper
+
+        return decorator
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.stats = CacheStats()
+
+
+analytics_cache = AnalyticsCache(max_size=settings.analytics_cache_size, ttl_seconds=settings.analytics_cache_ttl_seconds)
@@ -0,0 +1,329 @@
+import json
+import os
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from typing import IO
+
+from sqlalchemy import select
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.event import Event
+from app.models.shift import Shift
+from app.models.volunteer import Volunteer
+from app.services.attendance_service import AttendanceAction, AttendanceActionKind, apply_attendance_actions, compute_minutes_worked
+from app.services.data_version import data_versions
+
+settings = get_settings()
+
+SEGMENT_GLOB = "segment-*.ndjson"
+QUARANTINE_SUFFIX = ".failed"
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 60.0
+
+
+class AttendanceRejected(Exception):
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class JournalEntry:
+    seq: int
+    action: AttendanceActionKind
+    shift_id: int
+    volunteer_id: int
+    at: datetime
+    status: AttendanceStatus | None = None
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "seq": self.seq,
+                "action": self.action,
+                "shift_id": self.shift_id,
+                "volunteer_id": self.volunteer_id,
+                "at": self.at.isoformat(),
+                "status": self.status.value if self.status else None,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, line: str) -> "JournalEntry":
+        data = json.loads(line)
+        return cls(
+            seq=data["seq"],
+            action=data["action"],
+            shift_id=data["shift_id"],
+            volunteer_id=data["volunteer_id"],
+            at=datetime.fromisoformat(data["at"]),
+            status=AttendanceStatus(data["status"]) if data["status"] else None,
+        )
+
+
+@dataclass
+class PendingAttendance:
+    seq: int
+    shift_id: int
+    volunteer_id: int
+    shift_start: datetime
+    event_title: str
+    checked_in_at: datetime | None
+    checked_out_at: datetime | None
+    minutes_worked: int
+    status: AttendanceStatus
+
+
+def apply_journal_entries(db: Session, entries: list[JournalEntry]) -> int:
+    actions = [
+        AttendanceAction(entry.action, entry.shift_id, entry.volunteer_id, entry.at, entry.status)
+        for entry in sorted(entries, key=lambda item: item.seq)
+    ]
+    applied = sum(row is not None for row in apply_attendance_actions(db, actions))
+    db.commit()
+    return applied
+
+
+def _transition(
+    current: PendingAttendance, seq: int, action: AttendanceActionKind, at: datetime, status: AttendanceStatus | None
+) -> PendingAttendance:
+    if action == "check_in":
+        if current.checked_in_at is not None:
+            raise AttendanceRejected(400, "Volunteer already checked in for this shift")
+        return replace(current, seq=seq, checked_in_at=at, status=status or AttendanceStatus.present)
+    if current.checked_in_at is None:
+        raise AttendanceRejected(400, "Cannot check out without check in")
+    if current.checked_out_at is not None:
+        raise AttendanceRejected(400, "Volunteer already checked out")
+    if at < current.checked_in_at:
+        raise AttendanceRejected(400, "Check-out cannot occur before check-in")
+    return replace(current, seq=seq, checked_out_at=at, minutes_worked=compute_minutes_worked(current.checked_in_at, at))
+
+
+class AttendanceJournal:
+    def __init__(self, directory: Path, batch_size: int, flush_interval_seconds: float) -> None:
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.flushes = 0
+        self.applied_total = 0
+        self.last_flush_at: datetime | None = None
+        self.last_error: str | None = None
+        self.quarantined: list[str] = []
+        self.retries = 0
+        self._session_factory: Callable[[], Session] | None = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._seq = 0
+        self._flushed_seq = 0
+        self._segment_no = 0
+        self._segment: IO[str] | None = None
+        self._active: list[JournalEntry] = []
+        self._sealed: list[tuple[Path, list[JournalEntry]]] = []
+        self._pending: dict[tuple[int, int], PendingAttendance] = {}
+
+    @property
+    def started(self) -> bool:
+        return self._thread is not None
+
+    def start(self, session_factory: Callable[[], Session]) -> int:
+        with self._flush_lock:
+            if self._thread is not None:
+                return 0
+            self._session_factory = session_factory
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.quarantined = sorted(path.name for path in self.directory.glob(f"segment-*{QUARANTINE_SUFFIX}"))
+            for name in self.quarantined:
+                self._segment_no = max(self._segment_no, int(Path(name).stem.split("-")[1]))
+            for path in sorted(self.directory.glob(SEGMENT_GLOB)):
+                self._segment_no = max(self._segment_no, int(path.stem.split("-")[1]))
+                try:
+                    entries = list(self._read_segment(path))
+                except (ValueError, KeyError, TypeError) as exc:
+                    self._quarantine(path, exc)
+                    continue
+                if not entries:
+                    path.unlink()
+                    continue
+                self._seq = max(self._seq, max(entry.seq for entry in entries))
+                self._sealed.append((path, entries))
+            replayed = self._drain()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="attendance-journal", daemon=True)
+            self._thread.start()
+            return replayed
+
+    def record(
+        self,
+        db: Session,
+        action: AttendanceActionKind,
+        shift_id: int,
+        volunteer_id: int,
+        at: datetime,
+        status: AttendanceStatus | None = None,
+    ) -> PendingAttendance:
+        key = (shift_id, volunteer_id)
+        while True:
+            with self._lock:
+                cached, flushed = self._pending.get(key), self._flushed_seq
+            current = cached or self._load(db, action, shift_id, volunteer_id)
+            with self._lock:
+                if self._pending.get(key) is not cached or (cached is None and self._flushed_seq != flushed):
+                    continue
+                entry = JournalEntry(seq=self._seq + 1, action=action, shift_id=shift_id, volunteer_id=volunteer_id, at=at, status=status)
+                updated = _transition(current, entry.seq, action, at, status)
+                segment = self._open_segment()
+                segment.write(entry.to_json() + "\n")
+                segment.flush()
+                os.fsync(segment.fileno())
+                self._seq = entry.seq
+                self._active.append(entry)
+                self._pending[key] = updated
+                if len(self._active) >= self.batch_size:
+                    self._wake.set()
+                break
+        data_versions.touch("attendances")
+        return updated
+
+    def pending_for(self, volunteer_id: int) -> list[PendingAttendance]:
+        with self._lock:
+            return [item for item in self._pending.values() if item.volunteer_id == volunteer_id]
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                if self._segment is not None:
+                    self._segment.close()
+                    self._segment = None
+                    self._sealed.append((self._segment_path(), self._active))
+                    self._active = []
+                had_segments = bool(self._sealed)
+
+            applied = self._drain()
+            if had_segments:
+                self.flushes += 1
+                self.last_flush_at = datetime.utcnow()
+            return applied
+
+    def queued(self) -> int:
+        with self._lock:
+            return len(self._active) + sum(len(entries) for _, entries in self._sealed)
+
+    def shutdown(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self.retries:
+                self._stop.wait(min(RETRY_BASE_SECONDS * 2 ** (self.retries - 1), RETRY_MAX_SECONDS))
+            else:
+                self._wake.wait(self.flush_interval_seconds)
+                self._wake.clear()
+            if not self._stop.is_set():
+                self.flush()
+
+    def _drain(self) -> int:
+        applied = 0
+        for path, entries in list(self._sealed):
+            try:
+                applied += self._apply_segment(path, entries)
+            except Exception as exc:
+                self.retries += 1
+                self.last_error = f"{path.name}: {exc}"
+                break
+            self.retries = 0
+            with self._lock:
+                self._sealed.remove((path, entries))
+                self._flushed_seq = max(self._flushed_seq, max(entry.seq for entry in entries))
+                self._pending = {key: item for key, item in self._pending.items() if item.seq > self._flushed_seq}
+        return applied
+
+    def _apply_segment(self, path: Path, entries: list[JournalEntry]) -> int:
+        db = self._session_factory()
+        try:
+            applied = apply_journal_entries(db, entries)
+        except (IntegrityError, DataError) as exc:
+            db.rollback()
+            self._quarantine(path, exc)
+            return 0
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        path.unlink(missing_ok=True)
+        self.applied_total += applied
+        return applied
+
+    def _quarantine(self, path: Path, exc: Exception) -> None:
+        quarantined = path.with_suffix(QUARANTINE_SUFFIX)
+        if path.exists():
+            path.rename(quarantined)
+        self.quarantined.append(quarantined.name)
+        self.last_error = f"{path.name}: {exc}"
+
+    def _load(self, db: Session, action: AttendanceActionKind, shift_id: int, volunteer_id: int) -> PendingAttendance:
+        shift = db.execute(
+            select(Shift.start_time, Event.title).join(Event, Shift.event_id == Event.id).where(Shift.id == shift_id)
+        ).first()
+        if shift is None:
+            if action == "check_in":
+                raise AttendanceRejected(404, "Shift not found")
+            raise AttendanceRejected(400, "Cannot check out without check in")
+        attendance = db.execute(
+            select(Attendance.checked_in_at, Attendance.checked_out_at, Attendance.minutes_worked, Attendance.status).where(
+                Attendance.shift_id == shift_id, Attendance.volunteer_id == volunteer_id
+            )
+        ).first()
+        if attendance is None and action == "check_in" and db.scalar(select(Volunteer.id).where(Volunteer.id == volunteer_id)) is None:
+            raise AttendanceRejected(404, "Volunteer not found")
+        return PendingAttendance(
+            seq=0,
+            shift_id=shift_id,
+            volunteer_id=volunteer_id,
+            shift_start=shift.start_time,
+            event_title=shift.title,
+            checked_in_at=attendance.checked_in_at if attendance else None,
+            checked_out_at=attendance.checked_out_at if attendance else None,
+            minutes_worked=attendance.minutes_worked if attendance else 0,
+            status=attendance.status if attendance else AttendanceStatus.present,
+        )
+
+    def _segment_path(self) -> Path:
+        return self.directory / f"segment-{self._segment_no:08d}.ndjson"
+
+    def _open_segment(self) -> IO[str]:
+        if self._segment is None:
+            self._segment_no += 1
+            self._segment = self._segment_path().open("a", encoding="utf-8")
+        return self._segment
+
+    def _read_segment(self, path: Path) -> Iterator[JournalEntry]:
+        with path.open(encoding="utf-8") as segment:
+            for line in segment:
+                if not line.endswith("\n"):
+                    return
+                yield JournalEntry.from_json(line)
+
+
+attendance_journal = AttendanceJournal(
+    directory=Path(settings.attendance_journal_dir),
+    batch_size=settings.attendance_journal_batch_size,
+    flush_interval_seconds=settings.attendance_journal_flush_interval_seconds,
+)
@@ -1,6 +1,162 @@
 from datetime import datetime
+from typing import Any, Literal, NamedTuple
+
+from sqlalchemy import Row, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.event import Event
+from app.models.shift import Shift
+from app.models.volunteer import Volunteer
+from app.services.data_version import data_versions
+from app.services.rollup_service import RollupDeltas
+
+ATTENDANCE_TABLE = Attendance.__table__
+
+AttendanceActionKind = Literal["check_in", "check_out"]
+
+
+class AttendanceAction(NamedTuple):
+    action: AttendanceActionKind
+    shift_id: int
+    volunteer_id: int
+    at: datetime
+    status: AttendanceStatus | None = None
 
 
 def compute_minutes_worked(checked_in_at: datetime, checked_out_at: datetime) -> int:
     seconds = (checked_out_at - checked_in_at).total_seconds()
     return max(0, int(seconds // 60))
+
+
+def bump_attendances(db: Session, append_only: bool) -> None:
+    if append_only:
+        data_versions.bump(db, "attendances", "attendance_appends")
+    else:
+        data_versions.bump(db, "attendances")
+
+
+def _for_volunteer(shift_id: int, volunteer_id: int) -> tuple[Any, Any]:
+    return ATTENDANCE_TABLE.c.shift_id == shift_id, ATTENDANCE_TABLE.c.volunteer_id == volunteer_id
+
+
+def check_in_attendance(
+    db: Session,
+    shift_id: int,
+    volunteer_id: int,
+    checked_in_at: datetime,
+    status: AttendanceStatus,
+) -> tuple[Row[Any] | None, tuple[int, AttendanceStatus] | None]:
+    table = ATTENDANCE_TABLE
+    source = select(
+        literal(shift_id, table.c.shift_id.type),
+        Volunteer.id,
+        literal(checked_in_at, table.c.checked_in_at.type),
+        literal(0, table.c.minutes_worked.type),
+        literal(status, table.c.status.type),
+    ).where(Volunteer.id == volunteer_id)
+    insert = sqlite.insert(table) if db.get_bind().dialect.name == "sqlite" else postgresql.insert(table)
+    stmt = (
+        insert.from_select(["shift_id", "volunteer_id", "checked_in_at", "minutes_worked", "status"], source)
+        .on_conflict_do_nothing(index_elements=["shift_id", "volunteer_id"])
+        .returning(*table.c)
+    )
+    row = db.execute(stmt).first()
+    if row is not None:
+        return row, None
+
+    claimed = db.execute(
+        update(table)
+        .where(*_for_volunteer(shift_id, volunteer_id), table.c.checked_in_at.is_(None))
+        .values(checked_in_at=checked_in_at)
+        .returning(table.c.id, table.c.minutes_worked, table.c.status)
+    ).first()
+    if claimed is None:
+        return None, None
+    row = db.execute(update(table).where(table.c.id == claimed.id).values(status=status).returning(*table.c)).one()
+    return row, (claimed.minutes_worked, claimed.status)
+
+
+def check_out_attendance(db: Session, shift_id: int, volunteer_id: int, checked_out_at: datetime) -> tuple[Row[Any], int] | None:
+    table = ATTENDANCE_TABLE
+    claimed = db.execute(
+        update(table)
+        .where(
+            *_for_volunteer(shift_id, volunteer_id),
+            table.c.checked_in_at.is_not(None),
+            table.c.checked_out_at.is_(None),
+            table.c.checked_in_at <= checked_out_at,
+        )
+        .values(checked_out_at=checked_out_at)
+        .returning(table.c.id, table.c.checked_in_at, table.c.minutes_worked)
+    ).first()
+    if claimed is None:
+        return None
+    minutes_worked = compute_minutes_worked(claimed.checked_in_at, checked_out_at)
+    row = db.execute(update(table).where(table.c.id == claimed.id).values(minutes_worked=minutes_worked).returning(*table.c)).one()
+    return row, claimed.minutes_worked
+
+
+def check_in_rejection(db: Session, volunteer_id: int) -> tuple[int, str]:
+    if db.scalar(select(Volunteer.id).where(Volunteer.id == volunteer_id)) is None:
+        return 404, "Volunteer not found"
+    return 400, "Volunteer already checked in for this shift"
+
+
+def check_out_rejection(db: Session, shift_id: int, volunteer_id: int) -> str:
+    attendance = db.execute(
+        select(Attendance.checked_in_at, Attendance.checked_out_at).where(Attendance.shift_id == shift_id, Attendance.volunteer_id == volunteer_id)
+    ).first()
+    if not attendance or not attendance.checked_in_at:
+        return "Cannot check out without check in"
+    if attendance.checked_out_at is not None:
+        return "Volunteer already checked out"
+    return "Check-out cannot occur before check-in"
+
+
+def attendance_rejection(db: Session, action: AttendanceAction) -> tuple[int, str]:
+    if db.scalar(select(Shift.id).where(Shift.id == action.shift_id)) is None:
+        return 404, "Shift not found"
+    if action.action == "check_in":
+        return check_in_rejection(db, action.volunteer_id)
+    if db.scalar(select(Volunteer.id).where(Volunteer.id == action.volunteer_id)) is None:
+        return 404, "Volunteer not found"
+    return 400, check_out_rejection(db, action.shift_id, action.volunteer_id)
+
+
+def apply_attendance_actions(db: Session, actions: list[AttendanceAction]) -> list[Row[Any] | None]:
+    shifts = {
+        shift_id: (start_time.date(), category)
+        for shift_id, start_time, category in db.execute(
+            select(Shift.id, Shift.start_time, Event.event_category)
+            .join(Event, Shift.event_id == Event.id)
+            .where(Shift.id.in_({action.shift_id for action in actions}))
+        )
+    }
+
+    rows: list[Row[Any] | None] = []
+    deltas = RollupDeltas()
+    in_place = False
+    for action in actions:
+        row, previous = None, None
+        if action.shift_id not in shifts:
+            pass
+        elif action.action == "check_in":
+            row, previous = check_in_attendance(db, action.shift_id, action.volunteer_id, action.at, action.status or AttendanceStatus.present)
+            in_place |= previous is not None
+        else:
+            checked_out = check_out_attendance(db, action.shift_id, action.volunteer_id, action.at)
+            if checked_out is not None:
+                row, previous = checked_out[0], (checked_out[1], checked_out[0].status)
+        rows.append(row)
+        if row is None:
+            continue
+        day, category = shifts[action.shift_id]
+        if previous is not None:
+            deltas.add(row.volunteer_id, day, category, previous[0], previous[1], sign=-1)
+        deltas.add(row.volunteer_id, day, category, row.minutes_worked, row.status)
+    deltas.apply(db)
+    if any(row is not None for row in rows):
+        bump_attendances(db, append_only=not in_place)
+    return rows
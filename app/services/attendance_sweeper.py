@@ -0,0 +1,128 @@
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.attendance import Attendance
+from app.models.event import Event
+from app.models.shift import Shift
+from app.services.attendance_service import bump_attendances, compute_minutes_worked
+from app.services.rollup_service import RollupDeltas
+
+settings = get_settings()
+
+
+@dataclass
+class SweepRun:
+    cutoff: datetime
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: datetime | None = None
+    closed: int = 0
+    batches: int = 0
+    error: str | None = None
+
+
+def close_stale_attendances(db: Session, cutoff: datetime, batch_size: int, run: SweepRun) -> SweepRun:
+    table = Attendance.__table__
+    while True:
+        rows = db.execute(
+            select(
+                Attendance.id,
+                Attendance.volunteer_id,
+                Attendance.checked_in_at,
+                Attendance.minutes_worked,
+                Attendance.status,
+                Shift.start_time,
+                Shift.end_time,
+                Event.event_category,
+            )
+            .join(Shift, Attendance.shift_id == Shift.id)
+            .join(Event, Shift.event_id == Event.id)
+            .where(Attendance.checked_in_at.is_not(None), Attendance.checked_out_at.is_(None), Shift.end_time <= cutoff)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        deltas = RollupDeltas()
+        for row in rows:
+            closed_at = max(row.end_time, row.checked_in_at)
+            minutes_worked = compute_minutes_worked(row.checked_in_at, closed_at)
+            result = db.execute(
+                update(table)
+                .where(table.c.id == row.id, table.c.checked_out_at.is_(None))
+                .values(checked_out_at=closed_at, minutes_worked=minutes_worked, auto_closed=True)
+            )
+            if not result.rowcount:
+                continue
+            day = row.start_time.date()
+            deltas.add(row.volunteer_id, day, row.event_category, row.minutes_worked, row.status, sign=-1)
+            deltas.add(row.volunteer_id, day, row.event_category, minutes_worked, row.status)
+            run.closed += 1
+        deltas.apply(db)
+        bump_attendances(db, append_only=True)
+        db.commit()
+        run.batches += 1
+        if len(rows) < batch_size:
+            break
+    return run
+
+
+class AttendanceSweeper:
+    def __init__(self, interval_seconds: float, grace_minutes: int, batch_size: int) -> None:
+        self.interval_seconds = interval_seconds
+        self.grace_minutes = grace_minutes
+        self.batch_size = batch_size
+        self.runs = 0
+        self.closed_total = 0
+        self.last_run: SweepRun | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        if self.interval_seconds <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(session_factory,), name="attendance-sweeper", daemon=True)
+        self._thread.start()
+
+    def run_once(self, db: Session, now: datetime | None = None) -> SweepRun:
+        run = SweepRun(cutoff=(now or datetime.utcnow()) - timedelta(minutes=self.grace_minutes))
+        with self._lock:
+            try:
+                close_stale_attendances(db, run.cutoff, self.batch_size, run)
+            except Exception as exc:
+                db.rollback()
+                run.error = str(exc)
+            run.finished_at = datetime.utcnow()
+            self.runs += 1
+            self.closed_total += run.closed
+            self.last_run = run
+        return run
+
+    def shutdown(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, session_factory: Callable[[], Session]) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            db = session_factory()
+            try:
+                self.run_once(db)
+            finally:
+                db.close()
+
+
+attendance_sweeper = AttendanceSweeper(
+    interval_seconds=settings.attendance_sweep_interval_seconds,
+    grace_minutes=settings.attendance_sweep_grace_minutes,
+    batch_size=settings.attendance_sweep_batch_size,
+)
@@ -0,0 +1,82 @@
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.pagination import encode_cursor
+from app.models.attendance_sync import AttendanceSyncKey
+from app.schemas.attendance import AttendanceSyncEvent, AttendanceSyncResponse, AttendanceSyncResult
+from app.services.attendance_service import AttendanceAction, apply_attendance_actions, attendance_rejection
+
+
+def sync_cursor(db: Session, kiosk_id: str) -> str | None:
+    latest = db.execute(
+        select(AttendanceSyncKey.occurred_at, AttendanceSyncKey.idempotency_key)
+        .where(AttendanceSyncKey.kiosk_id == kiosk_id)
+        .order_by(AttendanceSyncKey.occurred_at.desc(), AttendanceSyncKey.idempotency_key.desc())
+        .limit(1)
+    ).first()
+    return encode_cursor("sync", [latest.occurred_at, latest.idempotency_key]) if latest else None
+
+
+def sync_attendance(db: Session, kiosk_id: str, events: list[AttendanceSyncEvent]) -> AttendanceSyncResponse:
+    keys = list(dict.fromkeys(event.idempotency_key for event in events))
+    seen = {
+        row.idempotency_key: row
+        for row in db.execute(
+            select(AttendanceSyncKey.idempotency_key, AttendanceSyncKey.detail, AttendanceSyncKey.attendance_id).where(
+                AttendanceSyncKey.kiosk_id == kiosk_id, AttendanceSyncKey.idempotency_key.in_(keys)
+            )
+        )
+    }
+    unseen: dict[str, AttendanceSyncEvent] = {}
+    for event in events:
+        if event.idempotency_key not in seen:
+            unseen.setdefault(event.idempotency_key, event)
+    fresh = sorted(unseen.values(), key=lambda event: event.occurred_at)
+
+    outcomes: dict[str, AttendanceSyncResult] = {}
+    if fresh:
+        terminal: list[AttendanceSyncEvent] = []
+        actions = [AttendanceAction(event.action, event.shift_id, event.volunteer_id, event.occurred_at, event.status) for event in fresh]
+        for event, action, row in zip(fresh, actions, apply_attendance_actions(db, actions)):
+            key = event.idempotency_key
+            if row is None:
+                status_code, detail = attendance_rejection(db, action)
+                outcomes[key] = AttendanceSyncResult(idempotency_key=key, status="rejected", detail=detail)
+                if status_code == 404:
+                    terminal.append(event)
+            else:
+                outcomes[key] = AttendanceSyncResult(idempotency_key=key, status="applied", attendance_id=row.id)
+                terminal.append(event)
+
+        if terminal:
+            table = AttendanceSyncKey.__table__
+            insert = sqlite.insert(table) if db.get_bind().dialect.name == "sqlite" else postgresql.insert(table)
+            db.execute(
+                insert.on_conflict_do_nothing(index_elements=["kiosk_id", "idempotency_key"]),
+                [
+                    {
+                        "idempotency_key": event.idempotency_key,
+                        "kiosk_id": kiosk_id,
+                        "action": event.action,
+                        "shift_id": event.shift_id,
+                        "volunteer_id": event.volunteer_id,
+                        "occurred_at": event.occurred_at,
+                        "outcome": outcomes[event.idempotency_key].status,
+                        "detail": outcomes[event.idempotency_key].detail,
+                        "attendance_id": outcomes[event.idempotency_key].attendance_id,
+                    }
+                    for event in terminal
+                ],
+            )
+        db.commit()
+
+    results = []
+    for event in events:
+        key = event.idempotency_key
+        result = outcomes.pop(key, None)
+        if result is None:
+            previous = seen.get(key) or next(item for item in results if item.idempotency_key == key)
+            result = AttendanceSyncResult(idempotency_key=key, status="duplicate", detail=previous.detail, attendance_id=previous.attendance_id)
+        results.append(result)
+    return AttendanceSyncResponse(results=results, cursor=sync_cursor(db, kiosk_id))
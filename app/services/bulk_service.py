@@ -0,0 +1,29 @@
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.schemas.batch import BatchItemResult, BatchResponse, BatchStatus
+
+
+def existing_ids(db: Session, model: type, ids: Iterable[int]) -> set[int]:
+    return set(db.scalars(select(model.id).where(model.id.in_(set(ids)))))
+
+
+def bulk_create(db: Session, model: type, rows: list[dict[str, Any]]) -> BatchResponse:
+    ids = db.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), rows).all()
+    return BatchResponse(results=[BatchItemResult(index=index, id=row_id, status="created") for index, row_id in enumerate(ids)])
+
+
+def bulk_update(db: Session, model: type, rows: list[dict[str, Any]], found: set[int]) -> BatchResponse:
+    changes = [row for row in rows if row["id"] in found and len(row) > 1]
+    if changes:
+        db.execute(update(model), changes)
+    return batch_results([row["id"] for row in rows], found, "updated")
+
+
+def batch_results(ids: list[int], found: set[int], status: BatchStatus) -> BatchResponse:
+    return BatchResponse(
+        results=[BatchItemResult(index=index, id=row_id, status=status if row_id in found else "not_found") for index, row_id in enumerate(ids)]
+    )
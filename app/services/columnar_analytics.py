@@ -0,0 +1,207 @@
+import calendar
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.utils import batched
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.event import Event
+from app.models.shift import Shift
+from app.services.data_version import data_versions
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+settings = get_settings()
+
+STRUCTURE_TABLES = ("volunteers", "events", "shifts")
+VERSION_TABLES = (*STRUCTURE_TABLES, "attendances", "attendance_appends")
+STATUS_CODES = {status: code for code, status in enumerate(AttendanceStatus)}
+COLUMN_TYPES = {
+    "attendance_id": "int64",
+    "volunteer_id": "int64",
+    "shift_id": "int64",
+    "event_id": "int64",
+    "category_code": "int32",
+    "start_epoch": "int64",
+    "minutes": "int64",
+    "status_code": "int8",
+}
+OPEN_ROWS_CHUNK = 1000
+
+
+def _epoch(value: date) -> int:
+    return calendar.timegm(datetime.combine(value, time.min).timetuple())
+
+
+@dataclass
+class ColumnarSnapshot:
+    versions: tuple[int, ...]
+    columns: dict[str, Any]
+    categories: dict[str, int] = field(default_factory=dict)
+    open_ids: set[int] = field(default_factory=set)
+
+    @property
+    def last_id(self) -> int:
+        ids = self.columns["attendance_id"]
+        return int(ids[-1]) if len(ids) else 0
+
+    def mask(
+        self,
+        from_date: date | None = None,
+        to_date: date | None = None,
+        volunteer_id: int | None = None,
+        category: str | None = None,
+    ) -> Any:
+        columns = self.columns
+        mask = np.ones(len(columns["attendance_id"]), dtype=bool)
+        if from_date:
+            mask &= columns["start_epoch"] >= _epoch(from_date)
+        if to_date:
+            mask &= columns["start_epoch"] < _epoch(to_date + timedelta(days=1))
+        if volunteer_id is not None:
+            mask &= columns["volunteer_id"] == volunteer_id
+        if category is not None:
+            mask &= columns["category_code"] == self.categories.get(category, -1)
+        return mask
+
+    def ranked_minutes(
+        self,
+        from_date: date | None = None,
+        to_date: date | None = None,
+        limit: int | None = None,
+        minimum: int | None = None,
+    ) -> list[tuple[int, int]]:
+        mask = self.mask(from_date, to_date)
+        volunteers = self.columns["volunteer_id"][mask]
+        if not len(volunteers) or (limit is not None and limit <= 0):
+            return []
+
+        size = int(volunteers.max()) + 1
+        records = np.bincount(volunteers, minlength=size)
+        totals = np.bincount(volunteers, weights=self.columns["minutes"][mask], minlength=size).astype(np.int64)
+        selected = records > 0
+        if minimum is not None:
+            selected &= totals >= minimum
+        ids = np.flatnonzero(selected)
+        keys = totals[ids] * size + (size - 1 - ids)
+        if limit is not None and limit < len(ids):
+            top = np.argpartition(-keys, limit - 1)[:limit]
+            ids, keys = ids[top], keys[top]
+        ids = ids[np.argsort(-keys)]
+        return list(zip(ids.tolist(), totals[ids].tolist()))
+
+    def status_counts(self, volunteer_id: int, from_date: date | None = None, to_date: date | None = None) -> dict[AttendanceStatus, int]:
+        codes = self.columns["status_code"][self.mask(from_date, to_date, volunteer_id)]
+        counts = np.bincount(codes, minlength=len(STATUS_CODES))
+        return {status: int(counts[code]) for status, code in STATUS_CODES.items()}
+
+    def volunteer_rows(self, volunteer_id: int, from_date: date | None = None, to_date: date | None = None) -> list[tuple[int, int, int]]:
+        mask = self.mask(from_date, to_date, volunteer_id)
+        columns = self.columns
+        return list(zip(columns["shift_id"][mask].tolist(), columns["event_id"][mask].tolist(), columns["minutes"][mask].tolist()))
+
+
+def _attendance_rows(db: Session, *conditions: Any) -> list[Any]:
+    stmt = (
+        select(
+            Attendance.id,
+            Attendance.volunteer_id,
+            Attendance.shift_id,
+            Shift.event_id,
+            Event.event_category,
+            Shift.start_time,
+            Attendance.minutes_worked,
+            Attendance.status,
+            Attendance.checked_in_at,
+            Attendance.checked_out_at,
+        )
+        .join(Shift, Attendance.shift_id == Shift.id)
+        .join(Event, Shift.event_id == Event.id)
+        .where(*conditions)
+        .order_by(Attendance.id)
+    )
+    return db.execute(stmt).all()
+
+
+def _appends_only(seen: tuple[int, ...], versions: tuple[int, ...]) -> bool:
+    (seen_writes, seen_appends), (writes, appends) = seen[-2:], versions[-2:]
+    return seen[:-2] == versions[:-2] and writes - seen_writes == appends - seen_appends
+
+
+def _to_columns(rows: list[Any], categories: dict[str, int], open_ids: set[int]) -> dict[str, Any]:
+    values: dict[str, list[int]] = {name: [] for name in COLUMN_TYPES}
+    for row in rows:
+        values["attendance_id"].append(row.id)
+        values["volunteer_id"].append(row.volunteer_id)
+        values["shift_id"].append(row.shift_id)
+        values["event_id"].append(row.event_id)
+        values["category_code"].append(categories.setdefault(row.event_category, len(categories)))
+        values["start_epoch"].append(calendar.timegm(row.start_time.timetuple()))
+        values["minutes"].append(row.minutes_worked)
+        values["status_code"].append(STATUS_CODES[AttendanceStatus(row.status)])
+        if row.checked_in_at is not None and row.checked_out_at is None:
+            open_ids.add(row.id)
+        else:
+            open_ids.discard(row.id)
+    return {name: np.array(values[name], dtype=dtype) for name, dtype in COLUMN_TYPES.items()}
+
+
+class AttendanceColumns:
+    def __init__(self) -> None:
+        self._snapshot: ColumnarSnapshot | None = None
+        self._lock = threading.Lock()
+
+    def snapshot(self, db: Session) -> ColumnarSnapshot:
+        versions = data_versions.current(db, *VERSION_TABLES)
+        with self._lock:
+            current = self._snapshot
+            if current is None or not _appends_only(current.versions, versions):
+                current = self._load(db, versions)
+            elif current.versions != versions:
+                current = self._refresh(db, current, versions)
+            self._snapshot = current
+        return current
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+    def _load(self, db: Session, versions: tuple[int, ...]) -> ColumnarSnapshot:
+        snapshot = ColumnarSnapshot(versions=versions, columns={})
+        snapshot.columns = _to_columns(_attendance_rows(db), snapshot.categories, snapshot.open_ids)
+        return snapshot
+
+    def _refresh(self, db: Session, current: ColumnarSnapshot, versions: tuple[int, ...]) -> ColumnarSnapshot:
+        categories, open_ids = dict(current.categories), set(current.open_ids)
+        rows = _attendance_rows(db, Attendance.id > current.last_id)
+        for chunk in batched(sorted(current.open_ids), OPEN_ROWS_CHUNK):
+            rows.extend(_attendance_rows(db, Attendance.id.in_(chunk)))
+
+        changed = _to_columns(rows, categories, open_ids)
+        positions = np.searchsorted(current.columns["attendance_id"], changed["attendance_id"])
+        existing = positions < len(current.columns["attendance_id"])
+        columns = {}
+        for name, values in current.columns.items():
+            updated = values.copy()
+            updated[positions[existing]] = changed[name][existing]
+            columns[name] = np.concatenate([updated, changed[name][~existing]])
+        if len(columns["attendance_id"]) != db.scalar(select(func.count()).select_from(Attendance)):
+            return self._load(db, versions)
+        return ColumnarSnapshot(versions=versions, columns=columns, categories=categories, open_ids=open_ids)
+
+
+attendance_columns = AttendanceColumns()
+
+
+def columnar_snapshot(db: Session) -> ColumnarSnapshot | None:
+    if settings.analytics_engine != "columnar" or np is None:
+        return None
+    return attendance_columns.snapshot(db)
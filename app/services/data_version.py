@@ -0,0 +1,60 @@
+import hashlib
+import threading
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.data_version import DataVersion
+
+
+PENDING_KEY = "data_versions.pending"
+
+
+class DataVersions:
+    def __init__(self) -> None:
+        self._pending: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, db: Session, *tables: str) -> None:
+        db.info.setdefault(PENDING_KEY, set()).update(tables)
+
+    def publish(self, db: Session) -> None:
+        tables = sorted(db.info.pop(PENDING_KEY, ()))
+        if not tables:
+            return
+        table = DataVersion.__table__
+        bind = db.get_bind()
+        insert = sqlite.insert(table) if bind.dialect.name == "sqlite" else postgresql.insert(table)
+        try:
+            with bind.begin() as connection:
+                connection.execute(
+                    insert.values([{"table_name": name, "version": 1} for name in tables]).on_conflict_do_update(
+                        index_elements=["table_name"], set_={"version": table.c.version + 1}
+                    )
+                )
+        except SQLAlchemyError:
+            self.touch(*tables)
+
+    def discard(self, db: Session) -> None:
+        db.info.pop(PENDING_KEY, None)
+
+    def touch(self, *tables: str) -> None:
+        with self._lock:
+            for table in tables:
+                self._pending[table] = self._pending.get(table, 0) + 1
+
+    def current(self, db: Session, *tables: str) -> tuple[int, ...]:
+        versions = dict(db.execute(select(DataVersion.table_name, DataVersion.version).where(DataVersion.table_name.in_(tables))).all())
+        return tuple(versions.get(table, 0) for table in tables)
+
+    def etag(self, db: Session, scope: str, *tables: str) -> str:
+        pending = tuple(self._pending.get(table, 0) for table in tables)
+        marker = f"{scope}|{self.current(db, *tables)}|{pending}"
+        return f'"{hashlib.blake2b(marker.encode("utf-8"), digest_size=16).hexdigest()}"'
+
+
+data_versions = DataVersions()
+event.listen(Session, "after_commit", data_versions.publish)
+event.listen(Session, "after_rollback", data_versions.discard)
@@ -0,0 +1,101 @@
+import csv
+import enum
+import io
+import json
+from collections.abc import Callable, Iterator, Sequence
+from datetime import date, datetime, time
+from typing import Any
+
+from sqlalchemy import Select, and_, func, select
+from sqlalchemy.orm import Session
+
+from app.models.attendance import Attendance
+from app.models.event import Event
+from app.models.rollup import VolunteerDailyHours
+from app.models.shift import Shift
+from app.models.volunteer import Volunteer
+
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def hours_export_query(from_date: date | None = None, to_date: date | None = None) -> Select:
+    in_range = VolunteerDailyHours.volunteer_id == Volunteer.id
+    if from_date:
+        in_range = and_(in_range, VolunteerDailyHours.day >= from_date)
+    if to_date:
+        in_range = and_(in_range, VolunteerDailyHours.day <= to_date)
+
+    total_minutes = func.coalesce(func.sum(VolunteerDailyHours.minutes), 0)
+    return (
+        select(
+            Volunteer.id.label("volunteer_id"),
+            Volunteer.full_name,
+            total_minutes.label("total_minutes"),
+            func.round(total_minutes / 60.0, 2).label("total_hours"),
+        )
+        .outerjoin(VolunteerDailyHours, in_range)
+        .group_by(Volunteer.id, Volunteer.full_name)
+        .order_by(Volunteer.id)
+    )
+
+
+def attendance_export_query(from_date: date | None = None, to_date: date | None = None, volunteer_id: int | None = None) -> Select:
+    stmt = (
+        select(
+            Attendance.id.label("attendance_id"),
+            Attendance.volunteer_id,
+            Volunteer.full_name,
+            Attendance.shift_id,
+            Shift.event_id,
+            Event.title.label("event_title"),
+            Shift.start_time.label("shift_start"),
+            Attendance.checked_in_at,
+            Attendance.checked_out_at,
+            Attendance.minutes_worked,
+            Attendance.status,
+            Attendance.auto_closed,
+        )
+        .join(Volunteer, Attendance.volunteer_id == Volunteer.id)
+        .join(Shift, Attendance.shift_id == Shift.id)
+        .join(Event, Shift.event_id == Event.id)
+        .order_by(Attendance.id)
+    )
+    if from_date:
+        stmt = stmt.where(Shift.start_time >= datetime.combine(from_date, time.min))
+    if to_date:
+        stmt = stmt.where(Shift.start_time <= datetime.combine(to_date, time.max))
+    if volunteer_id is not None:
+        stmt = stmt.where(Attendance.volunteer_id == volunteer_id)
+    return stmt
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _render_csv(rows: Sequence[Sequence[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([[_export_value(value) for value in row] for row in rows])
+    return buffer.getvalue()
+
+
+def _render_ndjson(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> str:
+    return "".join(json.dumps(dict(zip(columns, map(_export_value, row))), ensure_ascii=False) + "\n" for row in rows)
+
+
+def stream_export(session_factory: Callable[[], Session], stmt: Select, export_format: str) -> Iterator[str]:
+    db = session_factory()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        columns = list(result.keys())
+        if export_format == "csv":
+            yield _render_csv([columns])
+        for rows in result.partitions():
+            yield _render_csv(rows) if export_format == "csv" else _render_ndjson(columns, rows)
+    finally:
+        db.close()
@@ -0,0 +1,174 @@
+import enum
+import shutil
+import tempfile
+import threading
+import uuid
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.services.import_ledger import file_fingerprint
+from app.services.import_service import Summary, import_entity_rows, iter_csv
+
+settings = get_settings()
+
+IMPORT_ENTITIES = ("volunteers", "events", "attendance")
+FINISHED_JOBS_RETAINED = 100
+
+
+class ImportJobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+    cancelled = "cancelled"
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+@dataclass
+class ImportSource:
+    path: Path | None
+    fallback: Path | None = None
+    temporary: bool = False
+
+    def resolve(self) -> Path | None:
+        if self.path is not None:
+            with closing(iter_csv(self.path)) as rows:
+                if next(rows, None) is not None:
+                    return self.path
+        if self.fallback is not None and self.fallback.exists():
+            return self.fallback
+        return None
+
+    def discard(self) -> None:
+        if self.temporary and self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+
+@dataclass
+class ImportJob:
+    id: str
+    sources: dict[str, ImportSource]
+    incremental: bool = True
+    status: ImportJobStatus = ImportJobStatus.queued
+    rows_processed: int = 0
+    summaries: dict[str, Summary] = field(default_factory=lambda: {entity: Summary() for entity in IMPORT_ENTITIES})
+    error: str | None = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: datetime | None = None
+    cancel_requested: threading.Event = field(default_factory=threading.Event)
+    future: Future | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (ImportJobStatus.completed, ImportJobStatus.failed, ImportJobStatus.cancelled)
+
+
+def spool_upload(stream: BinaryIO) -> Path:
+    with tempfile.NamedTemporaryFile(prefix="import-", suffix=".csv", delete=False) as spool:
+        shutil.copyfileobj(stream, spool)
+    return Path(spool.name)
+
+
+class ImportJobManager:
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._jobs: dict[str, ImportJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        sources: dict[str, ImportSource],
+        session_factory: Callable[[], Session],
+        incremental: bool = True,
+    ) -> ImportJob:
+        job = ImportJob(id=uuid.uuid4().hex, sources=sources, incremental=incremental)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="import-job")
+            self._prune()
+            self._jobs[job.id] = job
+            job.future = self._executor.submit(self._run, job, session_factory)
+        return job
+
+    def get(self, job_id: str) -> ImportJob | None:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> ImportJob | None:
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+        job.cancel_requested.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, ImportJobStatus.cancelled)
+        return job
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            for job in self._jobs.values():
+                if not job.finished:
+                    job.cancel_requested.set()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        for job in list(self._jobs.values()):
+            if not job.finished:
+                self._finish(job, ImportJobStatus.cancelled)
+
+    def _prune(self) -> None:
+        finished = [job for job in self._jobs.values() if job.finished]
+        for job in finished[: max(0, len(finished) - FINISHED_JOBS_RETAINED)]:
+            del self._jobs[job.id]
+
+    def _track(self, job: ImportJob, rows: Iterator[dict[str, str]]) -> Iterator[dict[str, str]]:
+        for row in rows:
+            if job.cancel_requested.is_set():
+                raise ImportCancelled
+            job.rows_processed += 1
+            yield row
+
+    def _run(self, job: ImportJob, session_factory: Callable[[], Session]) -> None:
+        if job.cancel_requested.is_set():
+            self._finish(job, ImportJobStatus.cancelled)
+            return
+
+        job.status = ImportJobStatus.running
+        db = session_factory()
+        try:
+            for entity in IMPORT_ENTITIES:
+                source = job.sources.get(entity)
+                path = source.resolve() if source is not None else None
+                if path is None:
+                    continue
+                rows = self._track(job, iter_csv(path))
+                import_entity_rows(db, entity, rows, job.summaries[entity], file_fingerprint(path), job.incremental)
+            self._finish(job, ImportJobStatus.completed)
+        except ImportCancelled:
+            db.rollback()
+            self._finish(job, ImportJobStatus.cancelled)
+        except Exception as exc:
+            db.rollback()
+            job.error = str(exc)
+            self._finish(job, ImportJobStatus.failed)
+        finally:
+            db.close()
+
+    def _finish(self, job: ImportJob, status: ImportJobStatus) -> None:
+        job.status = status
+        job.finished_at = datetime.utcnow()
+        for source in job.sources.values():
+            source.discard()
+
+
+import_jobs = ImportJobManager(max_workers=settings.import_max_concurrent_jobs)
@@ -0,0 +1,62 @@
+import hashlib
+from pathlib import Path
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.import_ledger import ImportedFile, ImportLedgerEntry
+
+FINGERPRINT_READ_SIZE = 1024 * 1024
+
+
+def file_fingerprint(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as file:
+        while chunk := file.read(FINGERPRINT_READ_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def row_fingerprint(row: dict[str, str]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for key in sorted(key for key in row if key is not None):
+        value = row[key]
+        if isinstance(value, str) and value.strip():
+            digest.update(f"{key.strip()}\x1f{value.strip()}\x1e".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def imported_file_rows(db: Session, entity: str, file_hash: str) -> int | None:
+    return db.scalar(select(ImportedFile.row_count).where(ImportedFile.entity == entity, ImportedFile.file_hash == file_hash))
+
+
+def record_imported_file(db: Session, entity: str, file_hash: str, row_count: int) -> None:
+    if imported_file_rows(db, entity, file_hash) is None:
+        db.add(ImportedFile(entity=entity, file_hash=file_hash, row_count=row_count))
+
+
+def forget_imports(db: Session, *entities: str) -> None:
+    db.execute(delete(ImportLedgerEntry).where(ImportLedgerEntry.entity.in_(entities)))
+    db.execute(delete(ImportedFile).where(ImportedFile.entity.in_(entities)))
+
+
+class RowLedger:
+    def __init__(self, db: Session, entity: str, lookup: bool = True) -> None:
+        self.entity = entity
+        self.lookup = lookup
+        self._previous: set[str] = set(db.scalars(select(ImportLedgerEntry.row_hash).where(ImportLedgerEntry.entity == entity)))
+        self._recorded: set[str] = set()
+        self._pending: list[dict[str, str]] = []
+
+    def seen(self, row_hash: str) -> bool:
+        return self.lookup and row_hash in self._previous
+
+    def record(self, row_hash: str) -> None:
+        if row_hash not in self._previous and row_hash not in self._recorded:
+            self._recorded.add(row_hash)
+            self._pending.append({"entity": self.entity, "row_hash": row_hash})
+
+    def flush(self, db: Session) -> None:
+        if self._pending:
+            db.execute(insert(ImportLedgerEntry), self._pending)
+            self._pending.clear()
@@ -1,14 +1,25 @@
 import csv
-from dataclasses import dataclass
-from datetime import date, datetime
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, replace
+from datetime import date, datetime, time
 from pathlib import Path
+from typing import Any
 
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
+from app.core.utils import batched
 from app.models.attendance import Attendance, AttendanceStatus
 from app.models.event import Event
 from app.models.shift import Shift
 from app.models.volunteer import Volunteer
+from app.services.data_version import data_versions
+from app.services.import_ledger import RowLedger, imported_file_rows, record_imported_file, row_fingerprint
+from app.services.rollup_service import RollupDeltas
+from app.core.text_normalization import normalize_key, normalize_name, search_key
+
+BULK_INSERT_CHUNK_SIZE = 1000
+IMPORT_BATCH_SIZE = 5000
 
 
 @dataclass
@@ -16,6 +27,11 @@ class Summary:
     imported: int = 0
     skipped: int = 0
     failed: int = 0
+    cached: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.imported + self.skipped + self.failed + self.cached
 
 
 def _parse_datetime(value: str) -> datetime | None:
@@ -28,141 +44,387 @@ def _parse_datetime(value: str) -> datetime | None:
         return None
 
 
-def import_volunteers_rows(db: Session, rows: list[dict[str, str]]) -> Summary:
-    summary = Summary()
-    for row in rows:
-        full_name = (row.get("full_name") or "").strip()
-        email = (row.get("email") or "").strip() or None
-        if not full_name:
-            summary.failed += 1
-            continue
+class RowError(ValueError):
+    def __init__(self, field: str, message: str) -> None:
+        super().__init__(message)
+        self.field = field
+        self.message = message
 
-        if email:
-            duplicate = db.query(Volunteer).filter(Volunteer.email == email).first()
+
+def parse_volunteer_row(row: dict[str, str]) -> dict[str, Any]:
+    full_name = (row.get("full_name") or "").strip()
+    if not full_name:
+        raise RowError("full_name", "full_name is required")
+    return {
+        "volunteer_no": (row.get("volunteer_no") or "").strip() or None,
+        "full_name": full_name,
+        "email": (row.get("email") or "").strip() or None,
+        "phone": (row.get("phone") or "").strip() or None,
+        "notes": (row.get("notes") or "").strip() or None,
+    }
+
+
+def parse_event_row(row: dict[str, str]) -> dict[str, Any]:
+    title = (row.get("title") or row.get("event_title") or "").strip()
+    event_category = (row.get("event_category") or "").strip()
+    event_date_raw = (row.get("event_date") or "").strip()
+    for field, value in (("title", title), ("event_category", event_category), ("event_date", event_date_raw)):
+        if not value:
+            raise RowError(field, f"{field} is required")
+
+    try:
+        event_date = date.fromisoformat(event_date_raw)
+    except ValueError:
+        raise RowError("event_date", f"invalid date {event_date_raw!r}") from None
+
+    return {
+        "title": title,
+        "event_category": event_category,
+        "event_date": event_date,
+        "location": (row.get("location") or "").strip(),
+        "description": (row.get("description") or "").strip() or None,
+    }
+
+
+def parse_attendance_values(row: dict[str, str]) -> dict[str, Any]:
+    checked_in_at = _parse_datetime(row.get("checked_in_at") or "")
+    checked_out_at = _parse_datetime(row.get("checked_out_at") or "")
+    if row.get("checked_in_at") and checked_in_at is None:
+        raise RowError("checked_in_at", f"invalid datetime {row['checked_in_at']!r}")
+    if row.get("checked_out_at") and checked_out_at is None:
+        raise RowError("checked_out_at", f"invalid datetime {row['checked_out_at']!r}")
+
+    minutes_worked_raw = (row.get("minutes_worked") or "").strip()
+    hours_worked_raw = (row.get("hours_worked") or row.get("hours") or "").strip()
+    try:
+        if minutes_worked_raw:
+            minutes_worked = int(minutes_worked_raw)
+        elif hours_worked_raw:
+            minutes_worked = int(float(hours_worked_raw) * 60)
+        elif checked_in_at and checked_out_at and checked_out_at >= checked_in_at:
+            minutes_worked = int((checked_out_at - checked_in_at).total_seconds() // 60)
         else:
-            duplicate = db.query(Volunteer).filter(Volunteer.full_name == full_name).first()
-        if duplicate:
-            summary.skipped += 1
-            continue
-
-        volunteer = Volunteer(
-            volunteer_no=(row.get("volunteer_no") or "").strip() or None,
-            full_name=full_name,
-            email=email,
-            phone=(row.get("phone") or "").strip() or None,
-            notes=(row.get("notes") or "").strip() or None,
-        )
-        db.add(volunteer)
-        summary.imported += 1
-    db.commit()
+            minutes_worked = 0
+    except ValueError:
+        field = "minutes_worked" if minutes_worked_raw else "hours_worked"
+        raise RowError(field, f"invalid number {minutes_worked_raw or hours_worked_raw!r}") from None
+
+    if checked_in_at and checked_out_at and checked_out_at < checked_in_at:
+        raise RowError("checked_out_at", "checked_out_at is before checked_in_at")
+
+    try:
+        status_enum = AttendanceStatus((row.get("status") or "present").strip().lower())
+    except ValueError:
+        status_enum = AttendanceStatus.present
+
+    return {
+        "checked_in_at": checked_in_at,
+        "checked_out_at": checked_out_at,
+        "minutes_worked": max(0, minutes_worked),
+        "status": status_enum,
+    }
+
+
+def _queue_insert(db: Session, model: type, pending: list[dict[str, Any]], values: dict[str, Any]) -> None:
+    pending.append(values)
+    if len(pending) >= BULK_INSERT_CHUNK_SIZE:
+        _flush_inserts(db, model, pending)
+
+
+def _flush_inserts(db: Session, model: type, pending: list[dict[str, Any]]) -> None:
+    if pending:
+        db.execute(insert(model), pending)
+        pending.clear()
+
+
+def import_volunteers_rows(
+    db: Session,
+    rows: Iterable[dict[str, str]],
+    summary: Summary | None = None,
+    ledger: RowLedger | None = None,
+) -> Summary:
+    summary = summary if summary is not None else Summary()
+    known_emails: set[str] = set()
+    known_names: set[str] = set()
+    for email, full_name in db.execute(select(Volunteer.email, Volunteer.full_name)):
+        if email:
+            known_emails.add(email)
+        known_names.add(full_name)
+
+    new_volunteers: list[dict[str, Any]] = []
+    for batch in batched(rows, IMPORT_BATCH_SIZE):
+        for row in batch:
+            row_hash = row_fingerprint(row) if ledger else ""
+            if ledger and ledger.seen(row_hash):
+                summary.cached += 1
+                continue
+
+            try:
+                values = parse_volunteer_row(row)
+            except RowError:
+                summary.failed += 1
+                continue
+
+            full_name, email = values["full_name"], values["email"]
+            duplicate = email in known_emails if email else full_name in known_names
+            if duplicate:
+                summary.skipped += 1
+                if ledger:
+                    ledger.record(row_hash)
+                continue
+
+            _queue_insert(db, Volunteer, new_volunteers, {**values, "search_name": search_key(full_name)})
+            if email:
+                known_emails.add(email)
+            known_names.add(full_name)
+            summary.imported += 1
+            if ledger:
+                ledger.record(row_hash)
+
+        _flush_inserts(db, Volunteer, new_volunteers)
+        if ledger:
+            ledger.flush(db)
+        data_versions.bump(db, "volunteers")
+        db.commit()
     return summary
 
 
-def import_events_rows(db: Session, rows: list[dict[str, str]]) -> Summary:
-    summary = Summary()
-    for row in rows:
-        title = (row.get("title") or "").strip()
-        event_category = (row.get("event_category") or "").strip()
-        event_date_raw = (row.get("event_date") or "").strip()
-        location = (row.get("location") or "").strip()
+def import_events_rows(
+    db: Session,
+    rows: Iterable[dict[str, str]],
+    summary: Summary | None = None,
+    ledger: RowLedger | None = None,
+) -> Summary:
+    summary = summary if summary is not None else Summary()
+    known_events: set[tuple[str, date]] = set(db.execute(select(Event.title, Event.event_date)).tuples())
 
-        if not all([title, event_category, event_date_raw, location]):
-            summary.failed += 1
-            continue
+    new_events: list[dict[str, Any]] = []
+    for batch in batched(rows, IMPORT_BATCH_SIZE):
+        for row in batch:
+            row_hash = row_fingerprint(row) if ledger else ""
+            if ledger and ledger.seen(row_hash):
+                summary.cached += 1
+                continue
 
+            try:
+                values = parse_event_row(row)
+            except RowError:
+                summary.failed += 1
+                continue
+
+            title, event_date = values["title"], values["event_date"]
+            if (title, event_date) in known_events:
+                summary.skipped += 1
+                if ledger:
+                    ledger.record(row_hash)
+                continue
+
+            _queue_insert(db, Event, new_events, values)
+            known_events.add((title, event_date))
+            summary.imported += 1
+            if ledger:
+                ledger.record(row_hash)
+
+        _flush_inserts(db, Event, new_events)
+        if ledger:
+            ledger.flush(db)
+        data_versions.bump(db, "events")
+        db.commit()
+    return summary
+
+
+def uses_natural_keys(row: dict[str, str]) -> bool:
+    return bool((row.get("full_name") or "").strip()) and not (row.get("shift_id") or "").strip()
+
+
+class _UniqueIndex:
+    def __init__(self) -> None:
+        self._values: dict[Any, int] = {}
+        self._ambiguous: set[Any] = set()
+
+    def add(self, key: Any, value: int) -> None:
+        if self._values.setdefault(key, value) != value:
+            self._ambiguous.add(key)
+
+    def get(self, key: Any) -> int | None:
+        if key in self._ambiguous:
+            return None
+        return self._values.get(key)
+
+
+class AttendanceKeyIndex:
+    def __init__(self, db: Session) -> None:
+        self.shift_days: dict[int, date] = {}
+        self.shift_events: dict[int, int] = {}
+        self.event_shifts: dict[int, int] = {}
+        for shift_id, event_id, start_time in db.execute(select(Shift.id, Shift.event_id, Shift.start_time).order_by(Shift.id)):
+            self.shift_days[shift_id] = start_time.date()
+            self.shift_events[shift_id] = event_id
+            self.event_shifts.setdefault(event_id, shift_id)
+
+        self.volunteer_ids: set[int] = set()
+        self._exact_names = _UniqueIndex()
+        self._names = _UniqueIndex()
+        for volunteer_id, full_name in db.execute(select(Volunteer.id, Volunteer.full_name)):
+            self.volunteer_ids.add(volunteer_id)
+            self._exact_names.add(full_name.strip(), volunteer_id)
+            self._names.add(normalize_name(full_name), volunteer_id)
+
+        self.events: dict[int, tuple[str, date]] = {}
+        self.event_categories: dict[int, str] = {}
+        self._event_keys = _UniqueIndex()
+        for event_id, title, event_category, event_date in db.execute(select(Event.id, Event.title, Event.event_category, Event.event_date)):
+            self.events[event_id] = (title, event_date)
+            self.event_categories[event_id] = event_category
+            self._event_keys.add((normalize_key(event_category), event_date), event_id)
+
+    def volunteer_for(self, full_name: str) -> int | None:
+        volunteer_id = self._exact_names.get(full_name.strip())
+        if volunteer_id is None:
+            volunteer_id = self._names.get(normalize_name(full_name))
+        return volunteer_id
+
+    def event_for(self, row: dict[str, str]) -> int | None:
         try:
-            event_date = date.fromisoformat(event_date_raw)
+            event_date = date.fromisoformat(normalize_key(row.get("event_date")))
         except ValueError:
-            summary.failed += 1
-            continue
-
-        existing = db.query(Event).filter(Event.title == title, Event.event_date == event_date).first()
-        if existing:
-            summary.skipped += 1
-            continue
-
-        event = Event(
-            title=title,
-            event_category=event_category,
-            event_date=event_date,
-            location=location,
-            description=(row.get("description") or "").strip() or None,
-        )
-        db.add(event)
-        summary.imported += 1
-    db.commit()
-    return summary
+            return None
+        return self._event_keys.get((normalize_key(row.get("event_category")), event_date))
+
+    def shift_category(self, shift_id: int) -> str:
+        return self.event_categories[self.shift_events[shift_id]]
 
+    def resolve(self, row: dict[str, str]) -> tuple[int, int] | None:
+        if uses_natural_keys(row):
+            event_id = self.event_for(row)
+            volunteer_id = self.volunteer_for(row["full_name"])
+            if event_id is None or volunteer_id is None or event_id not in self.event_shifts:
+                return None
+            return self.event_shifts[event_id], volunteer_id
 
-def import_attendance_rows(db: Session, rows: list[dict[str, str]]) -> Summary:
-    summary = Summary()
-    for row in rows:
         try:
             shift_id = int((row.get("shift_id") or "").strip())
             volunteer_id = int((row.get("volunteer_id") or "").strip())
         except ValueError:
-            summary.failed += 1
-            continue
-
-        shift = db.query(Shift).filter(Shift.id == shift_id).first()
-        volunteer = db.query(Volunteer).filter(Volunteer.id == volunteer_id).first()
-        if not shift or not volunteer:
-            summary.failed += 1
-            continue
-
-        existing = db.query(Attendance).filter(Attendance.shift_id == shift_id, Attendance.volunteer_id == volunteer_id).first()
-        if existing:
-            summary.skipped += 1
-            continue
-
-        checked_in_at = _parse_datetime(row.get("checked_in_at") or "")
-        checked_out_at = _parse_datetime(row.get("checked_out_at") or "")
-        if (row.get("checked_in_at") and checked_in_at is None) or (row.get("checked_out_at") and checked_out_at is None):
-            summary.failed += 1
-            continue
-
-        minutes_worked_raw = (row.get("minutes_worked") or "").strip()
-        hours_worked_raw = (row.get("hours_worked") or "").strip()
-        status_raw = (row.get("status") or "present").strip().lower()
+            return None
+        if shift_id not in self.shift_days or volunteer_id not in self.volunteer_ids:
+            return None
+        return shift_id, volunteer_id
 
-        try:
-            if minutes_worked_raw:
-                minutes_worked = int(minutes_worked_raw)
-            elif hours_worked_raw:
-                minutes_worked = int(float(hours_worked_raw) * 60)
-            elif checked_in_at and checked_out_at and checked_out_at >= checked_in_at:
-                minutes_worked = int((checked_out_at - checked_in_at).total_seconds() // 60)
-            else:
-                minutes_worked = 0
-        except ValueError:
-            summary.failed += 1
-            continue
+    def create_missing_shifts(self, db: Session, rows: list[dict[str, str]]) -> None:
+        missing: set[int] = set()
+        for row in rows:
+            if uses_natural_keys(row):
+                event_id = self.event_for(row)
+                if event_id is not None and event_id not in self.event_shifts:
+                    missing.add(event_id)
+        if not missing:
+            return
 
-        if checked_in_at and checked_out_at and checked_out_at < checked_in_at:
-            summary.failed += 1
-            continue
+        values = [
+            {
+                "event_id": event_id,
+                "title": self.events[event_id][0],
+                "start_time": datetime.combine(self.events[event_id][1], time.min),
+                "end_time": datetime.combine(self.events[event_id][1], time.max),
+                "required_volunteers": 0,
+            }
+            for event_id in sorted(missing)
+        ]
+        for shift_id, event_id in db.execute(insert(Shift).returning(Shift.id, Shift.event_id), values):
+            self.shift_days[shift_id] = self.events[event_id][1]
+            self.shift_events[shift_id] = event_id
+            self.event_shifts[event_id] = shift_id
 
-        try:
-            status_enum = AttendanceStatus(status_raw)
-        except ValueError:
-            status_enum = AttendanceStatus.present
-
-        db.add(
-            Attendance(
-                shift_id=shift_id,
-                volunteer_id=volunteer_id,
-                checked_in_at=checked_in_at,
-                checked_out_at=checked_out_at,
-                minutes_worked=max(0, minutes_worked),
-                status=status_enum,
-            )
-        )
-        summary.imported += 1
-
-    db.commit()
+
+def import_attendance_rows(
+    db: Session,
+    rows: Iterable[dict[str, str]],
+    summary: Summary | None = None,
+    ledger: RowLedger | None = None,
+) -> Summary:
+    summary = summary if summary is not None else Summary()
+    index = AttendanceKeyIndex(db)
+    known_pairs: set[tuple[int, int]] = set(db.execute(select(Attendance.shift_id, Attendance.volunteer_id)).tuples())
+    rollups = RollupDeltas()
+
+    new_attendances: list[dict[str, Any]] = []
+    for batch in batched(rows, IMPORT_BATCH_SIZE):
+        index.create_missing_shifts(db, batch)
+        for row in batch:
+            row_hash = row_fingerprint(row) if ledger else ""
+            if ledger and ledger.seen(row_hash):
+                summary.cached += 1
+                continue
+
+            resolved = index.resolve(row)
+            if resolved is None:
+                summary.failed += 1
+                continue
+            shift_id, volunteer_id = resolved
+
+            if (shift_id, volunteer_id) in known_pairs:
+                summary.skipped += 1
+                if ledger:
+                    ledger.record(row_hash)
+                continue
+
+            try:
+                values = parse_attendance_values(row)
+            except RowError:
+                summary.failed += 1
+                continue
+
+            _queue_insert(db, Attendance, new_attendances, {"shift_id": shift_id, "volunteer_id": volunteer_id, **values})
+            rollups.add(volunteer_id, index.shift_days[shift_id], index.shift_category(shift_id), values["minutes_worked"], values["status"])
+            known_pairs.add((shift_id, volunteer_id))
+            summary.imported += 1
+            if ledger:
+                ledger.record(row_hash)
+
+        _flush_inserts(db, Attendance, new_attendances)
+        rollups.apply(db)
+        if ledger:
+            ledger.flush(db)
+        data_versions.bump(db, "shifts", "attendances")
+        db.commit()
     return summary
 
 
-def load_csv(path: Path) -> list[dict[str, str]]:
+IMPORTERS: dict[str, Callable[..., Summary]] = {
+    "volunteers": import_volunteers_rows,
+    "events": import_events_rows,
+    "attendance": import_attendance_rows,
+}
+
+
+def import_entity_rows(
+    db: Session,
+    entity: str,
+    rows: Iterable[dict[str, str]],
+    summary: Summary | None = None,
+    file_hash: str | None = None,
+    incremental: bool = True,
+) -> Summary:
+    summary = summary if summary is not None else Summary()
+    if file_hash is not None and incremental:
+        cached_rows = imported_file_rows(db, entity, file_hash)
+        if cached_rows is not None:
+            summary.cached += cached_rows
+            return summary
+
+    before = replace(summary)
+    IMPORTERS[entity](db, rows, summary, RowLedger(db, entity, lookup=incremental))
+    if file_hash is not None and summary.failed == before.failed:
+        record_imported_file(db, entity, file_hash, summary.total - before.total)
+        db.commit()
+    return summary
+
+
+def iter_csv(path: Path) -> Iterator[dict[str, str]]:
     with path.open("r", encoding="utf-8-sig", newline="") as file:
-        return list(csv.DictReader(file))
+        yield from csv.DictReader(file)
+
+
+def load_csv(path: Path) -> list[dict[str, str]]:
+    return list(iter_csv(path))
@@ -0,0 +1,228 @@
+import json
+import multiprocessing
+import os
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Any
+
+from app.core.config import get_settings
+from app.core.utils import batched
+from app.models.attendance import AttendanceStatus
+from app.core.text_normalization import normalize_key, normalize_name
+from app.services.import_service import (
+    AttendanceKeyIndex,
+    RowError,
+    parse_attendance_values,
+    parse_event_row,
+    parse_volunteer_row,
+    uses_natural_keys,
+)
+
+settings = get_settings()
+
+VALIDATION_CHUNK_SIZE = 2000
+
+RowIssue = tuple[str, str | None, str]
+RowResult = tuple[int, list[RowIssue], Any, list[Any], dict[str, str]]
+
+REFERENCE_FIELDS = {
+    "volunteers": ("full_name",),
+    "events": ("event_category", "event_date"),
+    "attendance": ("full_name", "event_category", "event_date", "shift_id", "volunteer_id"),
+}
+
+
+@dataclass
+class ValidationIssue:
+    entity: str
+    row: int
+    level: str
+    field: str | None
+    message: str
+
+
+@dataclass
+class ValidationSummary:
+    entity: str
+    rows: int = 0
+    errors: int = 0
+    warnings: int = 0
+
+
+def _volunteer_keys(row: dict[str, str]) -> tuple[Any, list[Any]]:
+    values = parse_volunteer_row(row)
+    name_key = ("name", values["full_name"])
+    if values["email"]:
+        email_key = ("email", values["email"])
+        return email_key, [email_key, name_key]
+    return name_key, [name_key]
+
+
+def _event_keys(row: dict[str, str]) -> tuple[Any, list[Any]]:
+    values = parse_event_row(row)
+    key = ("event", values["title"], values["event_date"])
+    return key, [key]
+
+
+def _attendance_keys(row: dict[str, str]) -> tuple[Any, list[Any]]:
+    if uses_natural_keys(row):
+        event_category = normalize_key(row.get("event_category"))
+        if not event_category:
+            raise RowError("event_category", "event_category is required")
+        try:
+            event_date = date.fromisoformat(normalize_key(row.get("event_date")))
+        except ValueError:
+            raise RowError("event_date", f"invalid date {row.get('event_date')!r}") from None
+        key: tuple[Any, ...] = ("names", normalize_name(row["full_name"]), event_category, event_date)
+    else:
+        ids = []
+        for field in ("shift_id", "volunteer_id"):
+            try:
+                ids.append(int((row.get(field) or "").strip()))
+            except ValueError:
+                raise RowError(field, f"{field} must be an integer") from None
+        key = ("pair", *ids)
+
+    parse_attendance_values(row)
+    return key, [key]
+
+
+KEY_PARSERS = {
+    "volunteers": _volunteer_keys,
+    "events": _event_keys,
+    "attendance": _attendance_keys,
+}
+
+
+def _validate_chunk(entity: str, first_row: int, rows: list[dict[str, str]]) -> list[RowResult]:
+    parse_keys = KEY_PARSERS[entity]
+    results: list[RowResult] = []
+    for row_no, row in enumerate(rows, start=first_row):
+        issues: list[RowIssue] = []
+        lookup_key, added_keys = None, []
+        try:
+            lookup_key, added_keys = parse_keys(row)
+        except RowError as exc:
+            issues.append(("error", exc.field, exc.message))
+
+        status_raw = (row.get("status") or "").strip().lower()
+        if entity == "attendance" and status_raw and status_raw not in AttendanceStatus.__members__:
+            issues.append(("warning", "status", f"unknown status {status_raw!r}, defaults to present"))
+        results.append((row_no, issues, lookup_key, added_keys, {field: row.get(field) or "" for field in REFERENCE_FIELDS[entity]}))
+    return results
+
+
+class ValidationPool:
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def results(self, entity: str, rows: Iterable[dict[str, str]]) -> Iterator[RowResult]:
+        pending: deque[Future[list[RowResult]]] = deque()
+        first_row = 1
+        try:
+            for index, chunk in enumerate(batched(rows, VALIDATION_CHUNK_SIZE)):
+                if index == 0 or self.max_workers <= 1:
+                    yield from _validate_chunk(entity, first_row, chunk)
+                else:
+                    pending.append(self._submit(entity, first_row, chunk))
+                    if len(pending) >= self.max_workers * 2:
+                        yield from pending.popleft().result()
+                first_row += len(chunk)
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _submit(self, entity: str, first_row: int, chunk: list[dict[str, str]]) -> Future[list[RowResult]]:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor.submit(_validate_chunk, entity, first_row, chunk)
+
+
+validation_pool = ValidationPool(max_workers=settings.import_validation_workers or os.cpu_count() or 1)
+
+
+class _PlannedKeys:
+    def __init__(self, index: AttendanceKeyIndex) -> None:
+        self.index = index
+        self.names: set[str] = set()
+        self.events: set[tuple[str, date]] = set()
+
+    def add(self, entity: str, reference: dict[str, str]) -> None:
+        if entity == "volunteers":
+            self.names.add(normalize_name(reference["full_name"]))
+        elif entity == "events":
+            self.events.add((normalize_key(reference["event_category"]), date.fromisoformat(reference["event_date"].strip())))
+
+    def unresolved(self, reference: dict[str, str]) -> RowIssue | None:
+        if uses_natural_keys(reference):
+            category, event_date = normalize_key(reference["event_category"]), date.fromisoformat(normalize_key(reference["event_date"]))
+            if self.index.event_for(reference) is None and (category, event_date) not in self.events:
+                return "error", "event_category", f"no event in {reference['event_category'].strip()!r} on {event_date.isoformat()}"
+            full_name = reference["full_name"]
+            if self.index.volunteer_for(full_name) is None and normalize_name(full_name) not in self.names:
+                return "error", "full_name", f"no single volunteer matches {full_name.strip()!r}"
+            return None
+
+        shift_id, volunteer_id = int(reference["shift_id"].strip()), int(reference["volunteer_id"].strip())
+        if shift_id not in self.index.shift_days:
+            return "error", "shift_id", f"shift {shift_id} does not exist"
+        if volunteer_id not in self.index.volunteer_ids:
+            return "error", "volunteer_id", f"volunteer {volunteer_id} does not exist"
+        return None
+
+
+def validate_import(
+    sources: dict[str, Iterable[dict[str, str]]],
+    index: AttendanceKeyIndex | None = None,
+    pool: ValidationPool = validation_pool,
+) -> Iterator[ValidationIssue | ValidationSummary]:
+    planned = _PlannedKeys(index) if index is not None else None
+    for entity, rows in sources.items():
+        summary = ValidationSummary(entity=entity)
+        seen: dict[Any, int] = {}
+        for row_no, issues, lookup_key, added_keys, reference in pool.results(entity, rows):
+            summary.rows += 1
+            if lookup_key is not None and planned is not None and entity == "attendance":
+                unresolved = planned.unresolved(reference)
+                if unresolved is not None:
+                    issues.insert(0, unresolved)
+                    lookup_key = None
+            for level, field, message in issues:
+                if level == "error":
+                    summary.errors += 1
+                else:
+                    summary.warnings += 1
+                yield ValidationIssue(entity=entity, row=row_no, level=level, field=field, message=message)
+
+            if lookup_key is None:
+                continue
+            if lookup_key in seen:
+                summary.warnings += 1
+                message = f"duplicates row {seen[lookup_key]} and will be skipped"
+                yield ValidationIssue(entity=entity, row=row_no, level="warning", field=None, message=message)
+                continue
+            for key in added_keys:
+                seen.setdefault(key, row_no)
+            if planned is not None:
+                planned.add(entity, reference)
+        yield summary
+
+
+def to_report_line(record: ValidationIssue | ValidationSummary) -> str:
+    kind = "issue" if isinstance(record, ValidationIssue) else "summary"
+    return json.dumps({"type": kind, **asdict(record)}, ensure_ascii=False) + "\n"
@@ -0,0 +1,181 @@
+from datetime import date
+from typing import Any
+
+from sqlalchemy import Date, Row, Select, case, cast, delete, func, insert, select, type_coerce
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.event import Event
+from app.models.rollup import CategoryMonthlyHours, VolunteerDailyHours
+from app.models.shift import Shift
+from app.services.data_version import data_versions
+
+ROLLUP_KEYS = ("volunteer_id", "day")
+ROLLUP_COUNTERS = ("minutes", "present_count", "absent_count", "late_count", "record_count")
+CUBE_KEYS = ("event_category", "month", "volunteer_id")
+CUBE_COUNTERS = ("minutes", "record_count")
+STATUS_COUNTERS = {
+    AttendanceStatus.present: "present_count",
+    AttendanceStatus.absent: "absent_count",
+    AttendanceStatus.late: "late_count",
+}
+
+
+def increment_counters(db: Session, model: type, key_columns: tuple[str, ...], rows: list[dict[str, Any]]) -> None:
+    if not rows:
+        return
+
+    table = model.__table__
+    counters = [column for column in rows[0] if column not in key_columns]
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        stmt = sqlite.insert(table) if dialect == "sqlite" else postgresql.insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={column: table.c[column] + stmt.excluded[column] for column in counters},
+        )
+        db.execute(stmt, rows)
+        return
+
+    for values in rows:
+        existing = db.get(model, tuple(values[key] for key in key_columns))
+        if existing is None:
+            db.add(model(**values))
+            continue
+        for column in counters:
+            setattr(existing, column, getattr(existing, column) + values[column])
+    db.flush()
+
+
+class RollupDeltas:
+    def __init__(self) -> None:
+        self._rows: dict[tuple[int, date], dict[str, int]] = {}
+        self._cube: dict[tuple[str, date, int], dict[str, int]] = {}
+
+    def add(self, volunteer_id: int, day: date, category: str, minutes: int, status: AttendanceStatus, sign: int = 1) -> None:
+        counters = self._rows.setdefault((volunteer_id, day), dict.fromkeys(ROLLUP_COUNTERS, 0))
+        counters["minutes"] += sign * minutes
+        counters[STATUS_COUNTERS[AttendanceStatus(status)]] += sign
+        counters["record_count"] += sign
+
+        cube = self._cube.setdefault((category, day.replace(day=1), volunteer_id), dict.fromkeys(CUBE_COUNTERS, 0))
+        cube["minutes"] += sign * minutes
+        cube["record_count"] += sign
+
+    def apply(self, db: Session) -> None:
+        rows = [{"volunteer_id": volunteer_id, "day": day, **counters} for (volunteer_id, day), counters in self._rows.items()]
+        increment_counters(db, VolunteerDailyHours, ROLLUP_KEYS, rows)
+        cube = [dict(zip(CUBE_KEYS, key), **counters) for key, counters in self._cube.items()]
+        increment_counters(db, CategoryMonthlyHours, CUBE_KEYS, cube)
+        self._rows.clear()
+        self._cube.clear()
+
+
+def record_attendance_change(
+    db: Session,
+    attendance: Attendance | Row[Any],
+    day: date,
+    category: str,
+    previous: tuple[int, AttendanceStatus] | None = None,
+) -> None:
+    deltas = RollupDeltas()
+    if previous is not None:
+        deltas.add(attendance.volunteer_id, day, category, previous[0], previous[1], sign=-1)
+    deltas.add(attendance.volunteer_id, day, category, attendance.minutes_worked, attendance.status)
+    deltas.apply(db)
+
+
+def shift_day(db: Session) -> Any:
+    if db.get_bind().dialect.name == "sqlite":
+        return type_coerce(func.date(Shift.start_time), Date)
+    return cast(Shift.start_time, Date)
+
+
+def shift_month(db: Session) -> Any:
+    if db.get_bind().dialect.name == "sqlite":
+        return type_coerce(func.date(Shift.start_time, "start of month"), Date)
+    return cast(func.date_trunc("month", Shift.start_time), Date)
+
+
+def _rollup_source(db: Session, *conditions: Any) -> Select:
+    day = shift_day(db)
+    status_counts = [
+        func.coalesce(func.sum(case((Attendance.status == status, 1), else_=0)), 0).label(column)
+        for status, column in STATUS_COUNTERS.items()
+    ]
+    return (
+        select(
+            Attendance.volunteer_id,
+            day.label("day"),
+            func.coalesce(func.sum(Attendance.minutes_worked), 0).label("minutes"),
+            *status_counts,
+            func.count(Attendance.id).label("record_count"),
+        )
+        .join(Shift, Attendance.shift_id == Shift.id)
+        .where(*conditions)
+        .group_by(Attendance.volunteer_id, day)
+    )
+
+
+def _cube_source(db: Session, *conditions: Any) -> Select:
+    month = shift_month(db)
+    return (
+        select(
+            Event.event_category,
+            month.label("month"),
+            Attendance.volunteer_id,
+            func.coalesce(func.sum(Attendance.minutes_worked), 0).label("minutes"),
+            func.count(Attendance.id).label("record_count"),
+        )
+        .join(Shift, Attendance.shift_id == Shift.id)
+        .join(Event, Shift.event_id == Event.id)
+        .where(*conditions)
+        .group_by(Event.event_category, month, Attendance.volunteer_id)
+    )
+
+
+def _apply_source(db: Session, model: type, keys: tuple[str, ...], counters: tuple[str, ...], source: Select, sign: int) -> set[int]:
+    rows = [
+        {**{key: getattr(row, key) for key in keys}, **{column: sign * getattr(row, column) for column in counters}}
+        for row in db.execute(source)
+    ]
+    increment_counters(db, model, keys, rows)
+    return {row["volunteer_id"] for row in rows}
+
+
+def add_to_category_cube(db: Session, *conditions: Any) -> None:
+    _apply_source(db, CategoryMonthlyHours, CUBE_KEYS, CUBE_COUNTERS, _cube_source(db, *conditions), 1)
+
+
+def remove_from_category_cube(db: Session, *conditions: Any) -> None:
+    volunteer_ids = _apply_source(db, CategoryMonthlyHours, CUBE_KEYS, CUBE_COUNTERS, _cube_source(db, *conditions), -1)
+    if volunteer_ids:
+        db.execute(
+            delete(CategoryMonthlyHours).where(CategoryMonthlyHours.volunteer_id.in_(volunteer_ids), CategoryMonthlyHours.record_count <= 0)
+        )
+
+
+def remove_from_rollups(db: Session, *conditions: Any) -> None:
+    volunteer_ids = _apply_source(db, VolunteerDailyHours, ROLLUP_KEYS, ROLLUP_COUNTERS, _rollup_source(db, *conditions), -1)
+    if volunteer_ids:
+        db.execute(
+            delete(VolunteerDailyHours).where(VolunteerDailyHours.volunteer_id.in_(volunteer_ids), VolunteerDailyHours.record_count <= 0)
+        )
+    remove_from_category_cube(db, *conditions)
+
+
+def rebuild_rollups(db: Session) -> int:
+    db.execute(delete(VolunteerDailyHours))
+    db.execute(insert(VolunteerDailyHours.__table__).from_select([*ROLLUP_KEYS, *ROLLUP_COUNTERS], _rollup_source(db)))
+    data_versions.bump(db, "attendances")
+    db.commit()
+    return db.scalar(select(func.count()).select_from(VolunteerDailyHours)) or 0
+
+
+def rebuild_category_cube(db: Session) -> int:
+    db.execute(delete(CategoryMonthlyHours))
+    db.execute(insert(CategoryMonthlyHours.__table__).from_select([*CUBE_KEYS, *CUBE_COUNTERS], _cube_source(db)))
+    data_versions.bump(db, "attendances")
+    db.commit()
+    return db.scalar(select(func.count()).select_from(CategoryMonthlyHours)) or 0
@@ -0,0 +1,31 @@
+from sqlalchemy import column, select, table, text
+from sqlalchemy.orm import Session
+
+from app.models.volunteer import Volunteer
+from app.core.text_normalization import search_key
+
+TRIGRAM_LENGTH = 3
+
+search_index = table("volunteer_search", column("rowid"))
+
+
+def _fts_match(terms: list[str]) -> str:
+    return " AND ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def search_volunteers(db: Session, query: str, limit: int) -> list[Volunteer]:
+    terms = search_key(query).split()
+    if not terms:
+        return []
+
+    stmt = select(Volunteer).where(*(Volunteer.search_name.contains(term, autoescape=True) for term in terms))
+    indexed = [term for term in terms if len(term) >= TRIGRAM_LENGTH]
+    if indexed and db.get_bind().dialect.name == "sqlite":
+        stmt = (
+            stmt.join(search_index, search_index.c.rowid == Volunteer.id)
+            .where(text("volunteer_search MATCH :match").bindparams(match=_fts_match(indexed)))
+            .order_by(search_index.c.rowid)
+        )
+    else:
+        stmt = stmt.order_by(Volunteer.id)
+    return list(db.scalars(stmt.limit(limit)))
@@ -1,22 +1,35 @@
+import argparse
+import sys
 from pathlib import Path
 
 from app.db.session import SessionLocal
-from app.services.import_service import (
-    import_attendance_rows,
-    import_events_rows,
-    import_volunteers_rows,
-    load_csv,
-)
+from app.services.import_ledger import file_fingerprint
+from app.services.import_service import AttendanceKeyIndex, import_entity_rows, iter_csv
+from app.services.import_validation import to_report_line, validate_import, validation_pool
+
+TEMPLATES = {
+    "volunteers": Path("data/volunteers_import_template.csv"),
+    "events": Path("data/events_import_template.csv"),
+    "attendance": Path("data/attendance_import_template.csv"),
+}
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import the CSV templates in data/")
+    parser.add_argument("--dry-run", action="store_true", help="validate rows and print an NDJSON report without writing to the database")
+    parser.add_argument("--full", action="store_true", help="re-process rows and files already recorded in the import ledger")
+    args = parser.parse_args()
+
     db = SessionLocal()
     try:
-        volunteer_summary = import_volunteers_rows(db, load_csv(Path("data/volunteers_import_template.csv")))
-        event_summary = import_events_rows(db, load_csv(Path("data/events_import_template.csv")))
-        attendance_summary = import_attendance_rows(db, load_csv(Path("data/attendance_import_template.csv")))
-        print(f"volunteers imported={volunteer_summary.imported} skipped={volunteer_summary.skipped} failed={volunteer_summary.failed}")
-        print(f"events imported={event_summary.imported} skipped={event_summary.skipped} failed={event_summary.failed}")
-        print(f"attendance imported={attendance_summary.imported} skipped={attendance_summary.skipped} failed={attendance_summary.failed}")
+        if args.dry_run:
+            for record in validate_import({entity: iter_csv(path) for entity, path in TEMPLATES.items()}, AttendanceKeyIndex(db)):
+                sys.stdout.write(to_report_line(record))
+            validation_pool.shutdown()
+            sys.exit(0)
+
+        for entity, path in TEMPLATES.items():
+            summary = import_entity_rows(db, entity, iter_csv(path), file_hash=file_fingerprint(path), incremental=not args.full)
+            print(f"{entity} imported={summary.imported} skipped={summary.skipped} failed={summary.failed} cached={summary.cached}")
     finally:
         db.close()
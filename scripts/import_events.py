@@ -1,14 +1,15 @@
 from pathlib import Path
 
 from app.db.session import SessionLocal
-from app.services.import_service import import_events_rows, load_csv
+from app.services.import_ledger import file_fingerprint
+from app.services.import_service import import_entity_rows, iter_csv
 
 
 if __name__ == "__main__":
     db = SessionLocal()
     try:
-        rows = load_csv(Path("data/events_import_template.csv"))
-        summary = import_events_rows(db, rows)
-        print(f"events imported={summary.imported} skipped={summary.skipped} failed={summary.failed}")
+        path = Path("data/events_import_template.csv")
+        summary = import_entity_rows(db, "events", iter_csv(path), file_hash=file_fingerprint(path))
+        print(f"events imported={summary.imported} skipped={summary.skipped} failed={summary.failed} cached={summary.cached}")
     finally:
         db.close()
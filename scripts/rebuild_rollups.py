@@ -0,0 +1,13 @@
+from app.db.session import SessionLocal
+from app.services.rollup_service import rebuild_category_cube, rebuild_rollups
+
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        rows = rebuild_rollups(db)
+        print(f"volunteer_daily_hours rebuilt rows={rows}")
+        rows = rebuild_category_cube(db)
+        print(f"category_monthly_hours rebuilt rows={rows}")
+    finally:
+        db.close()
@@ -1,4 +1,5 @@
 from collections.abc import Generator
+from datetime import date, datetime
 
 import pytest
 from fastapi.testclient import TestClient
@@ -8,6 +9,11 @@ from sqlalchemy.orm import Session, sessionmaker
 from app.db.base import Base
 from app.db.session import get_db
 from app.main import app
+from app.models.event import Event
+from app.models.shift import Shift
+from app.models.volunteer import Volunteer
+from app.services.analytics_cache import analytics_cache
+from app.services.columnar_analytics import attendance_columns
 
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -19,6 +25,8 @@ TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engin
 def setup_database() -> Generator[None, None, None]:
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    analytics_cache.clear()
+    attendance_columns.clear()
     yield
     Base.metadata.drop_all(bind=engine)
 
@@ -32,6 +40,18 @@ def db_session() -> Generator[Session, None, None]:
         db.close()
 
 
+@pytest.fixture
+def seeded_shift(db_session: Session) -> tuple[int, list[int]]:
+    event = Event(title="Open Day", event_category="Outreach", event_date=date(2026, 3, 10), location="Hall")
+    volunteers = [Volunteer(full_name="Jane Doe"), Volunteer(full_name="John Roe"), Volunteer(full_name="Sam Poe")]
+    db_session.add_all([event, *volunteers])
+    db_session.flush()
+    shift = Shift(event_id=event.id, title="Morning", start_time=datetime(2026, 3, 10, 9), end_time=datetime(2026, 3, 10, 17), required_volunteers=3)
+    db_session.add(shift)
+    db_session.commit()
+    return shift.id, [volunteer.id for volunteer in volunteers]
+
+
 @pytest.fixture
 def client(db_session: Session) -> Generator[TestClient, None, None]:
     def override_get_db() -> Generator[Session, None, None]:
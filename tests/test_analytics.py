@@ -0,0 +1,183 @@
+from datetime import date, datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.event import Event
+from app.models.rollup import VolunteerDailyHours
+from app.models.shift import Shift
+from app.models.volunteer import Volunteer
+from app.services.analytics_cache import analytics_cache
+from app.services.import_service import import_attendance_rows
+from app.services.rollup_service import rebuild_category_cube, rebuild_rollups
+
+
+def _rollup_snapshot(db: Session) -> list[tuple]:
+    rows = db.query(VolunteerDailyHours).order_by(VolunteerDailyHours.volunteer_id, VolunteerDailyHours.day).all()
+    return [(row.volunteer_id, row.day, row.minutes, row.present_count, row.absent_count, row.late_count, row.record_count) for row in rows]
+
+
+def test_rollups_follow_check_in_out_and_imports(
+    client: TestClient, auth_token: str, db_session: Session, seeded_shift: tuple[int, list[int]]
+) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, (jane, john, sam) = seeded_shift
+
+    client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": jane, "checked_in_at": "2026-03-10T09:00:00"}, headers=headers)
+    client.post(f"/shifts/{shift_id}/check-out", json={"volunteer_id": jane, "checked_out_at": "2026-03-10T15:00:00"}, headers=headers)
+    client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": john, "checked_in_at": "2026-03-10T10:00:00", "status": "late"}, headers=headers)
+    import_attendance_rows(db_session, [{"shift_id": str(shift_id), "volunteer_id": str(sam), "minutes_worked": "0", "status": "absent"}])
+
+    board = client.get("/analytics/leaderboard", headers=headers).json()
+    assert [(item["volunteer_id"], item["total_minutes"]) for item in board] == [(jane, 360), (john, 0), (sam, 0)]
+
+    awards = client.get("/analytics/awards", headers=headers).json()
+    assert [(item["volunteer_id"], item["tier"]) for item in awards] == [(jane, "Tier C")]
+
+    reliability = client.get(f"/analytics/volunteers/{john}/reliability", params={"from": "2026-03-01", "to": "2026-03-31"}, headers=headers).json()
+    assert (reliability["late_count"], reliability["total_records"], reliability["attendance_rate"]) == (1, 1, 1.0)
+
+    maintained = _rollup_snapshot(db_session)
+    rebuild_rollups(db_session)
+    assert _rollup_snapshot(db_session) == maintained
+
+
+def test_award_tiers_and_reliability_are_aggregated_in_sql(
+    client: TestClient, auth_token: str, db_session: Session, seeded_shift: tuple[int, list[int]]
+) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, volunteer_ids = seeded_shift
+    extra = Volunteer(full_name="Alex Low")
+    db_session.add(extra)
+    db_session.commit()
+
+    minutes = {volunteer_ids[0]: 1200, volunteer_ids[1]: 900, volunteer_ids[2]: 60, extra.id: 59}
+    import_attendance_rows(
+        db_session,
+        [{"shift_id": str(shift_id), "volunteer_id": str(volunteer_id), "minutes_worked": str(value)} for volunteer_id, value in minutes.items()],
+    )
+
+    awards = client.get("/analytics/awards", params={"from": "2026-03-10", "to": "2026-03-10"}, headers=headers).json()
+    assert [(item["volunteer_id"], item["tier"], item["total_hours"]) for item in awards] == [
+        (volunteer_ids[0], "Tier A", 20.0),
+        (volunteer_ids[1], "Tier B", 15.0),
+        (volunteer_ids[2], "Tier C", 1.0),
+    ]
+    assert client.get("/analytics/awards", params={"from": "2026-03-11"}, headers=headers).json() == []
+
+    reliability = client.get(f"/analytics/volunteers/{extra.id}/reliability", params={"from": "2026-04-01"}, headers=headers).json()
+    assert (reliability["total_records"], reliability["attendance_rate"]) == (0, 0.0)
+    assert client.get("/analytics/volunteers/9999/reliability", headers=headers).status_code == 404
+
+
+def test_event_and_batch_coverage(client: TestClient, auth_token: str, db_session: Session, seeded_shift: tuple[int, list[int]]) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, volunteer_ids = seeded_shift
+    event_id = db_session.get(Shift, shift_id).event_id
+    empty = Event(title="Planning", event_category="Admin", event_date=date(2026, 3, 12), location="Office")
+    db_session.add_all([empty, Shift(event_id=event_id, title="Evening", start_time=datetime(2026, 3, 10, 18), end_time=datetime(2026, 3, 10, 20), required_volunteers=2)])
+    db_session.commit()
+    for volunteer_id in volunteer_ids[:2]:
+        client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": volunteer_id}, headers=headers)
+
+    single = client.get(f"/analytics/events/{event_id}/coverage", headers=headers).json()
+    assert (single["total_required"], single["total_attended"]) == (5, 2)
+    assert [(item["shift_title"], item["attended_volunteers"]) for item in single["shifts"]] == [("Morning", 2), ("Evening", 0)]
+
+    batch = client.get("/analytics/coverage", params={"from": "2026-03-01", "to": "2026-03-31"}, headers=headers).json()
+    assert [(item["event_id"], item["total_attended"], len(item["shifts"])) for item in batch] == [(event_id, 2, 2), (empty.id, 0, 0)]
+    assert [item["event_id"] for item in client.get("/analytics/coverage", params={"category": "Admin"}, headers=headers).json()] == [empty.id]
+    assert client.get("/analytics/events/9999/coverage", headers=headers).status_code == 404
+
+
+def test_analytics_cache_hits_until_a_write(client: TestClient, auth_token: str, seeded_shift: tuple[int, list[int]]) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, (jane, _, _) = seeded_shift
+
+    assert client.get("/analytics/leaderboard", headers=headers).json() == []
+    assert client.get("/analytics/leaderboard", headers=headers).json() == []
+    stats = client.get("/admin/cache", headers=headers).json()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+    client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": jane, "checked_in_at": "2026-03-10T09:00:00"}, headers=headers)
+    client.post(f"/shifts/{shift_id}/check-out", json={"volunteer_id": jane, "checked_out_at": "2026-03-10T11:00:00"}, headers=headers)
+    board = client.get("/analytics/leaderboard", headers=headers).json()
+    assert [(item["volunteer_id"], item["total_minutes"]) for item in board] == [(jane, 120)]
+    assert client.get("/admin/cache", headers=headers).json()["invalidations"] == 1
+
+
+def test_bulk_reliability_sorts_filters_and_paginates(
+    client: TestClient, auth_token: str, db_session: Session, seeded_shift: tuple[int, list[int]]
+) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, (jane, john, sam) = seeded_shift
+    idle = Volunteer(full_name="Idle Ida")
+    db_session.add(idle)
+    db_session.commit()
+    statuses = {jane: "present", john: "late", sam: "absent"}
+    import_attendance_rows(
+        db_session,
+        [{"shift_id": str(shift_id), "volunteer_id": str(volunteer_id), "minutes_worked": "60", "status": value} for volunteer_id, value in statuses.items()],
+    )
+
+    everyone = client.get("/analytics/reliability", headers=headers).json()
+    assert [(item["volunteer_id"], item["attendance_rate"], item["total_records"]) for item in everyone] == [
+        (jane, 1.0, 1),
+        (john, 1.0, 1),
+        (sam, 0.0, 1),
+        (idle.id, 0.0, 0),
+    ]
+
+    lowest = client.get("/analytics/reliability", params={"sort": "attendance_rate", "limit": 2}, headers=headers).json()
+    assert [item["volunteer_id"] for item in lowest] == [sam, idle.id]
+    page = client.get("/analytics/reliability", params={"sort": "-attendance_rate", "offset": 1, "limit": 1}, headers=headers).json()
+    assert [item["volunteer_id"] for item in page] == [john]
+
+    subset = client.get("/analytics/reliability", params=[("volunteer_id", john), ("volunteer_id", sam)], headers=headers).json()
+    assert [(item["full_name"], item["late_count"], item["absent_count"]) for item in subset] == [("John Roe", 1, 0), ("Sam Poe", 0, 1)]
+    assert client.get("/analytics/reliability", params={"sort": "name"}, headers=headers).status_code == 422
+
+
+def test_category_cube_is_maintained_and_sliced(
+    client: TestClient, auth_token: str, db_session: Session, seeded_shift: tuple[int, list[int]]
+) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, (jane, john, sam) = seeded_shift
+    gala = Event(title="Gala", event_category="Fundraising", event_date=date(2026, 4, 2), location="Hall")
+    db_session.add(gala)
+    db_session.flush()
+    gala_shift = Shift(event_id=gala.id, title="Evening", start_time=datetime(2026, 4, 2, 18), end_time=datetime(2026, 4, 2, 22), required_volunteers=2)
+    db_session.add(gala_shift)
+    db_session.commit()
+
+    client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": jane, "checked_in_at": "2026-03-10T09:00:00"}, headers=headers)
+    client.post(f"/shifts/{shift_id}/check-out", json={"volunteer_id": jane, "checked_out_at": "2026-03-10T12:00:00"}, headers=headers)
+    import_attendance_rows(
+        db_session,
+        [
+            {"shift_id": str(shift_id), "volunteer_id": str(john), "minutes_worked": "60"},
+            {"shift_id": str(gala_shift.id), "volunteer_id": str(jane), "minutes_worked": "240"},
+            {"shift_id": str(gala_shift.id), "volunteer_id": str(sam), "minutes_worked": "0", "status": "absent"},
+        ],
+    )
+
+    cube = client.get("/analytics/category-hours", headers=headers).json()
+    assert [(item["category"], item["month"], item["total_minutes"], item["record_count"]) for item in cube] == [
+        ("Fundraising", "2026-04-01", 240, 2),
+        ("Outreach", "2026-03-01", 240, 2),
+    ]
+    per_volunteer = client.get("/analytics/category-hours", params={"group_by": "volunteer_id", "to": "2026-03-31"}, headers=headers).json()
+    for params in ({"from": "2026-03-10"}, {"to": "2026-03-15"}):
+        assert client.get("/analytics/category-hours", params=params, headers=headers).status_code == 400
+    assert [(item["volunteer_id"], item["total_minutes"], item["category"]) for item in per_volunteer] == [(jane, 180, None), (john, 60, None)]
+    sliced = client.get("/analytics/category-hours", params={"category": "Fundraising", "volunteer_id": jane, "group_by": "month"}, headers=headers).json()
+    assert [(item["month"], item["total_hours"]) for item in sliced] == [("2026-04-01", 4.0)]
+
+    client.patch(f"/events/{gala.id}", json={"event_category": "Outreach"}, headers=headers)
+    totals = client.get("/analytics/category-hours", params={"group_by": "category"}, headers=headers).json()
+    assert [(item["category"], item["total_minutes"], item["record_count"]) for item in totals] == [("Outreach", 480, 4)]
+
+    maintained = client.get("/analytics/category-hours", params=[("group_by", "category"), ("group_by", "month"), ("group_by", "volunteer_id")], headers=headers).json()
+    rebuild_category_cube(db_session)
+    analytics_cache.clear()
+    assert client.get("/analytics/category-hours", params=[("group_by", "category"), ("group_by", "month"), ("group_by", "volunteer_id")], headers=headers).json() == maintained
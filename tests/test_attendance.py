@@ -0,0 +1,326 @@
+from collections.abc import Callable
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import get_settings
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.attendance_sync import AttendanceSyncKey
+from app.models.event import Event
+from app.models.rollup import VolunteerDailyHours
+from app.models.shift import Shift
+from app.routers import admin, attendance
+from app.services import attendance_journal
+from app.services.attendance_journal import AttendanceJournal
+from app.services.attendance_service import check_in_attendance
+from app.services.attendance_sweeper import attendance_sweeper
+from app.services.import_service import import_attendance_rows
+
+
+def test_volunteer_hours_batch(client: TestClient, auth_token: str, db_session: Session, seeded_shift: tuple[int, list[int]]) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, (jane, john, sam) = seeded_shift
+    gala = Event(title="Gala", event_category="Fundraising", event_date=date(2026, 4, 2), location="Hall")
+    db_session.add(gala)
+    db_session.flush()
+    gala_shifts = [
+        Shift(event_id=gala.id, title=title, start_time=datetime(2026, 4, 2, hour), end_time=datetime(2026, 4, 2, hour + 2), required_volunteers=1)
+        for title, hour in (("Setup", 16), ("Evening", 18))
+    ]
+    db_session.add_all(gala_shifts)
+    db_session.commit()
+    import_attendance_rows(
+        db_session,
+        [
+            {"shift_id": str(shift_id), "volunteer_id": str(jane), "minutes_worked": "90"},
+            {"shift_id": str(gala_shifts[0].id), "volunteer_id": str(jane), "minutes_worked": "120"},
+            {"shift_id": str(gala_shifts[1].id), "volunteer_id": str(jane), "minutes_worked": "60"},
+            {"shift_id": str(shift_id), "volunteer_id": str(john), "minutes_worked": "30"},
+        ],
+    )
+
+    response = client.post(
+        "/volunteers/hours:batch",
+        json={"volunteer_ids": [john, jane, sam, 9999, jane], "include_breakdown": True},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["missing_volunteer_ids"] == [9999]
+    assert [(item["volunteer_id"], item["total_minutes"], item["total_hours"]) for item in body["volunteers"]] == [
+        (john, 30, 0.5),
+        (jane, 270, 4.5),
+        (sam, 0, 0.0),
+    ]
+    assert [(item["event_title"], item["minutes_worked"]) for item in body["volunteers"][1]["events"]] == [("Open Day", 90), ("Gala", 180)]
+
+    ranged = client.post("/volunteers/hours:batch", json={"volunteer_ids": [jane], "from_date": "2026-04-01"}, headers=headers).json()
+    assert ranged["volunteers"] == [{"volunteer_id": jane, "total_minutes": 180, "total_hours": 3.0, "events": None}]
+    assert client.post("/volunteers/hours:batch", json={"volunteer_ids": []}, headers=headers).status_code == 422
+
+
+def test_batch_check_in_and_out(client: TestClient, auth_token: str, seeded_shift: tuple[int, list[int]]) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, (jane, john, sam) = seeded_shift
+    client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": sam, "checked_in_at": "2026-03-10T09:00:00"}, headers=headers)
+
+    checked_in = client.post(
+        f"/shifts/{shift_id}/check-in:batch",
+        json={
+            "items": [
+                {"volunteer_id": jane, "checked_in_at": "2026-03-10T09:00:00"},
+                {"volunteer_id": john, "checked_in_at": "2026-03-10T09:30:00", "status": "late"},
+                {"volunteer_id": sam},
+                {"volunteer_id": 9999},
+                {"volunteer_id": jane},
+            ]
+        },
+        headers=headers,
+    )
+    assert checked_in.status_code == 200
+    results = checked_in.json()["results"]
+    assert [(item["volunteer_id"], item["status"], item["detail"]) for item in results] == [
+        (jane, "checked_in", None),
+        (john, "checked_in", None),
+        (sam, "rejected", "Volunteer already checked in for this shift"),
+        (9999, "rejected", "Volunteer not found"),
+        (jane, "rejected", "Volunteer already checked in for this shift"),
+    ]
+    assert results[1]["attendance"]["status"] == "late"
+
+    checked_out = client.post(
+        f"/shifts/{shift_id}/check-out:batch",
+        json={
+            "items": [
+                {"volunteer_id": jane, "checked_out_at": "2026-03-10T12:00:00"},
+                {"volunteer_id": john, "checked_out_at": "2026-03-10T09:00:00"},
+                {"volunteer_id": sam, "checked_out_at": "2026-03-10T10:30:00"},
+                {"volunteer_id": sam, "checked_out_at": "2026-03-10T11:00:00"},
+            ]
+        },
+        headers=headers,
+    ).json()["results"]
+    assert [(item["status"], item["attendance"] and item["attendance"]["minutes_worked"]) for item in checked_out] == [
+        ("checked_out", 180),
+        ("rejected", None),
+        ("checked_out", 90),
+        ("rejected", None),
+    ]
+    assert checked_out[1]["detail"] == "Check-out cannot occur before check-in"
+    assert checked_out[3]["detail"] == "Volunteer already checked out"
+
+    board = client.get("/analytics/leaderboard", headers=headers).json()
+    assert [(item["volunteer_id"], item["total_minutes"]) for item in board] == [(jane, 180), (sam, 90), (john, 0)]
+    assert client.post("/shifts/9999/check-in:batch", json={"items": [{"volunteer_id": jane}]}, headers=headers).status_code == 404
+
+
+def test_check_in_and_out_upserts_enforce_rules_in_sql(
+    client: TestClient, auth_token: str, db_session: Session, seeded_shift: tuple[int, list[int]]
+) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, (jane, john, _) = seeded_shift
+    import_attendance_rows(db_session, [{"shift_id": str(shift_id), "volunteer_id": str(john), "minutes_worked": "0", "status": "absent"}])
+
+    jane_in = client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": jane, "checked_in_at": "2026-03-10T09:00:00"}, headers=headers)
+    assert jane_in.status_code == 201
+    assert jane_in.json()["minutes_worked"] == 0
+    john_in = client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": john, "checked_in_at": "2026-03-10T09:30:00", "status": "late"}, headers=headers)
+    assert john_in.json()["status"] == "late"
+
+    assert check_in_attendance(db_session, shift_id, jane, datetime(2026, 3, 10, 9, 5), AttendanceStatus.present) == (None, None)
+    db_session.rollback()
+    again = client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": jane}, headers=headers)
+    assert (again.status_code, again.json()["detail"]) == (400, "Volunteer already checked in for this shift")
+    assert client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": 9999}, headers=headers).status_code == 404
+    assert client.post("/shifts/9999/check-in", json={"volunteer_id": jane}, headers=headers).status_code == 404
+
+    early = client.post(f"/shifts/{shift_id}/check-out", json={"volunteer_id": jane, "checked_out_at": "2026-03-10T08:00:00"}, headers=headers)
+    assert (early.status_code, early.json()["detail"]) == (400, "Check-out cannot occur before check-in")
+    out = client.post(f"/shifts/{shift_id}/check-out", json={"volunteer_id": jane, "checked_out_at": "2026-03-10T11:15:30"}, headers=headers)
+    assert (out.status_code, out.json()["minutes_worked"]) == (200, 135)
+    twice = client.post(f"/shifts/{shift_id}/check-out", json={"volunteer_id": jane}, headers=headers)
+    assert twice.json()["detail"] == "Volunteer already checked out"
+
+    rollup = db_session.query(VolunteerDailyHours).order_by(VolunteerDailyHours.volunteer_id).all()
+    assert [(row.volunteer_id, row.minutes, row.present_count, row.absent_count, row.late_count, row.record_count) for row in rollup] == [
+        (jane, 135, 1, 0, 0, 1),
+        (john, 0, 0, 0, 1, 1),
+    ]
+
+
+def test_journal_mode_acknowledges_then_group_commits(
+    client: TestClient, auth_token: str, db_session: Session, seeded_shift: tuple[int, list[int]], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, (jane, john, _) = seeded_shift
+    journal = AttendanceJournal(tmp_path, batch_size=100, flush_interval_seconds=60)
+    monkeypatch.setattr(get_settings(), "attendance_write_mode", "journal")
+    monkeypatch.setattr(attendance, "attendance_journal", journal)
+    assert client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": jane}, headers=headers).status_code == 503
+    journal.start(sessionmaker(bind=db_session.get_bind()))
+
+    checked_in = client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": jane, "checked_in_at": "2026-03-10T09:00:00"}, headers=headers)
+    assert checked_in.status_code == 202
+    assert checked_in.json()["seq"] == 1
+    client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": john, "checked_in_at": "2026-03-10T09:30:00", "status": "late"}, headers=headers)
+    assert client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": jane}, headers=headers).status_code == 400
+    assert client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": 9999}, headers=headers).status_code == 404
+    early = client.post(f"/shifts/{shift_id}/check-out", json={"volunteer_id": jane, "checked_out_at": "2026-03-10T08:00:00"}, headers=headers)
+    assert early.json()["detail"] == "Check-out cannot occur before check-in"
+    checked_out = client.post(f"/shifts/{shift_id}/check-out", json={"volunteer_id": jane, "checked_out_at": "2026-03-10T12:00:00"}, headers=headers)
+    assert (checked_out.status_code, checked_out.json()["minutes_worked"]) == (202, 180)
+
+    assert db_session.query(Attendance).count() == 0
+    hours = client.get(f"/volunteers/{jane}/hours", headers=headers).json()
+    assert (hours["total_minutes"], hours["breakdown"]) == (180, [{"shift_id": shift_id, "event_title": "Open Day", "minutes_worked": 180}])
+
+    recovered = AttendanceJournal(tmp_path, batch_size=100, flush_interval_seconds=60)
+    assert recovered.start(sessionmaker(bind=db_session.get_bind())) == 3
+    assert journal.flush() == 0
+    assert list(tmp_path.iterdir()) == []
+    assert journal.pending_for(jane) == []
+    journal.shutdown()
+    recovered.shutdown()
+
+    db_session.expire_all()
+    rows = db_session.query(Attendance.volunteer_id, Attendance.minutes_worked, Attendance.status).order_by(Attendance.volunteer_id).all()
+    assert rows == [(jane, 180, AttendanceStatus.present), (john, 0, AttendanceStatus.late)]
+    assert client.get(f"/volunteers/{jane}/hours", headers=headers).json()["total_minutes"] == 180
+    rollup = db_session.query(VolunteerDailyHours.volunteer_id, VolunteerDailyHours.minutes, VolunteerDailyHours.late_count).order_by(VolunteerDailyHours.volunteer_id)
+    assert rollup.all() == [(jane, 180, 0), (john, 0, 1)]
+
+
+def test_journal_retries_transient_failures_and_quarantines_permanent_ones(
+    client: TestClient, auth_token: str, db_session: Session, seeded_shift: tuple[int, list[int]], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, (jane, john, _) = seeded_shift
+    journal = AttendanceJournal(tmp_path, batch_size=100, flush_interval_seconds=60)
+    journal.start(sessionmaker(bind=db_session.get_bind()))
+    monkeypatch.setattr(admin, "attendance_journal", journal)
+
+    def failing(error: Exception) -> Callable[[Session, list], int]:
+        def apply(db: Session, entries: list) -> int:
+            raise error
+
+        return apply
+
+    journal.record(db_session, "check_in", shift_id, jane, datetime(2026, 3, 10, 9))
+    with monkeypatch.context() as patched:
+        patched.setattr(attendance_journal, "apply_journal_entries", failing(OperationalError("INSERT", {}, Exception("database is locked"))))
+        assert journal.flush() == 0
+    assert [item.volunteer_id for item in journal.pending_for(jane)] == [jane]
+    assert (journal.queued(), journal.retries, journal.quarantined) == (1, 1, [])
+    assert (tmp_path / "segment-00000001.ndjson").exists()
+    assert journal.flush() == 1
+    assert (journal.pending_for(jane), journal.queued(), journal.retries) == ([], 0, 0)
+
+    journal.record(db_session, "check_in", shift_id, john, datetime(2026, 3, 10, 9))
+    with monkeypatch.context() as patched:
+        patched.setattr(attendance_journal, "apply_journal_entries", failing(IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed"))))
+        assert journal.flush() == 0
+    assert journal.pending_for(john) == []
+    status = client.get("/admin/attendance-journal", headers=headers).json()
+    assert (status["started"], status["queued"], status["flushes"], status["applied_total"], status["retries"]) == (True, 0, 3, 1, 0)
+    assert status["quarantined"] == ["segment-00000002.failed"]
+    assert status["last_error"].startswith("segment-00000002.ndjson: (builtins.Exception) UNIQUE constraint failed")
+    journal.shutdown()
+
+    (tmp_path / "segment-00000003.ndjson").write_text("not json\n", encoding="utf-8")
+    restarted = AttendanceJournal(tmp_path, batch_size=100, flush_interval_seconds=60)
+    assert restarted.start(sessionmaker(bind=db_session.get_bind())) == 0
+    assert restarted.quarantined == ["segment-00000002.failed", "segment-00000003.failed"]
+    restarted.shutdown()
+
+
+def test_attendance_sync_is_idempotent_and_time_ordered(
+    client: TestClient, auth_token: str, db_session: Session, seeded_shift: tuple[int, list[int]]
+) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, (jane, john, _) = seeded_shift
+    events = [
+        {"idempotency_key": "k-3", "action": "check_out", "shift_id": shift_id, "volunteer_id": jane, "occurred_at": "2026-03-10T11:00:00"},
+        {"idempotency_key": "k-1", "action": "check_in", "shift_id": shift_id, "volunteer_id": jane, "occurred_at": "2026-03-10T09:00:00"},
+        {"idempotency_key": "k-2", "action": "check_in", "shift_id": shift_id, "volunteer_id": john, "occurred_at": "2026-03-10T09:10:00", "status": "late"},
+        {"idempotency_key": "k-4", "action": "check_out", "shift_id": shift_id, "volunteer_id": 9999, "occurred_at": "2026-03-10T12:00:00"},
+        {"idempotency_key": "k-1", "action": "check_in", "shift_id": shift_id, "volunteer_id": jane, "occurred_at": "2026-03-10T09:00:00"},
+    ]
+
+    first = client.post("/attendance/sync", json={"kiosk_id": "door-1", "events": events}, headers=headers)
+    assert first.status_code == 200
+    body = first.json()
+    assert [(item["idempotency_key"], item["status"]) for item in body["results"]] == [
+        ("k-3", "applied"),
+        ("k-1", "applied"),
+        ("k-2", "applied"),
+        ("k-4", "rejected"),
+        ("k-1", "duplicate"),
+    ]
+    assert body["results"][3]["detail"] == "Volunteer not found"
+    assert body["results"][4]["attendance_id"] == body["results"][1]["attendance_id"]
+    assert client.get(f"/volunteers/{jane}/hours", headers=headers).json()["total_minutes"] == 120
+
+    resent = client.post("/attendance/sync", json={"kiosk_id": "door-1", "events": events}, headers=headers).json()
+    assert [item["status"] for item in resent["results"]] == ["duplicate"] * 5
+    assert resent["results"][3]["detail"] == "Volunteer not found"
+    assert resent["cursor"] == body["cursor"] is not None
+    assert db_session.query(Attendance).count() == 2
+    assert db_session.query(AttendanceSyncKey).count() == 4
+
+    other = {"idempotency_key": "k-1", "action": "check_out", "shift_id": shift_id, "volunteer_id": john, "occurred_at": "2026-03-10T10:10:00"}
+    door_2 = client.post("/attendance/sync", json={"kiosk_id": "door-2", "events": [other]}, headers=headers).json()
+    assert (door_2["results"][0]["status"], door_2["results"][0]["attendance_id"]) == ("applied", body["results"][2]["attendance_id"])
+    assert db_session.query(AttendanceSyncKey).count() == 5
+    assert client.post("/attendance/sync", json={"kiosk_id": "door-1", "events": []}, headers=headers).status_code == 422
+
+
+def test_attendance_sync_retries_a_check_out_that_arrives_before_its_check_in(
+    client: TestClient, auth_token: str, db_session: Session, seeded_shift: tuple[int, list[int]]
+) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, (jane, _, _) = seeded_shift
+    check_out = {"idempotency_key": "out-1", "action": "check_out", "shift_id": shift_id, "volunteer_id": jane, "occurred_at": "2026-03-10T12:00:00"}
+    check_in = {"idempotency_key": "in-1", "action": "check_in", "shift_id": shift_id, "volunteer_id": jane, "occurred_at": "2026-03-10T09:00:00"}
+
+    early = client.post("/attendance/sync", json={"kiosk_id": "door-1", "events": [check_out]}, headers=headers).json()
+    assert [(item["status"], item["detail"]) for item in early["results"]] == [("rejected", "Cannot check out without check in")]
+    assert early["cursor"] is None
+    assert db_session.query(AttendanceSyncKey).count() == 0
+
+    late = client.post("/attendance/sync", json={"kiosk_id": "door-2", "events": [check_in]}, headers=headers).json()
+    assert late["results"][0]["status"] == "applied"
+    retried = client.post("/attendance/sync", json={"kiosk_id": "door-1", "events": [check_out]}, headers=headers).json()
+    assert retried["results"][0]["status"] == "applied"
+    assert client.get(f"/volunteers/{jane}/hours", headers=headers).json()["total_minutes"] == 180
+    assert db_session.query(AttendanceSyncKey).count() == 2
+
+
+def test_sweeper_closes_stale_open_attendances_at_shift_end(
+    client: TestClient, auth_token: str, db_session: Session, seeded_shift: tuple[int, list[int]]
+) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, (jane, john, sam) = seeded_shift
+    client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": jane, "checked_in_at": "2026-03-10T09:00:00"}, headers=headers)
+    client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": john, "checked_in_at": "2026-03-10T09:00:00"}, headers=headers)
+    client.post(f"/shifts/{shift_id}/check-out", json={"volunteer_id": john, "checked_out_at": "2026-03-10T10:00:00"}, headers=headers)
+    client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": sam, "checked_in_at": "2026-03-10T18:00:00"}, headers=headers)
+
+    assert attendance_sweeper.run_once(db_session, now=datetime(2026, 3, 10, 17, 30)).closed == 0
+    run = client.post("/admin/attendance-sweeper/run", headers=headers).json()
+    assert (run["closed"], run["batches"], run["error"]) == (2, 1, None)
+
+    db_session.expire_all()
+    rows = db_session.query(Attendance.volunteer_id, Attendance.checked_out_at, Attendance.minutes_worked, Attendance.auto_closed)
+    assert rows.order_by(Attendance.volunteer_id).all() == [
+        (jane, datetime(2026, 3, 10, 17), 480, True),
+        (john, datetime(2026, 3, 10, 10), 60, False),
+        (sam, datetime(2026, 3, 10, 18), 0, True),
+    ]
+    assert client.get(f"/volunteers/{jane}/hours", headers=headers).json()["total_minutes"] == 480
+    assert client.post("/admin/attendance-sweeper/run", headers=headers).json()["closed"] == 0
+    status = client.get("/admin/attendance-sweeper", headers=headers).json()
+    assert (status["closed_total"], status["last_run"]["closed"]) == (2, 0)
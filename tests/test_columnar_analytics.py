@@ -0,0 +1,43 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.attendance import Attendance
+from app.services.analytics_cache import analytics_cache
+from app.services.columnar_analytics import attendance_columns
+from app.services.import_service import import_attendance_rows
+
+pytest.importorskip("numpy")
+
+
+def _responses(client: TestClient, headers: dict[str, str], volunteer_ids: list[int]) -> list:
+    analytics_cache.clear()
+    paths = ["/analytics/leaderboard?limit=2", "/analytics/awards", "/analytics/leaderboard?from=2026-03-11"]
+    for volunteer_id in volunteer_ids:
+        paths += [f"/analytics/volunteers/{volunteer_id}/reliability", f"/volunteers/{volunteer_id}/hours?from=2026-03-10&to=2026-03-10"]
+    return [client.get(path, headers=headers).json() for path in paths]
+
+
+def test_columnar_engine_matches_sql(
+    client: TestClient, auth_token: str, db_session: Session, seeded_shift: tuple[int, list[int]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, (jane, john, sam) = seeded_shift
+    import_attendance_rows(db_session, [{"shift_id": str(shift_id), "volunteer_id": str(sam), "minutes_worked": "90", "status": "absent"}])
+    client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": jane, "checked_in_at": "2026-03-10T09:00:00"}, headers=headers)
+    client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": john, "checked_in_at": "2026-03-10T09:30:00", "status": "late"}, headers=headers)
+
+    expected = _responses(client, headers, [jane, john, sam])
+    monkeypatch.setattr(get_settings(), "analytics_engine", "columnar")
+    assert _responses(client, headers, [jane, john, sam]) == expected
+
+    client.post(f"/shifts/{shift_id}/check-out", json={"volunteer_id": jane, "checked_out_at": "2026-03-10T11:00:00"}, headers=headers)
+    client.post(f"/shifts/{shift_id}/check-in", json={"volunteer_id": sam, "checked_in_at": "2026-03-10T10:00:00"}, headers=headers)
+    columnar = _responses(client, headers, [jane, john, sam])
+    open_ids = {db_session.query(Attendance.id).filter(Attendance.volunteer_id == volunteer_id).scalar() for volunteer_id in (john, sam)}
+    assert attendance_columns.snapshot(db_session).open_ids == open_ids
+    assert columnar[0][0]["volunteer_id"] == jane
+
+    monkeypatch.setattr(get_settings(), "analytics_engine", "sql")
+    assert _responses(client, headers, [jane, john, sam]) == columnar
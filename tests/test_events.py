@@ -1,4 +1,9 @@
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.attendance import Attendance
+from app.models.shift import Shift
+from app.services.import_service import import_attendance_rows
 
 
 def test_event_crud(client: TestClient, auth_token: str) -> None:
@@ -31,3 +36,60 @@ def test_event_crud(client: TestClient, auth_token: str) -> None:
 
     missing = client.get(f"/events/{event_id}", headers=headers)
     assert missing.status_code == 404
+
+
+def test_event_list_keyset_pagination(client: TestClient, auth_token: str) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    for title, day in (("C", "2026-03-12"), ("A", "2026-03-10"), ("B", "2026-03-10"), ("D", "2026-03-11")):
+        client.post("/events", json={"title": title, "event_category": "Outreach", "event_date": day, "location": "Hall"}, headers=headers)
+
+    titles, cursor, pages = [], None, 0
+    while True:
+        params = {"sort": "event_date", "limit": 3, **({"cursor": cursor} if cursor else {"include_total": True})}
+        page = client.get("/events", params=params, headers=headers)
+        if not cursor:
+            assert page.headers["X-Total-Count"] == "4"
+        else:
+            assert "X-Total-Count" not in page.headers
+        titles += [item["title"] for item in page.json()]
+        pages += 1
+        cursor = page.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert (titles, pages) == (["A", "B", "D", "C"], 2)
+
+    assert [item["title"] for item in client.get("/events", params={"limit": 2}, headers=headers).json()] == ["C", "A"]
+    assert client.get("/events", params={"cursor": "not-a-cursor"}, headers=headers).status_code == 400
+    by_id_cursor = client.get("/events", params={"limit": 1}, headers=headers).headers["X-Next-Cursor"]
+    assert client.get("/events", params={"cursor": by_id_cursor, "sort": "event_date"}, headers=headers).status_code == 400
+    assert client.get("/events", params={"limit": 5000}, headers=headers).status_code == 422
+
+
+def test_event_batch_moves_category_hours(client: TestClient, auth_token: str, db_session: Session, seeded_shift: tuple[int, list[int]]) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, (jane, _, _) = seeded_shift
+    import_attendance_rows(db_session, [{"shift_id": str(shift_id), "volunteer_id": str(jane), "minutes_worked": "90"}])
+    event_id = db_session.get(Shift, shift_id).event_id
+
+    created = client.post(
+        "/events:batch",
+        json={"items": [{"title": "Gala", "event_category": "Fundraising", "event_date": "2026-04-02", "location": "Hall"}]},
+        headers=headers,
+    ).json()["results"]
+    gala = created[0]["id"]
+
+    updated = client.patch(
+        "/events:batch",
+        json={"items": [{"id": event_id, "event_category": "Fundraising"}, {"id": gala, "location": "Annex"}, {"id": 9999, "title": "?"}]},
+        headers=headers,
+    ).json()["results"]
+    assert [item["status"] for item in updated] == ["updated", "updated", "not_found"]
+    assert client.get(f"/events/{gala}", headers=headers).json()["location"] == "Annex"
+    totals = client.get("/analytics/category-hours", params={"group_by": "category"}, headers=headers).json()
+    assert [(item["category"], item["total_minutes"]) for item in totals] == [("Fundraising", 90)]
+
+    deleted = client.request("DELETE", "/events:batch", json={"ids": [event_id, gala]}, headers=headers).json()["results"]
+    assert [item["status"] for item in deleted] == ["deleted", "deleted"]
+    assert client.get("/events", headers=headers).json() == []
+    assert client.get("/analytics/category-hours", params={"group_by": "category"}, headers=headers).json() == []
+    assert db_session.query(Attendance).count() == 0
@@ -0,0 +1,39 @@
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.services.import_service import import_attendance_rows
+
+
+def test_exports_stream_csv_and_ndjson(client: TestClient, auth_token: str, db_session: Session, seeded_shift: tuple[int, list[int]]) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, (jane, john, sam) = seeded_shift
+    import_attendance_rows(
+        db_session,
+        [
+            {"shift_id": str(shift_id), "volunteer_id": str(jane), "minutes_worked": "90"},
+            {"shift_id": str(shift_id), "volunteer_id": str(john), "minutes_worked": "0", "status": "absent"},
+        ],
+    )
+
+    hours = client.get("/exports/hours", params={"from": "2026-03-01", "to": "2026-03-31"}, headers=headers)
+    assert hours.headers["content-type"].startswith("text/csv")
+    assert 'filename="hours.csv"' in hours.headers["content-disposition"]
+    assert list(csv.reader(io.StringIO(hours.text))) == [
+        ["volunteer_id", "full_name", "total_minutes", "total_hours"],
+        [str(jane), "Jane Doe", "90", "1.5"],
+        [str(john), "John Roe", "0", "0.0"],
+        [str(sam), "Sam Poe", "0", "0.0"],
+    ]
+
+    attendance = client.get("/exports/attendance", params={"format": "ndjson", "volunteer_id": john}, headers=headers)
+    assert attendance.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in attendance.text.splitlines()]
+    assert [(row["volunteer_id"], row["event_title"], row["status"], row["shift_start"]) for row in rows] == [
+        (john, "Open Day", "absent", "2026-03-10T09:00:00")
+    ]
+    assert client.get("/exports/attendance", params={"from": "2026-04-01"}, headers=headers).text.count("\n") == 1
+    assert client.get("/exports/hours", params={"format": "xml"}, headers=headers).status_code == 422
@@ -0,0 +1,204 @@
+import json
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.attendance import Attendance
+from app.models.event import Event
+from app.models.shift import Shift
+from app.models.volunteer import Volunteer
+from app.services.import_service import (
+    import_attendance_rows,
+    import_entity_rows,
+    import_events_rows,
+    import_volunteers_rows,
+    iter_csv,
+)
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+
+
+def test_bulk_import_counts_and_dedupe(db_session: Session) -> None:
+    db_session.add(Volunteer(full_name="Existing", email="existing@example.com"))
+    db_session.commit()
+
+    volunteers = import_volunteers_rows(
+        db_session,
+        [
+            {"full_name": "Existing", "email": "existing@example.com"},
+            {"full_name": "Jane Doe", "email": "jane@example.com"},
+            {"full_name": "Jane Again", "email": "jane@example.com"},
+            {"full_name": "Jane Doe"},
+            {"full_name": ""},
+        ],
+    )
+    assert (volunteers.imported, volunteers.skipped, volunteers.failed) == (1, 3, 1)
+    assert db_session.query(Volunteer).count() == 2
+
+    events = import_events_rows(
+        db_session,
+        [
+            {"title": "Open Day", "event_category": "Outreach", "event_date": "2026-03-10", "location": "Hall"},
+            {"title": "Open Day", "event_category": "Outreach", "event_date": "2026-03-10", "location": "Hall"},
+            {"title": "Open Day", "event_category": "Outreach", "event_date": "not-a-date", "location": "Hall"},
+        ],
+    )
+    assert (events.imported, events.skipped, events.failed) == (1, 1, 1)
+
+    event = db_session.query(Event).filter(Event.event_date == date(2026, 3, 10)).one()
+    shift = Shift(event_id=event.id, title="Morning", start_time=datetime(2026, 3, 10, 9), end_time=datetime(2026, 3, 10, 12))
+    db_session.add(shift)
+    db_session.commit()
+    jane = db_session.query(Volunteer).filter(Volunteer.email == "jane@example.com").one()
+
+    attendance = import_attendance_rows(
+        db_session,
+        [
+            {"shift_id": str(shift.id), "volunteer_id": str(jane.id), "hours_worked": "1.5"},
+            {"shift_id": str(shift.id), "volunteer_id": str(jane.id), "minutes_worked": "30"},
+            {"shift_id": str(shift.id), "volunteer_id": "999"},
+            {"shift_id": "x", "volunteer_id": str(jane.id)},
+        ],
+    )
+    assert (attendance.imported, attendance.skipped, attendance.failed) == (1, 1, 2)
+    assert db_session.query(Attendance).one().minutes_worked == 90
+
+
+def test_in_file_duplicates_are_skipped(db_session: Session) -> None:
+    volunteers = import_volunteers_rows(
+        db_session,
+        [
+            {"full_name": "Ann Lee", "email": "ann@example.com"},
+            {"full_name": "Ann B. Lee", "email": "ann@example.com"},
+            {"full_name": "Bo Kim"},
+            {"full_name": "Bo Kim", "phone": "555-0100"},
+        ],
+    )
+    assert (volunteers.imported, volunteers.skipped, volunteers.failed) == (2, 2, 0)
+    assert sorted(name for (name,) in db_session.query(Volunteer.full_name)) == ["Ann Lee", "Bo Kim"]
+
+
+def _wait_for_job(client: TestClient, job_id: str, headers: dict[str, str]) -> dict:
+    for _ in range(100):
+        job = client.get(f"/admin/import/{job_id}", headers=headers).json()
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError("import job did not finish")
+
+
+def test_admin_import_runs_as_background_job(client: TestClient, auth_token: str) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    content = "\ufefffull_name,email\nJane Doe,jane@example.com\nJohn Roe,\n,missing@example.com\nJane Doe,jane@example.com\n"
+
+    response = client.post(
+        "/admin/import",
+        files={"volunteers_file": ("volunteers.csv", content.encode("utf-8"), "text/csv")},
+        headers=headers,
+    )
+    assert response.status_code == 202
+
+    job = _wait_for_job(client, response.json()["job_id"], headers)
+    assert job["status"] == "completed"
+    assert job["volunteers"] == {"imported": 2, "skipped": 1, "failed": 1, "cached": 0}
+    assert job["rows_processed"] >= 4
+
+    assert client.get("/admin/import/unknown", headers=headers).status_code == 404
+
+
+def test_shipped_templates_resolve_natural_keys(db_session: Session) -> None:
+    volunteers = import_volunteers_rows(db_session, iter_csv(DATA_DIR / "volunteers_import_template.csv"))
+    events = import_events_rows(db_session, iter_csv(DATA_DIR / "events_import_template.csv"))
+    assert volunteers.failed == 0 and events.failed == 0
+
+    attendance = import_attendance_rows(db_session, iter_csv(DATA_DIR / "attendance_import_template.csv"))
+    assert attendance.failed == 0
+    assert attendance.imported + attendance.skipped == 383
+    assert db_session.query(Shift).count() == events.imported
+
+    extra = import_attendance_rows(
+        db_session,
+        [
+            {"full_name": "\ufeffد.  محمد   الغامدي", "event_category": "تقديم دورة", "event_date": "2024-01-25", "hours": "2.0"},
+            {"full_name": "محمد الغامدي", "event_category": "تقديم دورة", "event_date": "1999-01-01", "hours": "2.0"},
+        ],
+    )
+    assert (extra.imported, extra.skipped, extra.failed) == (0, 1, 1)
+
+
+def test_admin_import_dry_run_reports_row_errors(
+    client: TestClient, auth_token: str, db_session: Session, seeded_shift: tuple[int, list[int]]
+) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    shift_id, (jane, _, _) = seeded_shift
+    content = (
+        "shift_id,volunteer_id,full_name,event_category,event_date,checked_in_at,status\n"
+        f"{shift_id},{jane},,,,2026-03-10T09:00:00,present\n"
+        f"{shift_id},x,,,,,\n"
+        f"{shift_id},{jane},,,,,\n"
+        f"{shift_id},{jane},,,,yesterday,maybe\n"
+        f"{shift_id},9999,,,,,\n"
+        "9999,1,,,,,\n"
+        ",,Jane Doe,Outreach,2026-03-10,,\n"
+        ",,Nobody Known,Outreach,2026-03-10,,\n"
+        ",,New Person,Outreach,2026-03-10,,\n"
+        ",,Jane Doe,Gala,2026-05-01,,\n"
+    )
+
+    response = client.post(
+        "/admin/import?dry_run=true",
+        files={
+            "attendance_file": ("attendance.csv", content.encode("utf-8"), "text/csv"),
+            "volunteers_file": ("volunteers.csv", b"full_name,email\nNew Person,new@example.com\n", "text/csv"),
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    issues = [(record["row"], record["level"], record["field"]) for record in records if record["type"] == "issue" and record["entity"] == "attendance"]
+    assert issues == [
+        (2, "error", "volunteer_id"),
+        (3, "warning", None),
+        (4, "error", "checked_in_at"),
+        (4, "warning", "status"),
+        (5, "error", "volunteer_id"),
+        (6, "error", "shift_id"),
+        (8, "error", "full_name"),
+        (10, "error", "event_category"),
+    ]
+    assert records[-1] == {"type": "summary", "entity": "attendance", "rows": 10, "errors": 6, "warnings": 2}
+    assert db_session.query(Attendance).count() == 0
+
+
+def test_reimport_skips_unchanged_rows_and_files(db_session: Session) -> None:
+    rows = [{"full_name": "Jane Doe", "email": "jane@example.com"}, {"full_name": "John Roe"}]
+    first = import_entity_rows(db_session, "volunteers", rows, file_hash="file-1")
+    assert (first.imported, first.cached) == (2, 0)
+
+    unchanged_file = import_entity_rows(db_session, "volunteers", rows, file_hash="file-1")
+    assert (unchanged_file.imported, unchanged_file.skipped, unchanged_file.cached) == (0, 0, 2)
+
+    changed = import_entity_rows(db_session, "volunteers", [*rows, {"full_name": "New Person"}], file_hash="file-2")
+    assert (changed.imported, changed.skipped, changed.cached) == (1, 0, 2)
+
+    full = import_entity_rows(db_session, "volunteers", rows, file_hash="file-1", incremental=False)
+    assert (full.imported, full.skipped, full.cached) == (0, 2, 0)
+
+
+def test_reimport_recreates_rows_deleted_through_the_api(client: TestClient, auth_token: str, db_session: Session) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    rows = [{"full_name": "Jane Doe", "email": "jane@example.com"}, {"full_name": "John Roe"}]
+    import_entity_rows(db_session, "volunteers", rows, file_hash="file-1")
+    jane, john = (db_session.query(Volunteer.id).filter(Volunteer.full_name == name).scalar() for name in ("Jane Doe", "John Roe"))
+
+    assert client.delete(f"/volunteers/{jane}", headers=headers).status_code == 204
+    again = import_entity_rows(db_session, "volunteers", rows, file_hash="file-1")
+    assert (again.imported, again.skipped, again.cached) == (1, 1, 0)
+
+    client.request("DELETE", "/volunteers:batch", json={"ids": [john]}, headers=headers)
+    rebuilt = import_entity_rows(db_session, "volunteers", rows, file_hash="file-1")
+    assert (rebuilt.imported, rebuilt.skipped, rebuilt.cached) == (1, 1, 0)
+    assert db_session.query(Volunteer).count() == 2
@@ -1,4 +1,8 @@
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.services.data_version import DataVersions, data_versions
+from app.services.import_service import import_volunteers_rows
 
 
 def test_volunteer_crud(client: TestClient, auth_token: str) -> None:
@@ -25,3 +29,112 @@ def test_volunteer_crud(client: TestClient, auth_token: str) -> None:
 
     missing = client.get(f"/volunteers/{volunteer_id}", headers=headers)
     assert missing.status_code == 404
+
+
+def test_volunteer_list_conditional_get(client: TestClient, auth_token: str, db_session: Session) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+
+    first = client.get("/volunteers", headers=headers)
+    etag = first.headers["ETag"]
+    not_modified = client.get("/volunteers", headers={**headers, "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    client.post("/volunteers", json={"full_name": "Jane Doe"}, headers=headers)
+    changed = client.get("/volunteers", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == 1
+    assert DataVersions().etag(db_session, "/volunteers?", "volunteers") == changed.headers["ETag"]
+
+    import_volunteers_rows(db_session, [{"full_name": "Imported Volunteer"}])
+    imported = client.get("/volunteers", headers={**headers, "If-None-Match": changed.headers["ETag"]})
+    assert imported.status_code == 200
+    assert len(imported.json()) == 2
+
+    assert client.get("/volunteers", headers={"If-None-Match": imported.headers["ETag"]}).status_code == 401
+
+    (version,) = data_versions.current(db_session, "volunteers")
+    data_versions.bump(db_session, "volunteers")
+    assert data_versions.current(db_session, "volunteers") == (version,)
+    db_session.rollback()
+    db_session.commit()
+    assert data_versions.current(db_session, "volunteers") == (version,)
+    data_versions.bump(db_session, "volunteers")
+    db_session.commit()
+    assert data_versions.current(db_session, "volunteers") == (version + 1,)
+
+
+def test_volunteer_search_normalises_arabic_names(client: TestClient, auth_token: str, db_session: Session) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    ids = {}
+    for name in ("د. مُحَمَّد أحمد", "فاطمـــة الزهراء", "Mohammed Ali", "إيمان مصطفى"):
+        ids[name] = client.post("/volunteers", json={"full_name": name}, headers=headers).json()["id"]
+    import_volunteers_rows(db_session, [{"full_name": "الأستاذة آمنة يحيى"}])
+
+    def search(q: str) -> list[str]:
+        return [item["full_name"] for item in client.get("/volunteers/search", params={"q": q}, headers=headers).json()]
+
+    assert search("محمد") == ["د. مُحَمَّد أحمد"]
+    assert search("فاطمة") == ["فاطمـــة الزهراء"]
+    assert search("ايمان مصطفي") == ["إيمان مصطفى"]
+    assert search("امنه") == ["الأستاذة آمنة يحيى"]
+    assert search("moh") == ["Mohammed Ali"]
+    assert search("أ") == ["د. مُحَمَّد أحمد", "فاطمـــة الزهراء", "إيمان مصطفى", "الأستاذة آمنة يحيى"]
+
+    client.patch(f"/volunteers/{ids['Mohammed Ali']}", json={"full_name": "Omar Ali"}, headers=headers)
+    client.delete(f"/volunteers/{ids['فاطمـــة الزهراء']}", headers=headers)
+    assert search("moh") == []
+    assert search("omar") == ["Omar Ali"]
+    assert search("فاطمه") == []
+
+
+def test_volunteer_list_sparse_fields(client: TestClient, auth_token: str) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    for name in ("Jane Doe", "John Roe"):
+        client.post("/volunteers", json={"full_name": name, "email": f"{name.split()[0].lower()}@example.com"}, headers=headers)
+
+    full = client.get("/volunteers", headers=headers).json()
+    assert set(full[0]) == {"id", "volunteer_no", "full_name", "email", "phone", "notes", "created_at"}
+
+    sparse = client.get("/volunteers", params={"fields": "full_name,id", "sort": "full_name", "limit": 1}, headers=headers)
+    assert sparse.json() == [{"id": full[0]["id"], "full_name": "Jane Doe"}]
+    assert "X-Next-Cursor" in sparse.headers and "ETag" in sparse.headers
+    assert client.get("/volunteers", params={"fields": "id,password"}, headers=headers).status_code == 400
+
+    board = client.get("/analytics/leaderboard", params={"fields": "volunteer_id"}, headers=headers)
+    assert board.status_code == 200 and board.json() == []
+    operation = client.get("/openapi.json").json()["paths"]["/analytics/leaderboard"]["get"]
+    fields = next(parameter for parameter in operation["parameters"] if parameter["name"] == "fields")
+    assert "required may be absent" in fields["description"]
+    assert "only the requested fields" in operation["responses"]["200"]["description"]
+    assert operation["responses"]["200"]["content"]["application/json"]["schema"]["items"]["$ref"].endswith("/LeaderboardItem")
+
+
+def test_volunteer_batch_create_update_delete(client: TestClient, auth_token: str) -> None:
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    created = client.post(
+        "/volunteers:batch",
+        json={"items": [{"full_name": "Jane Doe"}, {"full_name": "John Roe", "email": "john@example.com"}, {"full_name": "Sam Poe"}]},
+        headers=headers,
+    )
+    assert created.status_code == 201
+    results = created.json()["results"]
+    assert [(item["index"], item["status"]) for item in results] == [(0, "created"), (1, "created"), (2, "created")]
+    jane, john, sam = (item["id"] for item in results)
+    assert client.get(f"/volunteers/{john}", headers=headers).json()["email"] == "john@example.com"
+
+    updated = client.patch(
+        "/volunteers:batch",
+        json={"items": [{"id": jane, "full_name": "Jane Smith"}, {"id": 9999, "phone": "1"}, {"id": sam, "phone": "555"}]},
+        headers=headers,
+    ).json()["results"]
+    assert [(item["id"], item["status"]) for item in updated] == [(jane, "updated"), (9999, "not_found"), (sam, "updated")]
+    assert client.get(f"/volunteers/{sam}", headers=headers).json()["phone"] == "555"
+    assert [item["id"] for item in client.get("/volunteers/search", params={"q": "smith"}, headers=headers).json()] == [jane]
+
+    deleted = client.request("DELETE", "/volunteers:batch", json={"ids": [john, 9999]}, headers=headers).json()["results"]
+    assert [item["status"] for item in deleted] == ["deleted", "not_found"]
+    assert [item["id"] for item in client.get("/volunteers", headers=headers).json()] == [jane, sam]
+    assert client.post("/volunteers:batch", json={"items": [{"full_name": "X"}] * 1001}, headers=headers).status_code == 422